@@ -0,0 +1,102 @@
+"""
+Benchmark chat repositories and migrate existing chats into SQLite.
+
+Benchmark: simulates `--chats` conversations of `--turns` turns each, where every turn
+loads the chat and saves two messages like ChatService does, against the in-memory dict
+store, SQLite rewriting the whole history per turn (the old `update_messages` pattern),
+SQLite with append-only messages, and SQLite behind the hot chat cache.
+
+Migration: `--import-json` loads a JSON list of chats (as returned by
+`GET /api/v1/chat/{chat_id}`) into the SQLite database at CHAT_SQLITE_PATH.
+
+Usage:
+    uv run python -m scripts.bench_chat_repository --chats 20 --turns 50
+    uv run python -m scripts.bench_chat_repository --import-json chats.json
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from src.config.settings import settings
+from src.repositories.base_chat_repository import BaseChatRepository
+from src.repositories.cached_chat_repository import CachedChatRepository
+from src.repositories.memory_chat_repository import InMemoryChatRepository
+from src.repositories.sqlite_chat_repository import SQLiteChatRepository
+from src.schemas.chat import AssistantMessage, Chat, UserMessage
+
+async def run(repository: BaseChatRepository, chats: int, turns: int, append: bool) -> dict:
+    turn_ms: List[float] = []
+    chat_ids = []
+    for number in range(chats):
+        chat = await repository.create(Chat(title=f"chat {number}"))
+        chat_ids.append(chat.chat_id)
+
+    start = time.perf_counter()
+    # Interleave the chats like concurrent users would
+    for turn in range(turns):
+        for chat_id in chat_ids:
+            turn_start = time.perf_counter()
+            chat = await repository.get(chat_id)
+            new_messages = [
+                UserMessage(content=f"question {turn} " + "lorem ipsum " * 20),
+                AssistantMessage(content=f"answer {turn} " + "dolor sit amet " * 60),
+            ]
+            if append:
+                await repository.append_messages(chat_id, new_messages)
+            else:
+                await repository.update_messages(chat_id, chat.messages + new_messages)
+            turn_ms.append((time.perf_counter() - turn_start) * 1000)
+    elapsed = time.perf_counter() - start
+    await repository.aclose()
+
+    turn_ms.sort()
+    return {
+        "turns_per_s": len(turn_ms) / elapsed,
+        "p50_ms": statistics.median(turn_ms),
+        "p99_ms": turn_ms[int(len(turn_ms) * 0.99) - 1],
+    }
+
+async def benchmark(chats: int, turns: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        backends: List[tuple[str, Callable[[], BaseChatRepository], bool]] = [
+            ("dict store", InMemoryChatRepository, True),
+            ("sqlite rewrite", lambda: SQLiteChatRepository(f"{directory}/rewrite.db"), False),
+            ("sqlite append", lambda: SQLiteChatRepository(f"{directory}/append.db"), True),
+            ("sqlite append + cache", lambda: CachedChatRepository(SQLiteChatRepository(f"{directory}/cached.db")), True),
+        ]
+        for name, factory, append in backends:
+            stats = await run(factory(), chats, turns, append)
+            print(
+                f"{name:<22} {stats['turns_per_s']:8.1f} turns/s  "
+                f"p50 {stats['p50_ms']:7.2f}ms  p99 {stats['p99_ms']:7.2f}ms"
+            )
+
+async def import_json(path: str) -> None:
+    repository = SQLiteChatRepository(settings.CHAT_SQLITE_PATH)
+    imported = skipped = 0
+    for data in json.loads(Path(path).read_text()):
+        chat = Chat.model_validate(data)
+        if await repository.chat_exists(chat.chat_id):
+            skipped += 1
+            continue
+        await repository.import_chat(chat)
+        imported += 1
+        print(f"imported {chat.chat_id} ({len(chat.messages)} messages, last updated {chat.updated_at})")
+    await repository.aclose()
+    print(f"{imported} chats imported into {settings.CHAT_SQLITE_PATH}, {skipped} already present")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chats", type=int, default=20, help="Number of simulated chats")
+    parser.add_argument("--turns", type=int, default=50, help="Turns per chat")
+    parser.add_argument("--import-json", default="", help="Import chats from a JSON export instead of benchmarking")
+    args = parser.parse_args()
+    if args.import_json:
+        asyncio.run(import_json(args.import_json))
+    else:
+        asyncio.run(benchmark(args.chats, args.turns))
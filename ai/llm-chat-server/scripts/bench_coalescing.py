@@ -0,0 +1,128 @@
+"""
+Count upstream calls when many concurrent chats search for the same thing.
+
+`--users` concurrent callers run the same search against a fake engine and fetch the same
+pages from a local server, once with request coalescing and once without. Caches start
+cold both times, so the difference is only the in-flight deduplication.
+
+Usage:
+    uv run python -m scripts.bench_coalescing --users 50 --pages 5
+"""
+import argparse
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List
+
+from src.config.settings import settings
+
+settings.SEARCH_CACHE_ENABLED = False
+settings.PAGE_CACHE_DIR = ""
+
+from src.schemas.search import SearchEngineID, SearchResult
+from src.search.engines.base_search import BaseSearch
+from src.search.engines.google_search import GoogleSearchAPI
+from src.search.search_registry import SearchRegistry
+from src.services.web_rag import WebRAGService
+from src.utils.http import HTTPClient
+from src.utils.metrics import MetricsRegistry
+
+PAGE = ("<html><body>" + "<p>breaking news content</p>" * 200 + "</body></html>").encode()
+
+class Counter:
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def incr(self) -> None:
+        with self._lock:
+            self.value += 1
+
+def start_server(delay: float, hits: Counter) -> ThreadingHTTPServer:
+    """Start a local HTTP server counting requests and answering after `delay` seconds"""
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            hits.incr()
+            time.sleep(delay)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(PAGE)))
+            self.end_headers()
+            self.wfile.write(PAGE)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+class FakeEngine(BaseSearch):
+    """Returns `pages` links to the local server after a search latency"""
+    ENGINE_INFO = GoogleSearchAPI.ENGINE_INFO
+
+    def __init__(self, base_url: str, pages: int, delay: float):
+        self.base_url = base_url
+        self.pages = pages
+        self.delay = delay
+        self.calls = Counter()
+
+    def search(self, query: str, num_results: int = 5) -> List[SearchResult]:
+        self.calls.incr()
+        time.sleep(self.delay)
+        return [
+            SearchResult(title=f"Result {i}", link=f"{self.base_url}/{query.replace(' ', '-')}/{i}", snippet="")
+            for i in range(self.pages)
+        ]
+
+class NoCoalescing:
+    """Stand-in for SingleFlight that runs every call"""
+    async def do(self, key, call):
+        return await call()
+
+async def run(service: WebRAGService, engine: FakeEngine, hits: Counter, users: int, query: str) -> dict:
+    searches, fetches = engine.calls.value, hits.value
+
+    async def user() -> None:
+        results = await service.perform_web_search([query], engine_id=SearchEngineID.GOOGLE, num_results=engine.pages)
+        await asyncio.gather(*(service.retrieve_content(result.link) for result in results))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(user() for _ in range(users)))
+    return {
+        "searches": engine.calls.value - searches,
+        "fetches": hits.value - fetches,
+        "seconds": time.perf_counter() - start,
+    }
+
+async def main(users: int, pages: int, delay: float) -> None:
+    hits = Counter()
+    server = start_server(delay, hits)
+    engine = FakeEngine(f"http://127.0.0.1:{server.server_port}", pages, delay)
+    SearchRegistry()._engines[SearchEngineID.GOOGLE] = engine
+
+    service = WebRAGService()
+    try:
+        coalesced = await run(service, engine, hits, users, "breaking news coalesced")
+        service._search_flight = service._fetch_flight = NoCoalescing()
+        baseline = await run(service, engine, hits, users, "breaking news baseline")
+    finally:
+        await HTTPClient().aclose()
+        server.shutdown()
+
+    print(f"{users} concurrent users, {pages} pages each")
+    for name, stats in (("without coalescing", baseline), ("with coalescing", coalesced)):
+        print(f"  {name:<19} searches {stats['searches']:4d}  page fetches {stats['fetches']:5d}  {stats['seconds']:.2f}s")
+    counters = MetricsRegistry().snapshot()["counters"]
+    print({name: value for name, value in counters.items() if name.startswith("single_flight.")})
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--delay", type=float, default=0.2)
+    args = parser.parse_args()
+    asyncio.run(main(args.users, args.pages, args.delay))
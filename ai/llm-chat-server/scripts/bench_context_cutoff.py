@@ -0,0 +1,126 @@
+"""
+Measure the search context latency tail with and without the early cutoff.
+
+Builds `--runs` search contexts of 5 sources each from a local HTTP server whose pages
+usually answer fast but are sometimes very slow (`--slow-rate`, `--slow-delay`), the way
+a few slow sites dominate the p99. A fake model summarizes after a fixed latency. Compares
+waiting for every source with stopping at WEB_RAG_MIN_GOOD_SOURCES or the latency budget,
+and reports the sources used and dropped.
+
+Usage:
+    uv run python -m scripts.bench_context_cutoff --runs 40 --slow-rate 0.1 --slow-delay 8
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List
+
+from src.config.settings import settings
+
+settings.PAGE_CACHE_DIR = ""
+
+from src.llm.models.openai_gpt4o_mini import OpenAIGPT4oMini
+from src.schemas.chat import AssistantMessage, Message
+from src.schemas.search import SearchResult
+from src.services.web_rag import WebRAGService
+from src.utils.http import HTTPClient
+
+PAGE = ("<html><body>" + "<p>Detailed article text about the topic at hand.</p>" * 100 + "</body></html>").encode()
+
+def start_server(fast_delay: float, slow_delay: float, slow_rate: float) -> ThreadingHTTPServer:
+    """Start a local HTTP server answering after `fast_delay`, or `slow_delay` for a `slow_rate` share of pages"""
+    rng = random.Random(0)
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            with lock:
+                slow = rng.random() < slow_rate
+            time.sleep(slow_delay if slow else fast_delay)
+            try:
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html")
+                self.send_header("Content-Length", str(len(PAGE)))
+                self.end_headers()
+                self.wfile.write(PAGE)
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # the client cancelled a straggler
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+class FakeLLM:
+    """Summarizes every page with a fixed latency"""
+    MODEL_INFO = OpenAIGPT4oMini.MODEL_INFO
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def get_completion(self, system_instruction: str, messages: List[Message], json_mode: bool = False) -> AssistantMessage:
+        await asyncio.sleep(self.latency)
+        return AssistantMessage(content="A relevant summary of the page. " * 10)
+
+async def run(service: WebRAGService, llm: FakeLLM, base_url: str, runs: int, label: str) -> dict:
+    latencies: List[float] = []
+    used = 0
+    dropped: Counter = Counter()
+    for run_index in range(runs):
+        # Unique URLs and queries so no cache hides the page latency
+        results = [
+            SearchResult(title=f"Result {i}", link=f"{base_url}/{label}/{run_index}/{i}", snippet="")
+            for i in range(settings.WEB_RAG_NUM_RESULTS)
+        ]
+        start = time.perf_counter()
+        sources, dropped_sources = await service.build_search_context(results, f"{label} question {run_index}", llm)
+        latencies.append(time.perf_counter() - start)
+        used += len(sources)
+        dropped.update(source.reason.value for source in dropped_sources)
+    latencies.sort()
+    return {
+        "median_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[min(int(len(latencies) * 0.99), len(latencies) - 1)] * 1000,
+        "used": used / runs,
+        "dropped": dict(dropped),
+    }
+
+async def main(runs: int, fast_delay: float, slow_delay: float, slow_rate: float, llm_latency: float) -> None:
+    server = start_server(fast_delay, slow_delay, slow_rate)
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    llm = FakeLLM(llm_latency)
+    service = WebRAGService()
+    min_good, budget = settings.WEB_RAG_MIN_GOOD_SOURCES, settings.WEB_RAG_CONTEXT_BUDGET
+    try:
+        settings.WEB_RAG_MIN_GOOD_SOURCES, settings.WEB_RAG_CONTEXT_BUDGET = 0, 0
+        baseline = await run(service, llm, base_url, runs, "baseline")
+        settings.WEB_RAG_MIN_GOOD_SOURCES, settings.WEB_RAG_CONTEXT_BUDGET = min_good, budget
+        cutoff = await run(service, llm, base_url, runs, "cutoff")
+    finally:
+        await HTTPClient().aclose()
+        server.shutdown()
+
+    print(f"{runs} contexts, pages {fast_delay * 1000:.0f} ms ({slow_rate:.0%} take {slow_delay:.0f}s), summaries {llm_latency * 1000:.0f} ms")
+    print(f"cutoff at {min_good} good sources or {budget:.0f}s")
+    for name, stats in (("wait for all", baseline), ("early cutoff", cutoff)):
+        print(f"  {name:<13} median {stats['median_ms']:6.0f} ms  p99 {stats['p99_ms']:6.0f} ms  sources used {stats['used']:.1f}  dropped {stats['dropped']}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=40)
+    parser.add_argument("--fast-delay", type=float, default=0.1)
+    parser.add_argument("--slow-delay", type=float, default=8.0)
+    parser.add_argument("--slow-rate", type=float, default=0.1)
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    args = parser.parse_args()
+    asyncio.run(main(args.runs, args.fast_delay, args.slow_delay, args.slow_rate, args.llm_latency))
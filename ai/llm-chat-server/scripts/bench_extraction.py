@@ -0,0 +1,113 @@
+"""
+Benchmark HTML text extraction: throughput and peak memory of each available extractor.
+
+Runs over real pages saved in a corpus directory, synthetic markup hides the cost of
+broken HTML, odd charsets and heavy page chrome. `--fetch urls.txt` downloads one page
+per URL into the corpus first and records its HTTP charset in `charsets.json`, so pages
+are decoded the way web RAG decodes them. Every extractor runs in its own subprocess so
+its peak RSS is measured in isolation.
+
+Usage:
+    uv run python -m scripts.bench_extraction --corpus pages/ --fetch urls.txt
+    uv run python -m scripts.bench_extraction --corpus pages/ --repeat 3
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src.config.settings import settings
+from src.extraction.extractor_registry import ExtractorRegistry
+
+CHARSETS_FILE = "charsets.json"
+
+async def fetch_corpus(urls_path: str, corpus: str) -> None:
+    """Save the HTML page behind every URL (one per line) into the corpus directory"""
+    from src.utils.http import HTTPClient
+
+    directory = Path(corpus)
+    directory.mkdir(parents=True, exist_ok=True)
+    charsets_path = directory / CHARSETS_FILE
+    charsets: Dict[str, Optional[str]] = json.loads(charsets_path.read_text()) if charsets_path.exists() else {}
+    with open(urls_path, encoding="utf-8") as f:
+        urls = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    client = HTTPClient()
+    try:
+        for url in urls:
+            try:
+                response = await client.get(url)
+                response.raise_for_status()
+            except Exception as e:
+                print(f"skipped {url}: {e}")
+                continue
+            if "html" not in response.headers.get("Content-Type", ""):
+                print(f"skipped {url}: not HTML")
+                continue
+            name = hashlib.sha1(url.encode()).hexdigest()[:16] + ".html"
+            (directory / name).write_bytes(response.content[:settings.EXTRACTION_MAX_BYTES])
+            charsets[name] = response.charset_encoding
+    finally:
+        await client.aclose()
+    charsets_path.write_text(json.dumps(charsets, indent=2))
+    print(f"{len(charsets)} pages in {directory}")
+
+def load_corpus(corpus: str) -> List[Tuple[bytes, Optional[str]]]:
+    """Saved pages with their HTTP charset, if one was recorded"""
+    directory = Path(corpus)
+    charsets_path = directory / CHARSETS_FILE
+    charsets: Dict[str, Optional[str]] = json.loads(charsets_path.read_text()) if charsets_path.exists() else {}
+    paths = sorted(path for path in directory.rglob("*") if path.suffix.lower() in (".html", ".htm"))
+    return [(path.read_bytes()[:settings.EXTRACTION_MAX_BYTES], charsets.get(path.name)) for path in paths]
+
+def measure(name: str, corpus: str, repeat: int) -> dict:
+    """Run one extractor over the corpus (called inside the subprocess)"""
+    documents = load_corpus(corpus)
+    extractor = ExtractorRegistry().get_extractor(name)
+    total_bytes = sum(len(document) for document, _ in documents) * repeat
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for document, charset in documents:
+            extractor.extract(document, charset)
+    elapsed = time.perf_counter() - start
+    return {
+        "documents": len(documents),
+        "mb_per_s": total_bytes / elapsed / 1e6,
+        "ms_per_doc": elapsed / (len(documents) * repeat) * 1000,
+        # ru_maxrss is in kilobytes on Linux
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+def main(corpus: str, repeat: int) -> None:
+    if not load_corpus(corpus):
+        raise SystemExit(f"No .html pages in {corpus}, save some with --fetch urls.txt")
+    for name in ExtractorRegistry().list_available():
+        result = subprocess.run(
+            [sys.executable, "-m", "scripts.bench_extraction", "--worker", name,
+             "--corpus", corpus, "--repeat", str(repeat)],
+            capture_output=True, text=True, check=True,
+        )
+        stats = json.loads(result.stdout.strip().splitlines()[-1])
+        print(
+            f"{name:<12} {stats['documents']:5d} docs  {stats['mb_per_s']:7.1f} MB/s  "
+            f"{stats['ms_per_doc']:7.2f} ms/doc  peak RSS {stats['peak_rss_mb']:7.1f} MB"
+        )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", required=True, help="Directory of saved .html pages")
+    parser.add_argument("--fetch", default="", help="File of URLs, one per line, to save into the corpus first")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the corpus")
+    parser.add_argument("--worker", default="", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        print(json.dumps(measure(args.worker, args.corpus, args.repeat)))
+    else:
+        if args.fetch:
+            asyncio.run(fetch_corpus(args.fetch, args.corpus))
+        main(args.corpus, args.repeat)
@@ -0,0 +1,78 @@
+"""
+Check that chat history compaction keeps the prompt size bounded over a long conversation.
+
+Simulates `--turns` turns against a fake model: each turn the prompt is built from the
+rolling summary plus the verbatim window, exactly as ChatService sends it, and compared
+with the full-history prompt sent without compaction. Exits non-zero if the compacted
+prompt in the second half of the conversation grows past its size in the first half.
+
+Usage:
+    uv run python -m scripts.bench_history_compaction --turns 500 --window 6
+"""
+import argparse
+import asyncio
+import sys
+from typing import List
+
+from src.config.settings import settings
+from src.llm.models.openai_gpt4o_mini import OpenAIGPT4oMini
+from src.llm.token_budget import MESSAGE_OVERHEAD_TOKENS, get_token_counter
+from src.prompts.chat import GENERAL_CHAT_PROMPT, CHAT_HISTORY_SUMMARY
+from src.repositories.chat import get_chat_repository
+from src.schemas.chat import AssistantMessage, Chat, Message, UserMessage
+from src.services.history import HistoryCompactor
+
+class FakeLLM:
+    """Stands in for the model: answers with filler and summarizes by keeping the tail of its input"""
+    MODEL_INFO = OpenAIGPT4oMini.MODEL_INFO
+
+    def __init__(self):
+        self.summary_calls = 0
+
+    async def get_completion(self, system_instruction: str, messages: List[Message], json_mode: bool = False) -> AssistantMessage:
+        self.summary_calls += 1
+        return AssistantMessage(content=messages[-1].content[-settings.CHAT_HISTORY_SUMMARY_MAX_CHARS:])
+
+def prompt_tokens(system_prompt: str, messages: List[Message]) -> int:
+    counter = get_token_counter(FakeLLM.MODEL_INFO.provider)
+    return counter.count(system_prompt) + MESSAGE_OVERHEAD_TOKENS + counter.count_messages(messages)
+
+async def main(turns: int, window: int) -> int:
+    settings.CHAT_HISTORY_WINDOW_TURNS = window
+    llm = FakeLLM()
+    settings.CHAT_REPOSITORY_BACKEND = "memory"
+    compactor = HistoryCompactor()
+    repository = get_chat_repository()
+    chat = await repository.create(Chat(title="benchmark"))
+
+    compacted: List[int] = []
+    full: List[int] = []
+    for turn in range(turns):
+        question = UserMessage(content=f"Question {turn}: " + "tell me more about this topic " * 10)
+        summary, recent = compactor.window(chat)
+        system_prompt = GENERAL_CHAT_PROMPT + (CHAT_HISTORY_SUMMARY.format(summary=summary) if summary else "")
+        compacted.append(prompt_tokens(system_prompt, recent + [question]))
+        full.append(prompt_tokens(GENERAL_CHAT_PROMPT, chat.messages + [question]))
+
+        answer = AssistantMessage(content=f"Answer {turn}: " + "here is a detailed explanation " * 20)
+        await repository.append_messages(chat.chat_id, [question, answer])
+        chat.messages.extend([question, answer])
+        # Refresh inline instead of in the background so every turn sees the latest summary
+        if compactor.needs_refresh(chat, llm):
+            await compactor.refresh(chat, llm)
+
+    print(f"turns: {turns}, window: {window} turns, summary refreshes: {llm.summary_calls}")
+    print(f"full history prompt:  last {full[-1]:7d} tokens")
+    print(f"compacted prompt:     last {compacted[-1]:7d} tokens, max {max(compacted):6d} tokens")
+    # With compaction the prompt oscillates between K and 2K turns plus a capped summary,
+    # so the second half of the conversation must not need a larger prompt than the first
+    bounded = max(compacted[turns // 2:]) <= max(compacted[:turns // 2])
+    print("prompt size bounded" if bounded else "prompt size keeps growing")
+    return 0 if bounded else 1
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=500, help="Number of simulated turns")
+    parser.add_argument("--window", type=int, default=6, help="Turns kept verbatim")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.turns, args.window)))
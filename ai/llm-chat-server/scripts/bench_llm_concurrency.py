@@ -0,0 +1,93 @@
+"""
+Concurrency check for the async provider clients against a local fake OpenAI-compatible server.
+
+The fake server answers every chat completion after a fixed delay. With async clients,
+N parallel chats should complete in roughly the time of one; the script exits non-zero
+if they take longer than `--max-ratio` times a single call.
+
+Usage:
+    uv run python -m scripts.bench_llm_concurrency --parallel 10 --delay 0.5
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+def start_fake_openai_server(delay: float) -> ThreadingHTTPServer:
+    """Start a local server mimicking POST /v1/chat/completions"""
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            time.sleep(delay)
+            body = json.dumps({
+                "id": "chatcmpl-fake",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request["model"],
+                "choices": [{
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": "pong"},
+                }],
+                "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+            }).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        request_queue_size = 128        # accept a burst of parallel connections
+
+    server = Server(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+async def main(parallel: int, delay: float, max_ratio: float) -> int:
+    server = start_fake_openai_server(delay)
+    # Settings are read at import time, so point the OpenAI provider at the fake server first
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{server.server_port}/v1"
+    os.environ.setdefault("OPENAI_API_KEY", "fake-key")
+
+    from src.llm.models.openai_gpt4o_mini import OpenAIGPT4oMini
+    from src.llm.http_client import close_llm_http_client
+    from src.schemas.chat import UserMessage
+
+    llm = OpenAIGPT4oMini()
+    messages = [UserMessage(content="ping")]
+    try:
+        start = time.perf_counter()
+        await llm.get_completion(system_instruction="You are a test.", messages=messages)
+        single = time.perf_counter() - start
+
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            llm.get_completion(system_instruction="You are a test.", messages=messages)
+            for _ in range(parallel)
+        ))
+        concurrent = time.perf_counter() - start
+    finally:
+        await close_llm_http_client()
+        server.shutdown()
+
+    ratio = concurrent / single
+    print(f"1 chat: {single:.2f}s  {parallel} parallel chats: {concurrent:.2f}s  ratio: {ratio:.2f}")
+    return 0 if ratio <= max_ratio else 1
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--parallel", type=int, default=10, help="Number of parallel chats")
+    parser.add_argument("--delay", type=float, default=0.5, help="Fake server latency in seconds")
+    parser.add_argument("--max-ratio", type=float, default=1.5, help="Allowed parallel/single time ratio")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.parallel, args.delay, args.max_ratio)))
@@ -0,0 +1,95 @@
+"""
+Benchmark page retrieval: blocking `requests.get` vs the pooled async HTTPClient.
+
+Serves a slow HTML page from a local server and fetches it concurrently while a
+heartbeat task measures how late the event loop wakes up (event-loop lag).
+
+Usage:
+    uv run python -m scripts.bench_page_retrieval --pages 20 --delay 0.2
+"""
+import argparse
+import asyncio
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Awaitable, Callable, List
+
+import requests
+
+from src.utils.http import HTTPClient
+
+PAGE = ("<html><body>" + "<p>benchmark content</p>" * 500 + "</body></html>").encode()
+
+def start_server(delay: float) -> ThreadingHTTPServer:
+    """Start a local HTTP server answering every request after `delay` seconds"""
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            time.sleep(delay)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(PAGE)))
+            self.end_headers()
+            self.wfile.write(PAGE)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+async def blocking_fetch(url: str) -> int:
+    """The previous implementation: sync requests inside a coroutine"""
+    return len(requests.get(url, timeout=10).content)
+
+async def pooled_fetch(url: str) -> int:
+    """The current implementation: shared async client"""
+    return len((await HTTPClient().get(url)).content)
+
+async def run(fetch: Callable[[str], Awaitable[int]], url: str, pages: int) -> dict:
+    lags: List[float] = []
+    stop = asyncio.Event()
+
+    async def heartbeat(interval: float = 0.005):
+        while not stop.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            lags.append(time.perf_counter() - start - interval)
+
+    beat = asyncio.create_task(heartbeat())
+    start = time.perf_counter()
+    await asyncio.gather(*(fetch(f"{url}/{i}") for i in range(pages)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await beat
+
+    return {
+        "elapsed_s": elapsed,
+        "pages_per_s": pages / elapsed,
+        "max_lag_ms": max(lags, default=0) * 1000,
+        "p50_lag_ms": statistics.median(lags) * 1000 if lags else 0,
+    }
+
+async def main(pages: int, delay: float) -> None:
+    server = start_server(delay)
+    url = f"http://127.0.0.1:{server.server_port}"
+    try:
+        for name, fetch in (("blocking requests.get", blocking_fetch), ("pooled HTTPClient", pooled_fetch)):
+            stats = await run(fetch, url, pages)
+            print(
+                f"{name:<22} {stats['elapsed_s']:6.2f}s  {stats['pages_per_s']:7.1f} pages/s  "
+                f"loop lag max {stats['max_lag_ms']:8.1f}ms  p50 {stats['p50_lag_ms']:6.1f}ms"
+            )
+    finally:
+        await HTTPClient().aclose()
+        server.shutdown()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=20, help="Number of pages fetched concurrently")
+    parser.add_argument("--delay", type=float, default=0.2, help="Server response delay in seconds")
+    args = parser.parse_args()
+    asyncio.run(main(args.pages, args.delay))
@@ -0,0 +1,90 @@
+"""
+Check that a burst of chat traffic queues behind the provider governor instead of failing.
+
+Each simulated chat fans out into `--calls` LLM calls (gate, query, summaries, answer)
+against a fake model that records how many requests reached it in any 10-second window
+(providers enforce their per-minute quota over short windows). Reports that peak against
+the quota's 10-second share, the calls rejected by the governor and the queue wait
+percentiles. Exits non-zero if the peak exceeds the limit by more than the one-second burst.
+
+Usage:
+    uv run python -m scripts.bench_rate_limit --chats 10 --calls 8 --rpm 600
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from collections import deque
+from typing import Deque, List
+
+from src.config.settings import settings
+from src.exceptions.rate_limit import RateLimitExceededError
+from src.llm.models.governed_llm import GovernedLLM
+from src.llm.models.openai_gpt4o_mini import OpenAIGPT4oMini
+from src.schemas.chat import AssistantMessage, Message, Role, UserMessage
+from src.utils.rate_limit import ProviderGovernor
+
+WINDOW = 10.0     # seconds
+
+class FakeProvider:
+    """Answers after a fixed latency and tracks the most requests seen in a 10-second window"""
+    MODEL_INFO = OpenAIGPT4oMini.MODEL_INFO
+
+    def __init__(self, rpm: int, latency: float):
+        self.rpm = rpm
+        self.latency = latency
+        self.peak = 0
+        self._recent: Deque[float] = deque()
+
+    async def get_completion(self, system_instruction: str, messages: List[Message], json_mode: bool = False) -> AssistantMessage:
+        now = time.monotonic()
+        while self._recent and now - self._recent[0] > WINDOW:
+            self._recent.popleft()
+        self._recent.append(now)
+        self.peak = max(self.peak, len(self._recent))
+        await asyncio.sleep(self.latency)
+        return AssistantMessage(role=Role.ASSISTANT, content="ok")
+
+    async def stream_completion(self, system_instruction: str, messages: List[Message]):
+        yield (await self.get_completion(system_instruction, messages)).content
+
+async def main(chats: int, calls: int, rpm: int, concurrency: int, latency: float) -> int:
+    provider = FakeProvider(rpm, latency)
+    llm = GovernedLLM(provider, ProviderGovernor("bench", rpm, 0, concurrency))
+    waits: List[float] = []
+    rejected = 0
+
+    async def call() -> None:
+        nonlocal rejected
+        start = time.perf_counter()
+        try:
+            await llm.get_completion("You are a test.", [UserMessage(content="ping")])
+            waits.append(time.perf_counter() - start - latency)
+        except RateLimitExceededError:
+            rejected += 1
+
+    async def chat() -> None:
+        for _ in range(calls):
+            await call()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(chat() for _ in range(chats)))
+    elapsed = time.perf_counter() - start
+
+    waits.sort()
+    print(f"{chats} chats x {calls} calls, {rpm} RPM, max concurrency {concurrency}: {elapsed:.1f}s")
+    print(f"peak requests in {WINDOW:.0f}s: {provider.peak} (quota share {rpm * WINDOW / 60:.0f}), rejected after {settings.RATE_LIMIT_MAX_QUEUE_WAIT:.0f}s of queueing: {rejected}")
+    if waits:
+        print(f"queue wait: median {statistics.median(waits) * 1000:.0f} ms, p95 {waits[int(len(waits) * 0.95) - 1] * 1000:.0f} ms, max {waits[-1] * 1000:.0f} ms")
+    return 1 if provider.peak > rpm * WINDOW / 60 + max(rpm / 60, 1) else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chats", type=int, default=10)
+    parser.add_argument("--calls", type=int, default=8)
+    parser.add_argument("--rpm", type=int, default=600)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.2)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.chats, args.calls, args.rpm, args.concurrency, args.latency)))
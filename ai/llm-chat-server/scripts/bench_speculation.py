@@ -0,0 +1,125 @@
+"""
+Measure the latency saved and the calls wasted by speculative search planning.
+
+Runs `--chats` sequential-mode plans (LLM gate, query, search) against a fake model and
+search engine with fixed latencies, once without speculation and once with it. Each chat's
+gate says "search" with its own probability, drawn around `--true-rate`, so the policy
+learns to speculate only for the chats where it pays off. Every chat sends `--turns`
+messages; the local gate and caches are off so each turn reaches the LLM gate.
+
+Usage:
+    uv run python -m scripts.bench_speculation --chats 20 --turns 30 --true-rate 0.6
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from typing import List
+
+from src.config.settings import settings
+
+settings.SEARCH_GATE_ENABLED = False
+settings.COMPLETION_CACHE_ENABLED = False
+settings.SEARCH_CACHE_ENABLED = False
+settings.WEB_RAG_PLANNING_MODE = "sequential"
+
+from src.llm.models.openai_gpt4o_mini import OpenAIGPT4oMini
+from src.prompts.search import SHOULD_USE_WEB_SEARCH
+from src.schemas.chat import AssistantMessage, Message, UserMessage
+from src.schemas.search import SearchEngineID, SearchResult
+from src.search.engines.google_search import GoogleSearchAPI
+from src.search.search_registry import SearchRegistry
+from src.services.speculation import SpeculationPolicy
+from src.services.web_rag import WebRAGService
+from src.utils.metrics import MetricsRegistry
+
+class FakeLLM:
+    """Answers the gate from a per-message coin flip and writes queries after a fixed latency"""
+    MODEL_INFO = OpenAIGPT4oMini.MODEL_INFO
+
+    def __init__(self, latency: float, answers: dict):
+        self.latency = latency
+        self.answers = answers
+        self.calls = 0
+
+    async def get_completion(self, system_instruction: str, messages: List[Message], json_mode: bool = False) -> AssistantMessage:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        if system_instruction == SHOULD_USE_WEB_SEARCH:
+            return AssistantMessage(content="true" if self.answers[messages[-1].content] else "false")
+        return AssistantMessage(content=f"query for {messages[-1].content}")
+
+    async def get_cached_completion(self, system_instruction: str, messages: List[Message], json_mode: bool = False) -> AssistantMessage:
+        return await self.get_completion(system_instruction, messages, json_mode=json_mode)
+
+class FakeEngine:
+    ENGINE_INFO = GoogleSearchAPI.ENGINE_INFO
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+
+    def search(self, query: str, num_results: int = 5) -> List[SearchResult]:
+        self.calls += 1
+        time.sleep(self.latency)
+        return [SearchResult(title=query, link=f"https://example.com/{i}", snippet="") for i in range(num_results)]
+
+async def run(service: WebRAGService, llm: FakeLLM, engine: FakeEngine, chats: List[float], turns: int, label: str) -> dict:
+    """Plan and search every turn of every chat, returning latency and call counts"""
+    llm.calls, engine.calls = 0, 0
+    latencies: List[float] = []
+
+    async def chat(chat_index: int, true_rate: float) -> None:
+        rng = random.Random(chat_index)
+        for turn in range(turns):
+            message = UserMessage(content=f"{label} chat {chat_index} turn {turn}")
+            llm.answers[message.content] = rng.random() < true_rate
+            start = time.perf_counter()
+            plan, results = await service.plan_web_search(message, llm, engine_id=SearchEngineID.GOOGLE, chat_id=f"chat-{chat_index}")
+            if plan.needs_search and results is None:
+                await service.perform_web_search(plan.queries, engine_id=SearchEngineID.GOOGLE, num_results=5)
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(chat(i, rate) for i, rate in enumerate(chats)))
+    latencies.sort()
+    return {
+        "median_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "llm_calls": llm.calls,
+        "searches": engine.calls,
+    }
+
+async def main(chats: int, turns: int, true_rate: float, llm_latency: float, search_latency: float, search_ahead: bool) -> None:
+    rng = random.Random(0)
+    chat_rates = [min(max(rng.gauss(true_rate, 0.25), 0.0), 1.0) for _ in range(chats)]
+    llm = FakeLLM(llm_latency, {})
+    engine = FakeEngine(search_latency)
+    SearchRegistry()._engines[SearchEngineID.GOOGLE] = engine
+    service = WebRAGService()
+    settings.WEB_RAG_SPECULATIVE_SEARCH = search_ahead
+
+    settings.WEB_RAG_SPECULATION_ENABLED = False
+    baseline = await run(service, llm, engine, chat_rates, turns, "baseline")
+    # Start the speculative run from a cold policy, like a fresh deployment
+    SpeculationPolicy()._models.clear()
+    SpeculationPolicy()._chats.clear()
+    settings.WEB_RAG_SPECULATION_ENABLED = True
+    speculative = await run(service, llm, engine, chat_rates, turns, "speculative")
+
+    print(f"{chats} chats x {turns} turns, gate true rate ~{true_rate:.0%}, LLM {llm_latency * 1000:.0f} ms, search {search_latency * 1000:.0f} ms, search ahead: {search_ahead}")
+    for name, stats in (("without speculation", baseline), ("with speculation", speculative)):
+        print(f"  {name:<20} median {stats['median_ms']:5.0f} ms  p95 {stats['p95_ms']:5.0f} ms  LLM calls {stats['llm_calls']:4d}  searches {stats['searches']:4d}")
+    counters = MetricsRegistry().snapshot()["counters"]
+    print({name: round(value) for name, value in counters.items() if name.startswith("speculation.")})
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chats", type=int, default=20)
+    parser.add_argument("--turns", type=int, default=30)
+    parser.add_argument("--true-rate", type=float, default=0.6)
+    parser.add_argument("--llm-latency", type=float, default=0.3)
+    parser.add_argument("--search-latency", type=float, default=0.3)
+    parser.add_argument("--search-ahead", action="store_true", help="also run the search speculatively")
+    args = parser.parse_args()
+    asyncio.run(main(args.chats, args.turns, args.true_rate, args.llm_latency, args.search_latency, args.search_ahead))
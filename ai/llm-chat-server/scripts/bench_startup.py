@@ -0,0 +1,92 @@
+"""
+Measure server startup: import time of `src.main` and cold start to the first request.
+
+Every sample runs in a fresh interpreter. Import time comes from `python -X importtime`;
+cold start is the wall time from spawning the interpreter until `GET /api/v1/models` has
+answered through the ASGI app (no network). The first use of a provider client, which is
+deferred until a chat actually needs it, is reported separately.
+
+Usage:
+    uv run python -m scripts.bench_startup --runs 5
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+COLD_START = """
+import asyncio, json, time
+start = time.perf_counter()
+import httpx
+from src.main import app
+from src.llm.llm_registry import LLMRegistry
+from src.schemas.llm import ModelID
+
+async def first_request():
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.get("/api/v1/models")
+        response.raise_for_status()
+
+asyncio.run(first_request())
+ready = time.perf_counter()
+try:
+    LLMRegistry().get_model(ModelID.OPENAI_GPT4O_MINI)
+except Exception:
+    pass
+print(json.dumps({"first_model_ms": (time.perf_counter() - ready) * 1000}))
+"""
+
+def import_times() -> Tuple[float, List[Tuple[str, float]]]:
+    """Total import time of src.main and the slowest top-level packages, in milliseconds"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.main"],
+        capture_output=True, text=True, check=True,
+    )
+    total = 0.0
+    packages: Dict[str, float] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        # "import time: <self us> | <cumulative us> | <indented module name>"
+        self_field, cumulative_field, name = line.split("|")
+        self_us = int(self_field.split(":")[1])
+        cumulative_us = int(cumulative_field)
+        name = name.strip()
+        if name == "src.main":
+            total = cumulative_us / 1000
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0.0) + self_us / 1000
+    slowest = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:8]
+    return total, slowest
+
+def cold_start() -> Tuple[float, float]:
+    """Wall time from spawn to the first answered request, and the first provider client construction"""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", COLD_START], capture_output=True, text=True, check=True)
+    elapsed = (time.perf_counter() - start) * 1000
+    first_model_ms = json.loads(result.stdout.strip().splitlines()[-1])["first_model_ms"]
+    return elapsed - first_model_ms, first_model_ms
+
+def main(runs: int) -> None:
+    totals, slowest = [], []
+    for _ in range(runs):
+        total, slowest = import_times()
+        totals.append(total)
+    print(f"import src.main: median {statistics.median(totals):.0f} ms over {runs} runs")
+    print("slowest packages (self time, last run):")
+    for package, ms in slowest:
+        print(f"  {package:<24} {ms:8.1f} ms")
+
+    samples = [cold_start() for _ in range(runs)]
+    print(f"cold start to first request: median {statistics.median(s[0] for s in samples):.0f} ms")
+    print(f"first provider client construction: median {statistics.median(s[1] for s in samples):.0f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    main(args.runs)
@@ -0,0 +1,92 @@
+"""
+Offline evaluation of the local search gate against the LLM gate.
+
+Reads JSONL with one `{"text": ..., "llm_label": true|false}` object per line. Records
+without `llm_label` (or `label`) are labelled by calling the LLM gate with `--llm`, whose
+latency is measured to estimate the time the local gate saves.
+
+Reports coverage (share decided locally), agreement with the LLM on those decisions,
+local gate latency and the estimated LLM latency saved. Only unseen messages count:
+records the `--model` was trained on are skipped. Without a model, `--folds` trains one
+per fold on the other folds and classifies the held-out fold (k-fold cross-validation).
+
+Usage:
+    uv run python -m scripts.eval_search_gate held_out.jsonl --model search_gate_model.json
+    uv run python -m scripts.eval_search_gate queries.jsonl --llm openai_gpt-4o-mini --folds 5
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import List, Optional
+
+from src.services.search_gate import HashedNgramModel, SearchGate, text_hash
+from scripts.train_search_gate import EPOCHS, LEARNING_RATE, cross_validate, llm_label, print_validation
+
+async def evaluate(path: str, model_path: Optional[str], llm: Optional[str], llm_latency_ms: float, folds: int) -> None:
+    model = HashedNgramModel.load(model_path) if model_path else None
+    gate = SearchGate()
+    gate.model = model
+
+    local_us: List[float] = []
+    llm_ms: List[float] = []
+    decided = agreed = total = seen = 0
+    by_reason = {"rules": [0, 0], "model": [0, 0]}
+
+    with open(path, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f if line.strip()]
+
+    labelled = []
+    for record in records:
+        text = record["text"]
+        if model is not None and text_hash(text) in model.trained_on:
+            seen += 1
+            continue
+        expected = record.get("llm_label", record.get("label"))
+        if expected is None:
+            if llm is None:
+                raise SystemExit(f"Unlabelled example, pass --llm: {text!r}")
+            start = time.perf_counter()
+            expected = await llm_label(text, llm)
+            llm_ms.append((time.perf_counter() - start) * 1000)
+        labelled.append((text, bool(expected)))
+
+        start = time.perf_counter()
+        decision = gate.classify(text)
+        local_us.append((time.perf_counter() - start) * 1e6)
+
+        total += 1
+        if decision.needs_search is not None:
+            decided += 1
+            agreed += decision.needs_search == bool(expected)
+            by_reason[decision.reason][0] += 1
+            by_reason[decision.reason][1] += decision.needs_search == bool(expected)
+
+    if not total:
+        raise SystemExit(f"All {seen} examples were used to train the model, evaluate on unseen messages")
+    mean_llm_ms = statistics.mean(llm_ms) if llm_ms else llm_latency_ms
+    print(f"examples:            {total} unseen" + (f", {seen} skipped (in the model's training data)" if seen else ""))
+    print(f"decided locally:     {decided} ({decided / total:.1%})")
+    for reason, (count, correct) in by_reason.items():
+        if count:
+            print(f"  by {reason:<6}         {count} decided, {correct / count:.1%} agree with LLM")
+    if decided:
+        print(f"agreement (decided): {agreed / decided:.1%}")
+    print(f"local gate latency:  mean {statistics.mean(local_us):.1f}us  max {max(local_us):.1f}us")
+    print(f"LLM gate latency:    {mean_llm_ms:.0f}ms {'(measured)' if llm_ms else '(assumed, --llm-latency-ms)'}")
+    print(f"est. time saved:     {decided * mean_llm_ms / 1000:.1f}s total, {decided / total * mean_llm_ms:.0f}ms per message")
+    if model is not None:
+        print(f"model validation:    {model.validation or 'none recorded'}, {'used' if model.is_validated() else 'NOT used'} by the gate")
+    elif folds > 1:
+        print_validation(cross_validate(labelled, folds, EPOCHS, LEARNING_RATE))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("data", help="JSONL file of {text, llm_label} records")
+    parser.add_argument("--model", help="Trained model JSON, rules only when omitted")
+    parser.add_argument("--llm", help="ModelID used to label records without llm_label")
+    parser.add_argument("--llm-latency-ms", type=float, default=600.0, help="Assumed LLM gate latency when not measured")
+    parser.add_argument("--folds", type=int, default=5, help="Cross-validation folds when no --model is given, 1 for rules only")
+    args = parser.parse_args()
+    asyncio.run(evaluate(args.data, args.model, args.llm, args.llm_latency_ms, args.folds))
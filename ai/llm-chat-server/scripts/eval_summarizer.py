@@ -0,0 +1,132 @@
+"""
+Compare the local extractive summarizer with LLM page summaries.
+
+Reads JSONL with one `{"query": ..., "content": ... | "url": ..., "llm_summary": ...}` object
+per line. Pages given by `url` are retrieved like web RAG does. Records without
+`llm_summary` are summarized with `--llm`, whose latency is measured.
+
+For every page both summaries are scored against the LLM one as reference (ROUGE-1 and
+ROUGE-2 F1 of the extractive summary) and on their own: coverage of the query terms,
+numbers kept from the LLM summary and length. Reports the means and latency of both
+strategies; `--output` writes the summaries side by side for manual review.
+
+Usage:
+    uv run python -m scripts.eval_summarizer pages.jsonl --llm openai_gpt-4o-mini --output review.jsonl
+"""
+import argparse
+import asyncio
+import json
+import re
+import statistics
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+from src.llm.llm_registry import LLMRegistry
+from src.schemas.llm import ModelID
+from src.services.extractive_summarizer import ExtractiveSummarizer
+from src.services.web_rag import CHARACTER_LIMIT, WebRAGService
+from src.utils.http import HTTPClient
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_NUMBER = re.compile(r"\d+(?:[.,]\d+)*")
+
+def ngrams(text: str, n: int) -> Counter:
+    tokens = _TOKEN.findall(text.lower())
+    return Counter(tuple(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+
+def rouge_f1(candidate: str, reference: str, n: int) -> float:
+    """ROUGE-N F1 of the candidate against the reference"""
+    candidate_grams, reference_grams = ngrams(candidate, n), ngrams(reference, n)
+    overlap = sum((candidate_grams & reference_grams).values())
+    if not overlap:
+        return 0.0
+    precision = overlap / sum(candidate_grams.values())
+    recall = overlap / sum(reference_grams.values())
+    return 2 * precision * recall / (precision + recall)
+
+def query_coverage(summary: str, query: str) -> float:
+    """Share of the query's terms that appear in the summary"""
+    terms = set(_TOKEN.findall(query.lower()))
+    return len(terms & set(_TOKEN.findall(summary.lower()))) / len(terms) if terms else 0.0
+
+def numbers_kept(summary: str, reference: str) -> Optional[float]:
+    """Share of the reference's numbers found in the summary, None if it has none"""
+    numbers = set(_NUMBER.findall(reference))
+    return len(numbers & set(_NUMBER.findall(summary))) / len(numbers) if numbers else None
+
+async def evaluate(path: str, llm_id: Optional[str], output: Optional[str]) -> None:
+    service = WebRAGService()
+    summarizer = ExtractiveSummarizer()
+    if not summarizer.enabled:
+        raise SystemExit("numpy is not installed, install the `extractive-summary` extra")
+    llm = LLMRegistry().get_model(ModelID(llm_id)) if llm_id else None
+
+    with open(path, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f if line.strip()]
+
+    scores: Dict[str, List[float]] = {name: [] for name in (
+        "rouge1", "rouge2", "coverage_extractive", "coverage_llm", "numbers_kept", "chars_extractive", "chars_llm",
+    )}
+    extractive_ms: List[float] = []
+    llm_ms: List[float] = []
+    reviewed = []
+    try:
+        for record in records:
+            query = record["query"]
+            content = record.get("content")
+            if content is None:
+                content = await service.retrieve_content(record["url"])
+                if not content:
+                    print(f"skipped, could not retrieve {record['url']}")
+                    continue
+
+            reference = record.get("llm_summary")
+            if reference is None:
+                if llm is None:
+                    raise SystemExit(f"Record without llm_summary, pass --llm: {query!r}")
+                start = time.perf_counter()
+                reference = await service.summarize_content(content, query, llm)
+                llm_ms.append((time.perf_counter() - start) * 1000)
+
+            # Same length limit as the summaries sent to the model answering the chat
+            start = time.perf_counter()
+            summary = summarizer.summarize(content, query, service._summary_character_limit(llm) if llm else CHARACTER_LIMIT)
+            extractive_ms.append((time.perf_counter() - start) * 1000)
+
+            scores["rouge1"].append(rouge_f1(summary, reference, 1))
+            scores["rouge2"].append(rouge_f1(summary, reference, 2))
+            scores["coverage_extractive"].append(query_coverage(summary, query))
+            scores["coverage_llm"].append(query_coverage(reference, query))
+            kept = numbers_kept(summary, reference)
+            if kept is not None:
+                scores["numbers_kept"].append(kept)
+            scores["chars_extractive"].append(len(summary))
+            scores["chars_llm"].append(len(reference))
+            reviewed.append({"query": query, "url": record.get("url"), "llm_summary": reference, "extractive_summary": summary})
+    finally:
+        await HTTPClient().aclose()
+
+    if not reviewed:
+        raise SystemExit("No pages evaluated")
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(item) + "\n" for item in reviewed)
+
+    mean = lambda values: statistics.mean(values) if values else float("nan")
+    print(f"pages:                     {len(reviewed)}")
+    print(f"ROUGE-1 / ROUGE-2 F1:      {mean(scores['rouge1']):.3f} / {mean(scores['rouge2']):.3f} (extractive vs LLM)")
+    print(f"query term coverage:       extractive {mean(scores['coverage_extractive']):.1%}, LLM {mean(scores['coverage_llm']):.1%}")
+    print(f"LLM summary numbers kept:  {mean(scores['numbers_kept']):.1%} ({len(scores['numbers_kept'])} pages with numbers)")
+    print(f"summary length:            extractive {mean(scores['chars_extractive']):.0f} chars, LLM {mean(scores['chars_llm']):.0f} chars")
+    print(f"extractive latency:        mean {mean(extractive_ms):.1f}ms  max {max(extractive_ms):.1f}ms")
+    if llm_ms:
+        print(f"LLM latency:               mean {mean(llm_ms):.0f}ms  max {max(llm_ms):.0f}ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("data", help="JSONL file of {query, content | url, llm_summary} records")
+    parser.add_argument("--llm", help="ModelID used to summarize records without llm_summary")
+    parser.add_argument("--output", help="JSONL file for the summaries side by side")
+    args = parser.parse_args()
+    asyncio.run(evaluate(args.data, args.llm, args.output))
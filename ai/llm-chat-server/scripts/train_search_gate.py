@@ -0,0 +1,125 @@
+"""
+Train the hashed n-gram model used by the local search gate.
+
+Input is JSONL with one `{"text": ..., "label": true|false}` object per line, e.g. logged
+user messages labelled by the LLM gate (see `--label-with`). Point SEARCH_GATE_MODEL_PATH
+at the output file to enable the model.
+
+Before the final model is trained on every example, k-fold cross-validation trains on
+k-1 folds and lets the gate classify the held-out fold. The held-out agreement with the
+LLM labels is saved with the model; the gate only uses a model whose agreement reaches
+SEARCH_GATE_MIN_HELD_OUT_AGREEMENT over SEARCH_GATE_MIN_HELD_OUT_DECISIONS decisions.
+The 60-example seed set is far too small for that, it only shows the file format.
+
+Usage:
+    uv run python -m scripts.train_search_gate scripts/data/search_gate_seed.jsonl --out search_gate_model.json
+    uv run python -m scripts.train_search_gate queries.jsonl --label-with openai_gpt-4o-mini --out search_gate_model.json
+"""
+import argparse
+import asyncio
+import json
+import random
+from typing import Dict, List, Optional, Tuple
+
+from src.config.settings import settings
+from src.services.search_gate import HashedNgramModel, SearchGate
+
+EPOCHS = 20
+LEARNING_RATE = 0.1
+
+async def llm_label(text: str, model_id: str) -> bool:
+    """Label a message with the LLM gate (SHOULD_USE_WEB_SEARCH)"""
+    from src.llm.llm_registry import LLMRegistry
+    from src.prompts.search import SHOULD_USE_WEB_SEARCH
+    from src.schemas.chat import UserMessage
+
+    response = await LLMRegistry().get_model(model_id).get_completion(
+        system_instruction=SHOULD_USE_WEB_SEARCH,
+        messages=[UserMessage(content=text)],
+    )
+    return response.content.strip().lower() == "true"
+
+async def load_examples(path: str, label_with: Optional[str]) -> List[Tuple[str, bool]]:
+    examples = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            label = record.get("label")
+            if label is None:
+                if label_with is None:
+                    raise SystemExit(f"Unlabelled example, pass --label-with: {record['text']!r}")
+                label = await llm_label(record["text"], label_with)
+            examples.append((record["text"], bool(label)))
+    return examples
+
+def cross_validate(examples: List[Tuple[str, bool]], folds: int, epochs: int, learning_rate: float) -> Dict[str, float]:
+    """Agreement of the gate with the labels on held-out folds, rules and model decisions counted apart"""
+    # Stratified folds in a fixed shuffled order: every fold gets its share of both labels
+    ordered = list(examples)
+    random.Random(0).shuffle(ordered)
+    ordered.sort(key=lambda example: not example[1])
+    fold_of = [index % folds for index in range(len(ordered))]
+
+    gate = SearchGate()
+    trained_model = gate.model
+    counts = {"rules": [0, 0], "model": [0, 0]}
+    try:
+        for fold in range(folds):
+            model = HashedNgramModel()
+            model.fit([example for example, f in zip(ordered, fold_of) if f != fold], epochs=epochs, learning_rate=learning_rate)
+            gate.model = model
+            for (text, label), f in zip(ordered, fold_of):
+                if f != fold:
+                    continue
+                decision = gate.classify(text)
+                if decision.needs_search is not None:
+                    counts[decision.reason][0] += 1
+                    counts[decision.reason][1] += decision.needs_search == label
+    finally:
+        gate.model = trained_model
+
+    agreement = lambda count, correct: correct / count if count else 0.0
+    return {
+        "folds": folds,
+        "examples": len(examples),
+        "decided": counts["model"][0],
+        "agreement": agreement(*counts["model"]),
+        "rules_decided": counts["rules"][0],
+        "rules_agreement": agreement(*counts["rules"]),
+    }
+
+def print_validation(validation: Dict[str, float]) -> None:
+    examples = validation["examples"]
+    print(f"held out ({validation['folds']} folds):   {examples} examples")
+    print(f"  by rules           {validation['rules_decided']} decided, {validation['rules_agreement']:.1%} agree with LLM")
+    print(f"  by model           {validation['decided']} decided, {validation['agreement']:.1%} agree with LLM")
+    print(f"  undecided          {examples - validation['rules_decided'] - validation['decided']} (fall back to the LLM gate)")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("data", help="JSONL file of {text, label} examples")
+    parser.add_argument("--out", required=True, help="Where to write the model JSON")
+    parser.add_argument("--label-with", help="ModelID used to label examples without a label")
+    parser.add_argument("--epochs", type=int, default=EPOCHS)
+    parser.add_argument("--learning-rate", type=float, default=LEARNING_RATE)
+    parser.add_argument("--folds", type=int, default=5, help="Cross-validation folds for the held-out agreement")
+    args = parser.parse_args()
+
+    examples = asyncio.run(load_examples(args.data, args.label_with))
+    validation = cross_validate(examples, args.folds, args.epochs, args.learning_rate)
+    print_validation(validation)
+
+    model = HashedNgramModel(validation=validation)
+    model.fit(examples, epochs=args.epochs, learning_rate=args.learning_rate)
+    model.save(args.out)
+    print(f"Trained on {len(examples)} examples, saved to {args.out}")
+    if not model.is_validated():
+        print(
+            f"The gate will not use this model: it needs {settings.SEARCH_GATE_MIN_HELD_OUT_AGREEMENT:.0%} held-out agreement "
+            f"over at least {settings.SEARCH_GATE_MIN_HELD_OUT_DECISIONS} model decisions, label more messages"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Tune the semantic cache thresholds on labelled query pairs.
+
+Reads JSONL with one `{"a": ..., "b": ..., "same": true|false}` object per line, `a` the
+cached message and `b` the new one: `same` pairs may share a search context, the others
+must not (different entity, version, opposite intent, a more specific question). Sweeps SEMANTIC_CACHE_THRESHOLD and SEMANTIC_CACHE_MIN_WORD_OVERLAP and
+picks the pair with the highest hit rate on `same` pairs and no false hit, preferring
+stricter values on ties. A wrong hit serves another question's sources, a miss only
+costs a search.
+
+The choice is checked with k-fold cross-validation: tuned on k-1 folds, scored on the
+held-out fold, so the reported precision is not measured on the tuning data.
+
+Usage:
+    uv run python -m scripts.tune_semantic_cache scripts/data/semantic_cache_pairs.jsonl --folds 5
+"""
+import argparse
+import json
+from typing import List, Tuple
+
+from src.cache.semantic_cache import HashingVectorizer, compatible, query_terms
+from src.config.settings import settings
+
+THRESHOLDS = [round(0.30 + 0.05 * i, 2) for i in range(14)]
+OVERLAPS = [round(0.30 + 0.05 * i, 2) for i in range(11)]
+
+class Pair:
+    def __init__(self, record: dict, vectorizer: HashingVectorizer):
+        self.a, self.b, self.same = record["a"], record["b"], bool(record["same"])
+        self.similarity = float(vectorizer.transform(self.a) @ vectorizer.transform(self.b))
+        # The new message `b` is looked up against the cached `a`
+        self.terms = (query_terms(self.b), query_terms(self.a))
+
+    def hit(self, threshold: float, min_overlap: float) -> bool:
+        return self.similarity >= threshold and compatible(*self.terms, min_overlap)
+
+def score(pairs: List[Pair], threshold: float, min_overlap: float) -> Tuple[int, int, int]:
+    """True hits, false hits and the number of `same` pairs"""
+    true_hits = sum(pair.hit(threshold, min_overlap) for pair in pairs if pair.same)
+    false_hits = sum(pair.hit(threshold, min_overlap) for pair in pairs if not pair.same)
+    return true_hits, false_hits, sum(pair.same for pair in pairs)
+
+def tune(pairs: List[Pair]) -> Tuple[float, float]:
+    """Thresholds with the most true hits and no false hit, strictest on ties"""
+    best = None
+    for threshold in THRESHOLDS:
+        for min_overlap in OVERLAPS:
+            true_hits, false_hits, _ = score(pairs, threshold, min_overlap)
+            if false_hits == 0:
+                key = (true_hits, threshold + min_overlap)
+                if best is None or key > best[0]:
+                    best = (key, threshold, min_overlap)
+    if best is None:
+        return THRESHOLDS[-1], OVERLAPS[-1]
+    return best[1], best[2]
+
+def main(path: str, folds: int, verbose: bool) -> None:
+    vectorizer = HashingVectorizer(settings.SEMANTIC_CACHE_FEATURES)
+    with open(path, encoding="utf-8") as f:
+        pairs = [Pair(json.loads(line), vectorizer) for line in f if line.strip()]
+
+    # Stratified folds: every fold gets its share of `same` and different pairs
+    ordered = [pair for pair in pairs if pair.same] + [pair for pair in pairs if not pair.same]
+    fold_of = {id(pair): index % folds for index, pair in enumerate(ordered)}
+    held_out = [0, 0, 0]
+    for fold in range(folds):
+        train = [pair for pair in pairs if fold_of[id(pair)] != fold]
+        test = [pair for pair in pairs if fold_of[id(pair)] == fold]
+        threshold, min_overlap = tune(train)
+        true_hits, false_hits, same = score(test, threshold, min_overlap)
+        held_out = [held_out[0] + true_hits, held_out[1] + false_hits, held_out[2] + same]
+        print(f"fold {fold + 1}: threshold {threshold:.2f}, min overlap {min_overlap:.2f} -> held out {true_hits}/{same} hits, {false_hits} false hits")
+
+    threshold, min_overlap = tune(pairs)
+    true_hits, false_hits, same = score(pairs, threshold, min_overlap)
+    hits = held_out[0] + held_out[1]
+    print(f"pairs:                 {len(pairs)} ({same} same, {len(pairs) - same} different)")
+    print(f"held out ({folds} folds):   hit rate {held_out[0] / held_out[2]:.1%}, precision {held_out[0] / hits if hits else 1.0:.1%}, false hits {held_out[1]}")
+    print(f"tuned on all pairs:    SEMANTIC_CACHE_THRESHOLD={threshold:.2f} SEMANTIC_CACHE_MIN_WORD_OVERLAP={min_overlap:.2f} (hit rate {true_hits / same:.1%}, false hits {false_hits})")
+    current = score(pairs, settings.SEMANTIC_CACHE_THRESHOLD, settings.SEMANTIC_CACHE_MIN_WORD_OVERLAP)
+    print(f"current settings:      {settings.SEMANTIC_CACHE_THRESHOLD:.2f} / {settings.SEMANTIC_CACHE_MIN_WORD_OVERLAP:.2f} (hit rate {current[0] / current[2]:.1%}, false hits {current[1]})")
+
+    if verbose:
+        for pair in sorted(pairs, key=lambda pair: -pair.similarity):
+            hit = pair.hit(settings.SEMANTIC_CACHE_THRESHOLD, settings.SEMANTIC_CACHE_MIN_WORD_OVERLAP)
+            mark = "ok " if hit == pair.same else "BAD"
+            print(f"  {mark} {pair.similarity:.3f} {'same' if pair.same else 'diff'} {'hit ' if hit else 'miss'} {pair.a!r} / {pair.b!r}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("data", nargs="?", default="scripts/data/semantic_cache_pairs.jsonl", help="JSONL file of {a, b, same} records")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--verbose", action="store_true", help="list every pair with the current settings")
+    args = parser.parse_args()
+    main(args.data, args.folds, args.verbose)
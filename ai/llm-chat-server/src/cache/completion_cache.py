@@ -0,0 +1,66 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from typing import Any, Dict, List, Optional
+from src.cache.disk import DiskCache
+from src.cache.memory import TTLCache
+from src.config.settings import settings
+from src.schemas.chat import Message
+from src.schemas.llm import ModelID
+from src.utils.decorators import singleton
+from src.utils.metrics import MetricsRegistry
+
+@singleton
+class CompletionCache:
+    """
+    Exact-match cache of LLM completions, in memory with an optional disk tier.
+
+    Keyed by (model id, system instruction hash, messages hash, generation params), so only
+    byte-identical prompts hit. Meant for deterministic helper calls (search gate, query
+    generation); user-facing answers never go through it.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._metrics = MetricsRegistry()
+        self.ttl = settings.COMPLETION_CACHE_TTL
+        self._memory: TTLCache[str] = TTLCache(
+            max_entries=settings.COMPLETION_CACHE_MAX_ENTRIES,
+            max_bytes=settings.COMPLETION_CACHE_MAX_BYTES,
+            ttl=self.ttl,
+            sizeof=len,
+        )
+        self._disk: Optional[DiskCache] = None
+        if settings.COMPLETION_CACHE_DIR:
+            self._disk = DiskCache(settings.COMPLETION_CACHE_DIR, max_bytes=settings.COMPLETION_CACHE_DISK_MAX_BYTES)
+
+    @staticmethod
+    def make_key(model_id: ModelID, system_instruction: str, messages: List[Message], params: Dict[str, Any]) -> str:
+        """Build the cache key for a completion request"""
+        system_hash = hashlib.sha256(system_instruction.encode()).hexdigest()
+        messages_hash = hashlib.sha256(json.dumps(
+            [[message.role.value, message.content] for message in messages]
+        ).encode()).hexdigest()
+        params_key = json.dumps(params, sort_keys=True)
+        return f"{ModelID(model_id).value}:{system_hash}:{messages_hash}:{params_key}"
+
+    async def get(self, key: str) -> Optional[str]:
+        """Get a cached completion from memory, then disk"""
+        content = self._memory.get(key)
+        if content is None and self._disk is not None:
+            record = await asyncio.to_thread(self._disk.get, key)
+            ttl_left = record["expires_at"] - time.time() if record is not None else 0
+            if ttl_left > 0:
+                content = record["value"]
+                self._memory.set(key, content, ttl=ttl_left)
+
+        self._metrics.incr("completion_cache.hits" if content is not None else "completion_cache.misses")
+        return content
+
+    async def set(self, key: str, content: str) -> None:
+        """Store a completion in both tiers"""
+        self._memory.set(key, content)
+        if self._disk is not None:
+            await asyncio.to_thread(self._disk.set, key, content, self.ttl)
@@ -0,0 +1,96 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+class DiskCache:
+    """
+    On-disk JSON cache with per-entry TTL, bounded by total size.
+
+    Each key is stored as one file named after its SHA-256 hash. Expired entries are kept
+    until evicted so callers can still revalidate them. When the directory grows past
+    `max_bytes`, the least recently written files are removed.
+    Methods do blocking file IO; call them through `asyncio.to_thread` from coroutines.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.logger = logging.getLogger(__name__)
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._bytes = sum(path.stat().st_size for path in self.directory.glob("*.json"))
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{hashlib.sha256(key.encode()).hexdigest()}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the stored record for a key.
+
+        Returns:
+            Optional[Dict[str, Any]]: `{"value": ..., "expires_at": <unix time>}` or None if missing
+        """
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                record = json.load(f)
+            return record if record.get("key") == key else None
+        except (OSError, ValueError):
+            return None
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store a JSON-serializable value for `ttl` seconds"""
+        path = self._path(key)
+        data = json.dumps({"key": key, "value": value, "expires_at": time.time() + ttl})
+        try:
+            old_size = path.stat().st_size if path.exists() else 0
+            # Write atomically so concurrent readers never see a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            self.logger.warning(f"Failed to write disk cache entry: {str(e)}")
+            return
+
+        with self._lock:
+            self._bytes += len(data) - old_size
+            if self._bytes > self.max_bytes:
+                self._evict()
+
+    def delete(self, key: str) -> None:
+        """Remove a key from the cache"""
+        path = self._path(key)
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except OSError:
+            return
+        with self._lock:
+            self._bytes -= size
+
+    def _evict(self) -> None:
+        """Remove the oldest files until the cache is below 90% of its budget"""
+        files = []
+        for path in self.directory.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue        # removed by another worker
+            files.append((stat.st_mtime, stat.st_size, path))
+        files.sort()
+
+        self._bytes = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if self._bytes <= self.max_bytes * 0.9:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            self._bytes -= size
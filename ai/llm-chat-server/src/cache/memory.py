@@ -0,0 +1,96 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Generic, Hashable, Optional, TypeVar
+
+V = TypeVar('V')
+
+@dataclass
+class CacheEntry(Generic[V]):
+    """A cached value with its expiry time and accounted size"""
+    value: V
+    expires_at: float
+    size: int = 1
+
+    @property
+    def is_expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+class TTLCache(Generic[V]):
+    """
+    In-memory LRU cache with per-entry TTL, bounded by entry count and total size.
+
+    Expired entries are kept until evicted so callers can serve or revalidate stale values;
+    use `get` for fresh values only and `get_entry` to inspect stale ones.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl: float,
+        max_bytes: Optional[int] = None,
+        sizeof: Callable[[V], int] = lambda value: 1,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._sizeof = sizeof
+        self._entries: "OrderedDict[Hashable, CacheEntry[V]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get_entry(self, key: Hashable) -> Optional[CacheEntry[V]]:
+        """Get the entry for a key (fresh or stale) and mark it as recently used"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """Get a fresh value for a key, or None if missing or expired"""
+        entry = self.get_entry(key)
+        if entry is None or entry.is_expired:
+            return None
+        return entry.value
+
+    def set(self, key: Hashable, value: V, ttl: Optional[float] = None) -> None:
+        """Store a value, evicting least recently used entries when over capacity"""
+        entry = CacheEntry(
+            value=value,
+            expires_at=time.monotonic() + (self.ttl if ttl is None else ttl),
+            size=self._sizeof(value),
+        )
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = entry
+            self._bytes += entry.size
+            while self._entries and (
+                len(self._entries) > self.max_entries
+                or (self.max_bytes is not None and self._bytes > self.max_bytes)
+            ):
+                self._remove(next(iter(self._entries)))
+
+    def delete(self, key: Hashable) -> None:
+        """Remove a key from the cache"""
+        with self._lock:
+            self._remove(key)
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._bytes
@@ -0,0 +1,117 @@
+import asyncio
+import logging
+import time
+from typing import Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from pydantic import BaseModel, Field
+from src.cache.disk import DiskCache
+from src.cache.memory import TTLCache
+from src.config.settings import settings
+from src.utils.decorators import singleton
+from src.utils.metrics import MetricsRegistry
+
+# Query parameters that only track the visitor and never change the page content
+TRACKING_PARAMS = {"gclid", "fbclid", "msclkid", "mc_cid", "mc_eid", "ref", "ref_src"}
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalize a URL so equivalent links share one cache entry.
+
+    Lowercases scheme and host, drops default ports, fragments and tracking
+    parameters, and sorts the remaining query parameters.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith("utm_")
+    ))
+    return urlunsplit((scheme, host, parts.path or "/", query, ""))
+
+class CachedPage(BaseModel):
+    """Extracted text of a web page along with its HTTP validators"""
+    url: str = Field(description="URL of the page")
+    content: str = Field(description="Extracted page text")
+    etag: Optional[str] = Field(default=None, description="ETag response header")
+    last_modified: Optional[str] = Field(default=None, description="Last-Modified response header")
+    fetched_at: float = Field(default_factory=time.time, description="Unix time the page was last validated")
+
+    @property
+    def validation_headers(self) -> dict:
+        """Conditional request headers to revalidate the cached page"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+@singleton
+class PageCache:
+    """
+    Two-tier (memory + disk) cache of extracted page text keyed by canonical URL.
+
+    Entries stay available after their TTL expires so they can be revalidated with
+    ETag / Last-Modified; an unchanged page then costs a 304 instead of a download and parse.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._metrics = MetricsRegistry()
+        self.ttl = settings.PAGE_CACHE_TTL
+        self._memory: TTLCache[CachedPage] = TTLCache(
+            max_entries=settings.PAGE_CACHE_MAX_ENTRIES,
+            max_bytes=settings.PAGE_CACHE_MAX_BYTES,
+            ttl=self.ttl,
+            sizeof=lambda page: len(page.content),
+        )
+        self._disk: Optional[DiskCache] = None
+        if settings.PAGE_CACHE_DIR:
+            self._disk = DiskCache(settings.PAGE_CACHE_DIR, max_bytes=settings.PAGE_CACHE_DISK_MAX_BYTES)
+
+    async def get(self, url: str) -> Tuple[Optional[CachedPage], bool]:
+        """
+        Look up a page in memory, then on disk.
+
+        Returns:
+            Tuple[Optional[CachedPage], bool]: The cached page (None on a miss) and whether it is still fresh
+        """
+        key = canonicalize_url(url)
+        entry = self._memory.get_entry(key)
+        if entry is not None:
+            fresh = not entry.is_expired
+            if fresh:
+                self._metrics.incr("page_cache.memory_hits")
+            return entry.value, fresh
+
+        if self._disk is not None:
+            record = await asyncio.to_thread(self._disk.get, key)
+            if record is not None:
+                page = CachedPage.model_validate(record["value"])
+                ttl_left = record["expires_at"] - time.time()
+                # Promote to memory with the remaining TTL so stale pages still get revalidated
+                self._memory.set(key, page, ttl=max(ttl_left, 0))
+                fresh = ttl_left > 0
+                if fresh:
+                    self._metrics.incr("page_cache.disk_hits")
+                return page, fresh
+        return None, False
+
+    async def set(self, page: CachedPage) -> None:
+        """Store a freshly fetched or revalidated page in both tiers"""
+        key = canonicalize_url(page.url)
+        self._memory.set(key, page)
+        if self._disk is not None:
+            await asyncio.to_thread(self._disk.set, key, page.model_dump(), self.ttl)
+
+    def record_miss(self) -> None:
+        """Count a page that had to be downloaded in full"""
+        self._metrics.incr("page_cache.misses")
+
+    def record_revalidated(self) -> None:
+        """Count a stale page confirmed unchanged by a 304 response"""
+        self._metrics.incr("page_cache.revalidated")
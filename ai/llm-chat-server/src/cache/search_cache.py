@@ -0,0 +1,32 @@
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+from src.cache.disk import DiskCache
+
+class SearchCacheBackend(ABC):
+    """Shared backend letting several workers reuse each other's cached search results"""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get an unexpired record for the key, or None"""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, record: Dict[str, Any], ttl: float) -> None:
+        """Store a JSON-serializable record for `ttl` seconds"""
+        pass
+
+class DiskSearchCacheBackend(SearchCacheBackend):
+    """Search cache backend on the local filesystem, shared by all workers on the host"""
+
+    def __init__(self, directory: str, max_bytes: int):
+        self._disk = DiskCache(directory, max_bytes=max_bytes)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        record = self._disk.get(key)
+        if record is None or record["expires_at"] <= time.time():
+            return None
+        return record["value"]
+
+    def set(self, key: str, record: Dict[str, Any], ttl: float) -> None:
+        self._disk.set(key, record, ttl)
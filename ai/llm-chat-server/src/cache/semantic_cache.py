@@ -0,0 +1,255 @@
+import logging
+import re
+import threading
+import time
+import zlib
+from typing import Dict, FrozenSet, List, NamedTuple, Optional
+from src.config.settings import settings
+from src.schemas.search import SearchEngineID, WebRAGResponse
+from src.utils.decorators import singleton
+from src.utils.metrics import MetricsRegistry
+
+try:
+    import numpy as np
+except ImportError:     # optional `semantic-cache` extra
+    np = None
+
+# Keeps "c++" and "c#" apart from "c"
+_TOKEN = re.compile(r"[a-z0-9]+[+#]*")
+_NUMBER = re.compile(r"\d+(?:[.,]\d+)*")
+_DIRECTION = re.compile(r"\b(from|to|into)\s+([a-z0-9]+[+#]*)")
+
+# Words that carry no topic, so "what's new in AI" and "AI news" land close together
+STOP_WORDS = {
+    "a", "about", "an", "and", "any", "are", "as", "at", "be", "can", "could", "do", "does", "for", "from",
+    "give", "how", "i", "in", "is", "it", "me", "my", "of", "on", "or", "please", "s", "should", "tell",
+    "that", "the", "there", "this", "to", "was", "what", "whats", "when", "where", "which", "who", "why",
+    "will", "with", "would", "you",
+}
+
+# Ways of asking for recent information, so "latest AI news" and "what's new in AI this week" match
+FRESHNESS_WORDS = {
+    "current", "currently", "headline", "headlines", "latest", "new", "newest", "news", "now", "recent",
+    "recently", "today", "update", "updates", "week",
+}
+RECENT = "@recent"
+
+# Words that turn a question around ("don't" is tokenized as "don" "t")
+NEGATIONS = {"not", "no", "without", "never", "nor", "cannot", "cant", "don", "doesn", "didn", "isn", "aren", "wasn", "t"}
+NEGATED = "@not"
+
+# Synonyms mapped to one stem
+SYNONYMS = {"top": "best", "share": "stock", "shar": "stock", "cost": "pric", "won": "win", "winn": "win"}
+
+# Prefixes that negate a word: install / uninstall, connect / disconnect, encrypt / decrypt
+NEGATING_PREFIXES = ("un", "dis", "de", "in", "im", "non", "anti", "mis")
+
+# Opposites that no prefix rule catches, as stems
+ANTONYMS = {
+    frozenset(pair) for pair in (
+        ("buy", "sell"), ("best", "worst"), ("pro", "con"), ("high", "low"), ("increas", "decreas"),
+        ("add", "remov"), ("start", "stop"), ("start", "clos"), ("open", "clos"), ("upload", "download"),
+        ("import", "export"), ("login", "logout"), ("up", "down"), ("win", "los"), ("fast", "slow"),
+        ("fastest", "slowest"), ("cheap", "expensiv"), ("cheapest", "expensiv"), ("before", "after"),
+        ("min", "max"), ("minimum", "maximum"), ("enabl", "disabl"), ("encrypt", "decrypt"),
+    )
+}
+
+_SUFFIXES = ("ations", "ation", "ings", "ing", "ers", "er", "ed", "es", "s", "e")
+
+def stem(word: str) -> str:
+    """Crude suffix stripping, so installation matches install and released matches release"""
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)]
+    return word
+
+def canonical_word(word: str) -> str:
+    stemmed = stem(word)
+    return SYNONYMS.get(word, SYNONYMS.get(stemmed, stemmed))
+
+def content_words(text: str) -> List[str]:
+    """Topic words of a message in order: stemmed, synonyms, freshness words and negations folded together"""
+    words: List[str] = []
+    for word in _TOKEN.findall(text.lower()):
+        if word in NEGATIONS:
+            words.append(NEGATED)
+        elif word in FRESHNESS_WORDS:
+            words.append(RECENT)
+        elif word not in STOP_WORDS:
+            words.append(canonical_word(word))
+    return words
+
+def numbers(text: str) -> frozenset:
+    """Numbers in a text; queries about different versions or years must never share an answer"""
+    return frozenset(_NUMBER.findall(text))
+
+class QueryTerms(NamedTuple):
+    """What two messages must agree on, beyond embedding similarity, to share a search context"""
+    words: FrozenSet[str]
+    numbers: FrozenSet[str]
+    directions: Dict[str, str]  # word -> "from", "to" or "into"
+
+def query_terms(text: str) -> QueryTerms:
+    lowered = text.lower()
+    return QueryTerms(
+        words=frozenset(content_words(lowered)),
+        numbers=numbers(lowered),
+        directions={canonical_word(word): marker for marker, word in _DIRECTION.findall(lowered)},
+    )
+
+def word_overlap(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    """Jaccard overlap of two content word sets"""
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+def contradicts(a: QueryTerms, b: QueryTerms) -> bool:
+    """Whether one message negates the other, asks for the opposite or reverses a direction"""
+    if (NEGATED in a.words) != (NEGATED in b.words):
+        return True
+    if any(b.directions.get(word, marker) != marker for word, marker in a.directions.items()):
+        return True
+    for x in a.words - b.words:
+        for y in b.words - a.words:
+            if frozenset((x, y)) in ANTONYMS:
+                return True
+            longer, shorter = (x, y) if len(x) > len(y) else (y, x)
+            if any(longer == prefix + shorter for prefix in NEGATING_PREFIXES):
+                return True
+    return False
+
+def compatible(query: QueryTerms, cached: QueryTerms, min_overlap: float) -> bool:
+    """
+    Guards on top of the embedding similarity: same numbers, enough shared content words, no
+    contradiction, and no topic word in the new query that the cached one lacks. A more
+    specific question ("latest AI news in China") must not get a general one's context.
+    """
+    if query.words - cached.words - {RECENT}:
+        return False
+    return (
+        query.numbers == cached.numbers
+        and word_overlap(query.words, cached.words) >= min_overlap
+        and not contradicts(query, cached)
+    )
+
+class HashingVectorizer:
+    """
+    CPU-only text embedding: hashed word unigrams, bigrams and character trigrams.
+
+    Vectors are sublinear-TF weighted and L2-normalized, so a dot product is the cosine similarity.
+    """
+
+    def __init__(self, n_features: int = 2 ** 12):
+        self.n_features = n_features
+
+    def features(self, text: str) -> List[str]:
+        words = content_words(text)
+        grams = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+        # Character trigrams make near spellings similar
+        grams += [f"#{word[i:i + 3]}" for word in words for i in range(max(len(word) - 2, 1))]
+        return grams
+
+    def transform(self, text: str) -> "np.ndarray":
+        """Embed a text as a normalized float32 vector"""
+        vector = np.zeros(self.n_features, dtype=np.float32)
+        for gram in self.features(text):
+            vector[zlib.crc32(gram.encode()) % self.n_features] += 1.0
+        np.log1p(vector, out=vector)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+@singleton
+class SemanticCache:
+    """
+    Nearest-neighbour cache of web RAG responses keyed by the embedded user message.
+
+    Embeddings live in one preallocated matrix used as a ring buffer, so a lookup is a
+    single matrix-vector product. A stored search context is reused for a new message when
+    the cosine similarity reaches SEMANTIC_CACHE_THRESHOLD, the entry is younger than
+    SEMANTIC_CACHE_TTL and came from the same engine and summarizer, and the two messages
+    pass the word guards: same numbers, content word overlap of at least
+    SEMANTIC_CACHE_MIN_WORD_OVERLAP, no topic word the cached message lacks, and neither
+    negates the other or asks for the opposite.
+    The answer itself is still generated for the new message. Both thresholds are tuned
+    with `scripts/tune_semantic_cache.py` on labelled pairs.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._metrics = MetricsRegistry()
+        self.enabled = settings.SEMANTIC_CACHE_ENABLED and np is not None
+        if settings.SEMANTIC_CACHE_ENABLED and np is None:
+            self.logger.warning("numpy is not installed, semantic cache disabled")
+        if not self.enabled:
+            return
+
+        self._vectorizer = HashingVectorizer(settings.SEMANTIC_CACHE_FEATURES)
+        self._capacity = settings.SEMANTIC_CACHE_MAX_ENTRIES
+        self._vectors = np.zeros((self._capacity, self._vectorizer.n_features), dtype=np.float32)
+        self._created_at = np.full(self._capacity, -np.inf)
+        self._engine_ids = np.full(self._capacity, "", dtype=object)
+        self._summarizers = np.full(self._capacity, "", dtype=object)
+        self._terms: List[Optional[QueryTerms]] = [None] * self._capacity
+        self._responses: List[Optional[WebRAGResponse]] = [None] * self._capacity
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def lookup(self, query: str, engine_id: SearchEngineID, summarizer: str) -> Optional[WebRAGResponse]:
+        """
+        Find a fresh response to a similar query.
+
+        Args:
+            query: The user's message
+            engine_id: The search engine the context must come from
+            summarizer: Model and summarization mode the context's summaries must come from
+
+        Returns:
+            Optional[WebRAGResponse]: A copy of the cached response adapted to `query`, None on a miss
+        """
+        if not self.enabled:
+            return None
+
+        start = time.perf_counter()
+        vector = self._vectorizer.transform(query)
+        terms = query_terms(query)
+        response = None
+        with self._lock:
+            similarities = self._vectors @ vector
+            # Expired entries, other engines and other summarizers never match
+            similarities[(time.monotonic() - self._created_at) > settings.SEMANTIC_CACHE_TTL] = -1.0
+            similarities[self._engine_ids != engine_id.value] = -1.0
+            similarities[self._summarizers != summarizer] = -1.0
+            candidates = np.flatnonzero(similarities >= settings.SEMANTIC_CACHE_THRESHOLD)
+            for index in candidates[np.argsort(-similarities[candidates])]:
+                if compatible(terms, self._terms[index], settings.SEMANTIC_CACHE_MIN_WORD_OVERLAP):
+                    response = self._responses[index]
+                    similarity = float(similarities[index])
+                    break
+
+        self._record_lookup(hit=response is not None, elapsed_ms=(time.perf_counter() - start) * 1000)
+        if response is None:
+            return None
+        self.logger.info(f"Semantic cache hit ({similarity:.2f}) for '{query}', reusing context of '{response.search_query}'")
+        return response.model_copy(update={"search_query": query, "cached_from": response.search_query})
+
+    def store(self, query: str, response: WebRAGResponse, summarizer: str) -> None:
+        """Store the response for a query, replacing the oldest entry when full"""
+        if not self.enabled:
+            return
+
+        vector = self._vectorizer.transform(query)
+        with self._lock:
+            index = self._next
+            self._vectors[index] = vector
+            self._created_at[index] = time.monotonic()
+            self._engine_ids[index] = response.engine_id.value
+            self._summarizers[index] = summarizer
+            self._responses[index] = response
+            self._terms[index] = query_terms(query)
+            self._next = (index + 1) % self._capacity
+
+    def _record_lookup(self, hit: bool, elapsed_ms: float) -> None:
+        self._metrics.incr("semantic_cache.hits" if hit else "semantic_cache.misses")
+        self._metrics.incr("semantic_cache.lookup_ms_total", elapsed_ms)
+        self._metrics.set_gauge("semantic_cache.lookup_ms", elapsed_ms)
+        hits = self._metrics.get("semantic_cache.hits")
+        self._metrics.set_gauge("semantic_cache.hit_rate", hits / (hits + self._metrics.get("semantic_cache.misses")))
@@ -0,0 +1,60 @@
+import hashlib
+import logging
+from typing import Optional, Tuple
+from src.cache.memory import TTLCache
+from src.config.settings import settings
+from src.schemas.llm import ModelID
+from src.utils.decorators import singleton
+from src.utils.metrics import MetricsRegistry
+from src.utils.text import normalize_query
+
+SummaryKey = Tuple[str, str, str, str]
+
+@singleton
+class SummaryCache:
+    """
+    In-memory cache of page summaries.
+
+    Keyed by (content hash, normalized query, model id, prompt version) so the same page
+    summarized for the same question by the same model and prompt is only paid for once.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._metrics = MetricsRegistry()
+        self._cache: TTLCache[str] = TTLCache(
+            max_entries=settings.SUMMARY_CACHE_MAX_ENTRIES,
+            max_bytes=settings.SUMMARY_CACHE_MAX_BYTES,
+            ttl=settings.SUMMARY_CACHE_TTL,
+            sizeof=len,
+        )
+
+    @staticmethod
+    def make_key(content: str, query: str, model_id: ModelID, prompt_version: str) -> SummaryKey:
+        """Build the cache key for a summary"""
+        content_hash = hashlib.sha256(content.encode()).hexdigest()
+        return content_hash, normalize_query(query), ModelID(model_id).value, prompt_version
+
+    def get(self, key: SummaryKey, prompt_chars: int) -> Optional[str]:
+        """
+        Get a cached summary.
+
+        Args:
+            key: Key built by `make_key`
+            prompt_chars: Size of the prompt that a hit avoids sending, used to estimate saved tokens
+        """
+        summary = self._cache.get(key)
+        if summary is None:
+            self._metrics.incr("summary_cache.misses")
+            return None
+
+        # ~4 characters per token
+        saved_tokens = (prompt_chars + len(summary)) // 4
+        self._metrics.incr("summary_cache.hits")
+        self._metrics.incr("summary_cache.saved_tokens", saved_tokens)
+        self.logger.debug(f"Summary cache hit, saved ~{saved_tokens} tokens")
+        return summary
+
+    def set(self, key: SummaryKey, summary: str) -> None:
+        """Store a summary"""
+        self._cache.set(key, summary)
@@ -20,11 +20,143 @@ class Settings(BaseSettings):
     # OpenAI Settings
     OPENAI_API_KEY: str = ""
     OPENAI_MODEL: str = "gpt-4o-mini"
+    OPENAI_BASE_URL: str = ""                   # optional override, e.g. an OpenAI-compatible proxy
+
+    # LLM Client Settings
+    LLM_TIMEOUT: float = 60.0
+    LLM_CONNECT_TIMEOUT: float = 5.0
+    LLM_MAX_RETRIES: int = 2                    # retries of transient failures (timeouts, 429, 5xx)
+    LLM_MAX_CONNECTIONS: int = 100
+    LLM_MAX_KEEPALIVE_CONNECTIONS: int = 20
+
+    # Rate Limit Settings (per provider, match your quota; 0 disables a limit)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_MAX_QUEUE_WAIT: float = 10.0     # seconds a call may queue before it is rejected
+    AZURE_RATE_LIMIT_RPM: int = 600
+    AZURE_RATE_LIMIT_TPM: int = 100000
+    AZURE_MAX_CONCURRENCY: int = 32
+    OPENAI_RATE_LIMIT_RPM: int = 500
+    OPENAI_RATE_LIMIT_TPM: int = 200000
+    OPENAI_MAX_CONCURRENCY: int = 32
+    GOOGLE_RATE_LIMIT_RPM: int = 2000           # Gemini
+    GOOGLE_RATE_LIMIT_TPM: int = 4000000
+    GOOGLE_MAX_CONCURRENCY: int = 32
+    GOOGLE_CSE_RATE_LIMIT_RPM: int = 100        # Custom Search queries per minute
+    GOOGLE_CSE_MAX_CONCURRENCY: int = 10
+
+    # Resilience Settings
+    SEARCH_MAX_RETRIES: int = 2
+    RETRY_BASE_DELAY: float = 0.5               # seconds, doubled per attempt with full jitter
+    RETRY_MAX_DELAY: float = 8.0                # longer Retry-After values fail instead of waiting
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD: int = 5  # consecutive transient failures that open a provider's breaker
+    CIRCUIT_BREAKER_RESET_TIMEOUT: float = 30.0 # seconds an open breaker fails fast before a trial call
 
     # Search Settings
     GOOGLE_CSE_ID: str = ""
     GOOGLE_CSE_API_KEY: str = ""
 
+    # HTTP Client Settings
+    HTTP_TIMEOUT: float = 10.0
+    HTTP_CONNECT_TIMEOUT: float = 5.0
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = 6
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_ENABLE_HTTP2: bool = True              # only used when the optional `h2` package is installed
+
+    # HTML Extraction Settings
+    HTML_EXTRACTOR: str = "auto"                # "auto", "selectolax", "lxml" or "bs4"
+    EXTRACTION_MAX_BYTES: int = 2 * 1024 * 1024 # stop downloading a page after this many bytes
+
+    # Page Cache Settings
+    PAGE_CACHE_TTL: float = 3600.0              # seconds before a cached page is revalidated
+    PAGE_CACHE_MAX_ENTRIES: int = 1000
+    PAGE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    PAGE_CACHE_DIR: str = ".cache/pages"        # empty string disables the on-disk tier
+    PAGE_CACHE_DISK_MAX_BYTES: int = 512 * 1024 * 1024
+
+    # Summary Cache Settings
+    SUMMARY_CACHE_TTL: float = 6 * 3600.0
+    SUMMARY_CACHE_MAX_ENTRIES: int = 5000
+    SUMMARY_CACHE_MAX_BYTES: int = 16 * 1024 * 1024
+
+    # Completion Cache Settings
+    COMPLETION_CACHE_ENABLED: bool = True       # exact-match cache for opted-in helper calls, never user-facing answers
+    COMPLETION_CACHE_TTL: float = 3600.0
+    COMPLETION_CACHE_MAX_ENTRIES: int = 10000
+    COMPLETION_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    COMPLETION_CACHE_DIR: str = ""              # empty string disables the on-disk tier
+    COMPLETION_CACHE_DISK_MAX_BYTES: int = 256 * 1024 * 1024
+
+    # Search Cache Settings
+    SEARCH_CACHE_ENABLED: bool = True
+    SEARCH_CACHE_STALE_TTL: float = 3600.0     # seconds stale results are served while refreshing
+    SEARCH_CACHE_MAX_ENTRIES: int = 2000
+    SEARCH_CACHE_BACKEND: str = ""              # shared backend: "" (in-process only) or "disk"
+    SEARCH_CACHE_DIR: str = ".cache/search"
+    SEARCH_CACHE_DISK_MAX_BYTES: int = 64 * 1024 * 1024
+
+    # Semantic Cache Settings
+    SEMANTIC_CACHE_ENABLED: bool = True         # needs the optional numpy dependency
+    SEMANTIC_CACHE_THRESHOLD: float = 0.65      # cosine similarity above which search context is reused, see scripts/tune_semantic_cache.py
+    SEMANTIC_CACHE_MIN_WORD_OVERLAP: float = 0.65 # share of content words two messages must have in common
+    SEMANTIC_CACHE_TTL: float = 900.0           # seconds a search context stays reusable
+    SEMANTIC_CACHE_MAX_ENTRIES: int = 1000
+    SEMANTIC_CACHE_FEATURES: int = 4096         # embedding dimensions
+
+    # Search Gate Settings
+    SEARCH_GATE_ENABLED: bool = True            # decide locally before asking the LLM
+    SEARCH_GATE_MODEL_PATH: str = ""            # trained hashed n-gram model, rules only when empty
+    SEARCH_GATE_UPPER_THRESHOLD: float = 0.85   # model score above which search is used without the LLM
+    SEARCH_GATE_LOWER_THRESHOLD: float = 0.15   # model score below which search is skipped without the LLM
+    SEARCH_GATE_MIN_HELD_OUT_AGREEMENT: float = 0.95  # cross-validated agreement with the LLM gate a model needs to be used
+    SEARCH_GATE_MIN_HELD_OUT_DECISIONS: int = 200   # held-out model decisions behind that agreement
+
+    # Context Budget Settings
+    CONTEXT_MAX_INPUT_TOKENS: int = 32000       # cap on prompt tokens, even for larger context windows, unless the model sets its own
+    CONTEXT_OUTPUT_TOKENS: int = 4096           # tokens reserved for the answer (capped by the model's limit)
+    CONTEXT_SEARCH_SHARE: float = 0.6           # share of the input budget for search context, the rest is history
+
+    # Chat Repository Settings
+    CHAT_REPOSITORY_BACKEND: str = "sqlite"     # "sqlite" (durable) or "memory" (lost on restart)
+    CHAT_SQLITE_PATH: str = ".data/chats.db"
+    CHAT_CACHE_ENABLED: bool = True             # LRU of hot chats in front of the sqlite backend
+    CHAT_CACHE_MAX_ENTRIES: int = 1000
+    CHAT_CACHE_TTL: float = 1800.0
+
+    # Chat History Settings
+    CHAT_HISTORY_COMPACTION_ENABLED: bool = True
+    CHAT_HISTORY_WINDOW_TURNS: int = 6          # turns kept verbatim, older ones are folded into a summary
+    CHAT_HISTORY_SUMMARY_MAX_CHARS: int = 2000
+
+    # LLM Routing Settings
+    LLM_ROUTING_ENABLED: bool = False           # route answers across equivalent models (needs their credentials)
+    LLM_HEDGE_ENABLED: bool = True              # duplicate slow requests to an equivalent model, first answer wins
+    LLM_HEDGE_PERCENTILE: float = 0.95          # latency percentile after which a request is hedged
+    LLM_HEDGE_MIN_DELAY: float = 0.5            # seconds, never hedge sooner than this
+    LLM_HEDGE_DEFAULT_DELAY: float = 2.0        # seconds, used until enough latencies are recorded
+    LLM_ROUTING_EWMA_ALPHA: float = 0.2         # weight of the newest sample in latency and error rate averages
+    LLM_ROUTING_MAX_ERROR_RATE: float = 0.5     # above this, requests go to a healthier equivalent model first
+
+    # Web RAG Settings
+    WEB_RAG_PLANNING_MODE: str = "structured"   # "structured": one call for gate + queries, "sequential": two calls
+    WEB_RAG_MAX_SEARCH_QUERIES: int = 3
+    WEB_RAG_NUM_RESULTS: int = 5
+    WEB_RAG_MAX_CONCURRENCY: int = 5            # max pages fetched / summarized at the same time
+    WEB_RAG_FETCH_TIMEOUT: float = 10.0         # deadline in seconds for retrieving a single page
+    WEB_RAG_SUMMARIZE_TIMEOUT: float = 30.0     # deadline in seconds for summarizing a single page
+    WEB_RAG_MIN_GOOD_SOURCES: int = 3           # stop fetching / summarizing once this many sources are good, 0 waits for all
+    WEB_RAG_MIN_SUMMARY_CHARS: int = 200        # shorter summaries are kept but don't count as good sources
+    WEB_RAG_CONTEXT_BUDGET: float = 15.0        # seconds for building the whole search context, 0 disables
+
+    # Speculative Planning Settings (LLM gate path: "sequential" mode and unparseable structured plans)
+    WEB_RAG_SPECULATION_ENABLED: bool = False   # generate the search query while the LLM gate is still deciding
+    WEB_RAG_SPECULATIVE_SEARCH: bool = False    # also run the search before the gate has decided
+    WEB_RAG_SPECULATION_MIN_TRUE_RATE: float = 0.6  # speculate only where the gate says "search" at least this often
+    WEB_RAG_SPECULATION_MIN_SAMPLES: int = 10   # gate decisions needed before a model or chat rate is trusted
+    WEB_RAG_SPECULATION_EWMA_ALPHA: float = 0.1 # weight of the newest gate decision in the rate
+    WEB_RAG_SPECULATION_MAX_CHATS: int = 10000  # chats whose gate history is tracked
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding='utf-8',
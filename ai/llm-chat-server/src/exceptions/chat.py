@@ -4,4 +4,12 @@ class ChatError(Exception):
 
 class ChatNotFoundError(ChatError):
     """Raised when chat_id is not found"""
-    pass
\ No newline at end of file
+    pass
+
+class InvalidCursorError(ChatError):
+    """Raised when a pagination cursor cannot be decoded"""
+    pass
+
+class DuplicateMessageError(ChatError):
+    """Raised when a message_id is already stored in the chat"""
+    pass
@@ -0,0 +1,6 @@
+class RateLimitExceededError(Exception):
+    """Raised when a provider's queue is too long to wait for its rate limit"""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
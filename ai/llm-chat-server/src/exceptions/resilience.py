@@ -0,0 +1,6 @@
+class CircuitOpenError(Exception):
+    """Raised without calling a provider while its circuit breaker is open"""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
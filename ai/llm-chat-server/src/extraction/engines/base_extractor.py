@@ -0,0 +1,46 @@
+import codecs
+from abc import ABC, abstractmethod
+from typing import ClassVar, Optional
+from bs4.dammit import EncodingDetector
+
+# Page chrome that never carries the content we summarize
+REMOVED_TAGS = ('script', 'style', 'noscript', 'template', 'nav', 'footer', 'header', 'aside')
+
+# Labels browsers decode as windows-1252, which defines the 0x80-0x9f range latin-1 leaves to control codes
+_WINDOWS_1252_ALIASES = ("ascii", "iso8859-1")
+
+def decode_html(html: bytes, charset: Optional[str] = None) -> str:
+    """
+    Decode an HTML document the way browsers do.
+
+    Tries a byte-order mark, the HTTP Content-Type charset, a <meta> or XML declaration and
+    UTF-8, the first that decodes cleanly wins; falls back to windows-1252.
+    """
+    html, bom_encoding = EncodingDetector.strip_byte_order_mark(html)
+    candidates = (bom_encoding, charset, EncodingDetector.find_declared_encoding(html, is_html=True), "utf-8")
+    for candidate in candidates:
+        if not candidate:
+            continue
+        try:
+            if codecs.lookup(candidate).name in _WINDOWS_1252_ALIASES:
+                candidate = "windows-1252"
+            return html.decode(candidate)
+        except (LookupError, UnicodeDecodeError):
+            continue
+    return html.decode("windows-1252", errors="replace")
+
+class BaseExtractor(ABC):
+    """Base class for HTML text extractors"""
+
+    NAME: ClassVar[str]                 # Static class variable for the extractor name
+    MODULE: ClassVar[str]               # Parser module that must be importable for the extractor to be available
+
+    @abstractmethod
+    def extract(self, html: bytes, charset: Optional[str] = None) -> str:
+        """Extract readable text from an HTML document, one block per line; `charset` is the HTTP one if known"""
+        pass
+
+    @staticmethod
+    def clean_lines(text: str) -> str:
+        """Strip every line and drop empty ones"""
+        return '\n'.join(line.strip() for line in text.splitlines() if line.strip())
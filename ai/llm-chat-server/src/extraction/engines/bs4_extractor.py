@@ -0,0 +1,15 @@
+from typing import ClassVar, Optional
+from bs4 import BeautifulSoup
+from src.extraction.engines.base_extractor import BaseExtractor, REMOVED_TAGS, decode_html
+
+class BeautifulSoupExtractor(BaseExtractor):
+    """Pure Python extractor using BeautifulSoup's html.parser, always available"""
+
+    NAME: ClassVar[str] = "bs4"
+    MODULE: ClassVar[str] = "bs4"
+
+    def extract(self, html: bytes, charset: Optional[str] = None) -> str:
+        soup = BeautifulSoup(decode_html(html, charset), 'html.parser')
+        for element in soup(list(REMOVED_TAGS)):
+            element.decompose()
+        return self.clean_lines(soup.get_text(separator='\n', strip=True))
@@ -0,0 +1,23 @@
+import re
+from typing import ClassVar, Optional
+from src.extraction.engines.base_extractor import BaseExtractor, REMOVED_TAGS, decode_html
+
+# lxml refuses decoded text that still declares an encoding
+_XML_DECLARATION = re.compile(r"^\s*<\?xml[^>]*\?>")
+
+class LxmlExtractor(BaseExtractor):
+    """C-backed extractor using lxml (libxml2)"""
+
+    NAME: ClassVar[str] = "lxml"
+    MODULE: ClassVar[str] = "lxml"
+
+    def extract(self, html: bytes, charset: Optional[str] = None) -> str:
+        # Optional dependency, imported on first use
+        from lxml import etree, html as lxml_html
+
+        text = _XML_DECLARATION.sub("", decode_html(html, charset), count=1)
+        if not text.strip():
+            return ""
+        document = lxml_html.document_fromstring(text)
+        etree.strip_elements(document, etree.Comment, *REMOVED_TAGS, with_tail=False)
+        return self.clean_lines('\n'.join(document.itertext()))
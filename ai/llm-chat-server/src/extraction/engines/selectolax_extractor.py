@@ -0,0 +1,20 @@
+from typing import ClassVar, Optional
+from src.extraction.engines.base_extractor import BaseExtractor, REMOVED_TAGS, decode_html
+
+class SelectolaxExtractor(BaseExtractor):
+    """C-backed extractor using selectolax's Lexbor backend, the fastest option"""
+
+    NAME: ClassVar[str] = "selectolax"
+    MODULE: ClassVar[str] = "selectolax"
+
+    def extract(self, html: bytes, charset: Optional[str] = None) -> str:
+        # Optional dependency, imported on first use
+        from selectolax.lexbor import LexborHTMLParser
+
+        # Lexbor assumes UTF-8 for bytes, so decode with the page's own charset first
+        tree = LexborHTMLParser(decode_html(html, charset))
+        tree.strip_tags(list(REMOVED_TAGS))
+        root = tree.body or tree.root
+        if root is None:
+            return ""
+        return self.clean_lines(root.text(separator='\n', strip=True))
@@ -0,0 +1,47 @@
+import importlib.util
+import logging
+from typing import Dict, List, Type
+from src.config.settings import settings
+from src.extraction.engines.base_extractor import BaseExtractor
+from src.extraction.engines.bs4_extractor import BeautifulSoupExtractor
+from src.extraction.engines.lxml_extractor import LxmlExtractor
+from src.extraction.engines.selectolax_extractor import SelectolaxExtractor
+from src.utils.decorators import singleton
+
+@singleton
+class ExtractorRegistry:
+    """Registry for managing HTML text extractors"""
+
+    # Fastest first; "auto" picks the first one whose parser is installed
+    _extractors: Dict[str, Type[BaseExtractor]] = {
+        SelectolaxExtractor.NAME: SelectolaxExtractor,
+        LxmlExtractor.NAME: LxmlExtractor,
+        BeautifulSoupExtractor.NAME: BeautifulSoupExtractor,
+    }
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+    def list_available(self) -> List[str]:
+        """List extractors whose parser module is installed"""
+        return [
+            name for name, extractor in self._extractors.items()
+            if importlib.util.find_spec(extractor.MODULE) is not None
+        ]
+
+    def get_extractor(self, name: str = "auto") -> BaseExtractor:
+        """Get an extractor by name, or the fastest available one for "auto"."""
+        available = self.list_available()
+        if name == "auto":
+            name = available[0]
+        elif name not in available:
+            self.logger.warning(f"HTML extractor '{name}' is not available, using '{available[0]}'")
+            name = available[0]
+        return self._extractors[name]()
+
+    def get_default(self) -> BaseExtractor:
+        """Get the extractor configured in settings"""
+        if not hasattr(self, '_default'):
+            self._default = self.get_extractor(settings.HTML_EXTRACTOR)
+            self.logger.info(f"Using HTML extractor: {self._default.NAME}")
+        return self._default
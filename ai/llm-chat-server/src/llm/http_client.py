@@ -0,0 +1,28 @@
+from typing import Optional
+import httpx
+from src.config.settings import settings
+
+_shared_client: Optional[httpx.AsyncClient] = None
+
+def get_llm_http_client() -> httpx.AsyncClient:
+    """Get the connection pool shared by all OpenAI-compatible provider clients"""
+    global _shared_client
+    if _shared_client is None or _shared_client.is_closed:
+        # Imported here so the OpenAI SDK loads with the first provider client, not at startup
+        from openai import DefaultAsyncHttpxClient
+
+        _shared_client = DefaultAsyncHttpxClient(
+            timeout=httpx.Timeout(settings.LLM_TIMEOUT, connect=settings.LLM_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=settings.LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+            ),
+        )
+    return _shared_client
+
+async def close_llm_http_client() -> None:
+    """Close the shared provider connection pool"""
+    global _shared_client
+    if _shared_client is not None and not _shared_client.is_closed:
+        await _shared_client.aclose()
+    _shared_client = None
@@ -1,33 +1,62 @@
-from typing import Dict, List
+from typing import Dict, List, Type
 from src.llm.models.base_llm import BaseLLM
-from src.schemas.llm import ModelInfo, ModelID
+from src.llm.models.governed_llm import GovernedLLM
+from src.llm.models.resilient_llm import ResilientLLM
+from src.schemas.llm import ModelInfo, ModelID, SummarizationMode
 from src.utils.decorators import singleton
+from src.config.settings import settings
 from src.llm.models.azure_gpt4o_mini import AzureGPT4oMini
 from src.llm.models.azure_gpt4o import AzureGPT4o
 from src.llm.models.google_gemini2_flash import GoogleGemini2Flash
 from src.llm.models.openai_gpt4o_mini import OpenAIGPT4oMini
 from src.exceptions.llm import ModelNotFoundError
+from src.utils.rate_limit import get_governor
+from src.utils.resilience import RetryPolicy
 
 @singleton
 class LLMRegistry:
-    """Registry for managing LLM models"""
-    
-    _models: Dict[ModelID, BaseLLM] = {
-        ModelID.AZURE_GPT4O_MINI: AzureGPT4oMini(),
-        ModelID.AZURE_GPT4O: AzureGPT4o(),
-        ModelID.GOOGLE_GEMINI2_FLASH: GoogleGemini2Flash(),
-        ModelID.OPENAI_GPT4O_MINI: OpenAIGPT4oMini(),
+    """
+    Registry for managing LLM models.
+
+    Model classes are registered statically; each client is constructed on first use, so
+    startup neither loads the provider SDKs nor requires every provider to be configured.
+    """
+
+    _model_classes: Dict[ModelID, Type[BaseLLM]] = {
+        ModelID.AZURE_GPT4O_MINI: AzureGPT4oMini,
+        ModelID.AZURE_GPT4O: AzureGPT4o,
+        ModelID.GOOGLE_GEMINI2_FLASH: GoogleGemini2Flash,
+        ModelID.OPENAI_GPT4O_MINI: OpenAIGPT4oMini,
+    }
+
+    # Constructed models, filled by get_model
+    _models: Dict[ModelID, BaseLLM] = {}
+
+    # Models not listed summarize one page per call
+    _summarization_modes: Dict[ModelID, SummarizationMode] = {
+        ModelID.GOOGLE_GEMINI2_FLASH: SummarizationMode.BATCHED,     # 1M context fits every page in one call
+    }
+
+    # Turns of chat history sent verbatim, models not listed use CHAT_HISTORY_WINDOW_TURNS
+    _history_window_turns: Dict[ModelID, int] = {
+        ModelID.GOOGLE_GEMINI2_FLASH: 20,       # large context, cheap input tokens
+    }
+
+    # Models serving the same weights through another provider, used for routing and hedging
+    _equivalent_models: Dict[ModelID, List[ModelID]] = {
+        ModelID.AZURE_GPT4O_MINI: [ModelID.OPENAI_GPT4O_MINI],
+        ModelID.OPENAI_GPT4O_MINI: [ModelID.AZURE_GPT4O_MINI],
     }
 
     def list_models(self) -> List[ModelInfo]:
         """List all available models"""
-        return [model.MODEL_INFO for model in self._models.values()]
+        return [model_class.MODEL_INFO for model_class in self._model_classes.values()]
 
     def get_model_info(self, model_id: str) -> ModelInfo:
         """Get model information for a specific model"""
         try:
             model_enum = ModelID(model_id)
-            return self._models[model_enum].MODEL_INFO
+            return self._model_classes[model_enum].MODEL_INFO
         except (ValueError, KeyError):
             raise ModelNotFoundError(
                 f"Invalid model_id: {model_id}. "
@@ -35,12 +64,34 @@ class LLMRegistry:
             )
 
     def get_model(self, model_id: ModelID) -> BaseLLM:
-        """Get the LLM instance for the specified model_id"""
+        """Get the LLM instance for the specified model_id, constructing its client on first use"""
         try:
             model_enum = ModelID(model_id)
-            return self._models[model_enum]
-        except ValueError:
+            model_class = self._model_classes[model_enum]
+        except (ValueError, KeyError):
             raise ModelNotFoundError(
                 f"Invalid model_id: {model_id}. "
                 f"Supported models: {[m.value for m in ModelID]}"
-            )
\ No newline at end of file
+            )
+
+        if model_enum not in self._models:
+            # Raises ConfigurationError when the provider's environment variables are missing
+            model = model_class()
+            provider = model.MODEL_INFO.provider.lower()
+            if settings.RATE_LIMIT_ENABLED:
+                model = GovernedLLM(model, get_governor(provider))
+            # Every attempt queues on the governor again, a retry is a new request to the provider
+            self._models[model_enum] = ResilientLLM(model, RetryPolicy(provider, settings.LLM_MAX_RETRIES))
+        return self._models[model_enum]
+
+    def get_summarization_mode(self, model_id: ModelID) -> SummarizationMode:
+        """Get how web pages are summarized for the specified model_id"""
+        return self._summarization_modes.get(ModelID(model_id), SummarizationMode.PER_PAGE)
+
+    def get_history_window(self, model_id: ModelID) -> int:
+        """Get how many recent turns are sent verbatim for the specified model_id"""
+        return self._history_window_turns.get(ModelID(model_id), settings.CHAT_HISTORY_WINDOW_TURNS)
+
+    def get_equivalent_models(self, model_id: ModelID) -> List[ModelID]:
+        """Get the models that can answer in place of the specified model_id"""
+        return list(self._equivalent_models.get(ModelID(model_id), []))
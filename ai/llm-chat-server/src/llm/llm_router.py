@@ -0,0 +1,289 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import AsyncIterator, Deque, Dict, List, Optional, Tuple
+from src.config.settings import settings
+from src.llm.llm_registry import LLMRegistry
+from src.llm.models.base_llm import BaseLLM
+from src.schemas.chat import AssistantMessage, Message
+from src.schemas.llm import ModelID
+from src.utils.decorators import singleton
+from src.utils.metrics import MetricsRegistry
+from src.utils.resilience import get_breaker
+
+LATENCY_WINDOW = 200        # recent latencies kept per model for the hedge percentile
+MIN_LATENCY_SAMPLES = 20    # below this, LLM_HEDGE_DEFAULT_DELAY is used
+
+class ModelStats:
+    """EWMA latency and error rate of one model, plus a window of recent latencies"""
+
+    def __init__(self):
+        self.ewma_latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    def record_success(self, latency: float) -> None:
+        alpha = settings.LLM_ROUTING_EWMA_ALPHA
+        self.ewma_latency = latency if self.ewma_latency is None else alpha * latency + (1 - alpha) * self.ewma_latency
+        self.error_rate = (1 - alpha) * self.error_rate
+        self.latencies.append(latency)
+
+    def record_censored(self, latency: float) -> None:
+        """
+        A request cancelled after `latency` (a hedge loser) would have taken at least that long.
+
+        Kept in the window as a lower bound; leaving it out would keep only the fast samples and
+        drag the hedge percentile down, hedging more and more often.
+        """
+        self.latencies.append(latency)
+
+    def record_error(self) -> None:
+        alpha = settings.LLM_ROUTING_EWMA_ALPHA
+        self.error_rate = alpha + (1 - alpha) * self.error_rate
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Latency percentile over the recent window, None without enough samples"""
+        if len(self.latencies) < MIN_LATENCY_SAMPLES:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+@singleton
+class LLMRouter:
+    """
+    Latency-aware routing across equivalent models.
+
+    Tracks per-model EWMA latency and error rate. A request goes to the requested model
+    unless its error rate is above LLM_ROUTING_MAX_ERROR_RATE and an equivalent model is
+    healthier. If the chosen model has not answered after its LLM_HEDGE_PERCENTILE latency,
+    a hedged duplicate is sent to the fastest equivalent model; the first answer wins and
+    the other request is cancelled. Streams are hedged on time to first token.
+
+    Independently of routing, a request for a model whose provider's circuit breaker is
+    open goes to an equivalent model instead.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._llm_registry = LLMRegistry()
+        self._metrics = MetricsRegistry()
+        # Completions and time to first token have different latency profiles
+        self._stats: Dict[Tuple[ModelID, str], ModelStats] = {}
+
+    def _get_stats(self, model_id: ModelID, kind: str) -> ModelStats:
+        key = (ModelID(model_id), kind)
+        if key not in self._stats:
+            self._stats[key] = ModelStats()
+        return self._stats[key]
+
+    def _record(self, model_id: ModelID, kind: str, latency: Optional[float]) -> None:
+        stats = self._get_stats(model_id, kind)
+        if latency is None:
+            stats.record_error()
+        else:
+            stats.record_success(latency)
+            self._metrics.set_gauge(f"llm_router.{ModelID(model_id).value}.{kind}.ewma_ms", stats.ewma_latency * 1000)
+        self._metrics.set_gauge(f"llm_router.{ModelID(model_id).value}.error_rate", stats.error_rate)
+
+    def _record_cancelled(self, model_id: ModelID, kind: str, elapsed: float) -> None:
+        self._get_stats(model_id, kind).record_censored(elapsed)
+        self._metrics.incr(f"llm_router.{ModelID(model_id).value}.{kind}.censored")
+
+    def _candidates(self, model_id: ModelID, kind: str) -> List[ModelID]:
+        """The model to call first and the hedge candidates, healthiest and fastest first"""
+        model_id = ModelID(model_id)
+        if not settings.LLM_ROUTING_ENABLED:
+            # Without routing, an equivalent model still stands in while the provider's breaker is open
+            fallback = self._fallback(model_id) if self._breaker_open(model_id) else None
+            return [fallback] if fallback is not None else [model_id]
+
+        def sort_key(candidate: ModelID) -> Tuple[bool, float]:
+            stats = self._get_stats(candidate, kind)
+            unhealthy = stats.error_rate > settings.LLM_ROUTING_MAX_ERROR_RATE or self._breaker_open(candidate)
+            return unhealthy, stats.ewma_latency if stats.ewma_latency is not None else float("inf")
+
+        equivalents = [candidate for candidate in self._llm_registry.get_equivalent_models(model_id)
+                       if self._configured(candidate)]
+        equivalents.sort(key=sort_key)
+        candidates = [model_id] + equivalents
+        # Fail over up front when the requested model keeps erroring and an equivalent does not
+        if equivalents and sort_key(model_id)[0] and not sort_key(equivalents[0])[0]:
+            self.logger.info(f"Routing around unhealthy model {model_id.value} to {equivalents[0].value}")
+            candidates = equivalents + [model_id]
+        return candidates
+
+    def _breaker_open(self, model_id: ModelID) -> bool:
+        return get_breaker(self._llm_registry.get_model_info(model_id).provider.lower()).is_open
+
+    def _configured(self, model_id: ModelID) -> bool:
+        try:
+            self._llm_registry.get_model(model_id)
+        except Exception:
+            return False
+        return True
+
+    def _fallback(self, model_id: ModelID) -> Optional[ModelID]:
+        """First configured equivalent model whose provider's breaker is closed"""
+        for candidate in self._llm_registry.get_equivalent_models(model_id):
+            if self._breaker_open(candidate) or not self._configured(candidate):
+                continue
+            self.logger.warning(f"Circuit breaker open for {model_id.value}, falling back to {candidate.value}")
+            return candidate
+        return None
+
+    def select_model(self, model_id: ModelID) -> ModelID:
+        """The model a request for `model_id` is sent to first, e.g. for helper calls that are not hedged"""
+        return self._candidates(model_id, "completion")[0]
+
+    def _hedge_delay(self, model_id: ModelID, kind: str) -> float:
+        delay = self._get_stats(model_id, kind).percentile(settings.LLM_HEDGE_PERCENTILE)
+        if delay is None:
+            delay = settings.LLM_HEDGE_DEFAULT_DELAY
+        return max(delay, settings.LLM_HEDGE_MIN_DELAY)
+
+    def _get_backup(self, candidates: List[ModelID]) -> Optional[Tuple[ModelID, BaseLLM]]:
+        if not settings.LLM_HEDGE_ENABLED or len(candidates) < 2:
+            return None
+        try:
+            return candidates[1], self._llm_registry.get_model(candidates[1])
+        except Exception as e:
+            self.logger.warning(f"Hedge model {candidates[1].value} unavailable: {str(e)}")
+            return None
+
+    async def get_completion(
+        self,
+        model_id: ModelID,
+        system_instruction: str,
+        messages: List[Message],
+        json_mode: bool = False,
+    ) -> Tuple[AssistantMessage, ModelID]:
+        """
+        Get a completion from the requested model or an equivalent one.
+
+        Returns:
+            Tuple[AssistantMessage, ModelID]: The answer and the model that actually produced it
+        """
+        candidates = self._candidates(model_id, "completion")
+
+        async def call(candidate: ModelID, llm: BaseLLM) -> Tuple[AssistantMessage, ModelID]:
+            start = time.perf_counter()
+            try:
+                response = await llm.get_completion(system_instruction, messages, json_mode=json_mode)
+            except asyncio.CancelledError:
+                self._record_cancelled(candidate, "completion", time.perf_counter() - start)
+                raise
+            except Exception:
+                self._record(candidate, "completion", None)
+                raise
+            self._record(candidate, "completion", time.perf_counter() - start)
+            return response, candidate
+
+        primary = asyncio.create_task(call(candidates[0], self._llm_registry.get_model(candidates[0])))
+        backup_model = self._get_backup(candidates)
+        if backup_model is None:
+            return await primary
+
+        pending = {primary}
+        error: Optional[BaseException] = None
+        try:
+            done, pending = await asyncio.wait(pending, timeout=self._hedge_delay(candidates[0], "completion"))
+            if done and primary.exception() is None:
+                return primary.result()
+            if done:
+                error = primary.exception()
+
+            # Too slow or failed: the hedge races the primary, the first answer wins
+            self._metrics.incr("llm_router.hedges")
+            self.logger.info(f"Hedging request to {candidates[0].value} with {backup_model[0].value}")
+            pending.add(asyncio.create_task(call(*backup_model)))
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        response, answered_by = task.result()
+                        self._metrics.incr(f"llm_router.hedge_wins.{answered_by.value}")
+                        return response, answered_by
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def stream_completion(
+        self,
+        model_id: ModelID,
+        system_instruction: str,
+        messages: List[Message],
+    ) -> AsyncIterator[Tuple[ModelID, str]]:
+        """
+        Stream a completion from the requested model or an equivalent one.
+
+        Yields:
+            Tuple[ModelID, str]: The model producing the stream and a text delta
+        """
+        candidates = self._candidates(model_id, "first_token")
+
+        def open_stream(candidate: ModelID, llm: BaseLLM) -> Tuple[AsyncIterator[str], asyncio.Task]:
+            stream = llm.stream_completion(system_instruction=system_instruction, messages=messages)
+            start = time.perf_counter()
+
+            async def first_delta() -> Optional[str]:
+                try:
+                    delta = await stream.__anext__()
+                except StopAsyncIteration:
+                    # An empty stream is a valid (if unhelpful) answer, not a provider failure
+                    delta = None
+                except asyncio.CancelledError:
+                    self._record_cancelled(candidate, "first_token", time.perf_counter() - start)
+                    raise
+                except Exception:
+                    self._record(candidate, "first_token", None)
+                    raise
+                self._record(candidate, "first_token", time.perf_counter() - start)
+                return delta
+
+            return stream, asyncio.create_task(first_delta())
+
+        streams = {candidates[0]: open_stream(candidates[0], self._llm_registry.get_model(candidates[0]))}
+        backup_model = self._get_backup(candidates)
+        if backup_model is not None:
+            await asyncio.wait({streams[candidates[0]][1]}, timeout=self._hedge_delay(candidates[0], "first_token"))
+            primary_task = streams[candidates[0]][1]
+            if not primary_task.done() or primary_task.exception() is not None:
+                self._metrics.incr("llm_router.hedges")
+                self.logger.info(f"Hedging stream from {candidates[0].value} with {backup_model[0].value}")
+                streams[backup_model[0]] = open_stream(*backup_model)
+
+        # The first stream to produce a token wins, the others are cancelled and closed
+        winner: Optional[ModelID] = None
+        error: Optional[BaseException] = None
+        pending = {task: candidate for candidate, (_, task) in streams.items()}
+        try:
+            while pending and winner is None:
+                done, _ = await asyncio.wait(pending.keys(), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    candidate = pending.pop(task)
+                    if task.exception() is None and winner is None:
+                        winner = candidate
+                    elif task.exception() is not None:
+                        error = task.exception()
+        finally:
+            for task in pending:
+                task.cancel()
+            # A generator cannot be closed while the cancelled task is still inside it
+            await asyncio.gather(*pending, return_exceptions=True)
+            for candidate, (stream, _) in streams.items():
+                if candidate != winner:
+                    await stream.aclose()
+        if winner is None:
+            raise error
+
+        if len(streams) > 1:
+            self._metrics.incr(f"llm_router.hedge_wins.{winner.value}")
+        stream, first_task = streams[winner]
+        if first_task.result() is None:
+            return
+        yield winner, first_task.result()
+        async for delta in stream:
+            yield winner, delta
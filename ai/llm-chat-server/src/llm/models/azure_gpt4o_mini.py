@@ -4,8 +4,8 @@ from src.schemas.chat import Role, Message, AssistantMessage
 from src.utils.decorators import singleton
 from src.config.settings import settings
 from src.exceptions.llm import ConfigurationError, ClientInitializationError, GenerateCompletionError
-from typing import ClassVar, List
-from openai import AzureOpenAI
+from typing import AsyncIterator, ClassVar, Dict, List
+from src.llm.http_client import get_llm_http_client
 
 @singleton
 class AzureGPT4oMini(BaseLLM):
@@ -39,32 +39,44 @@ class AzureGPT4oMini(BaseLLM):
             if not self.deployment:
                 raise ConfigurationError("AZURE_GPT4O_MINI_DEPLOYMENT environment variable is not set")
 
+            # The SDK is imported on first use so startup does not pay for it
+            from openai import AsyncAzureOpenAI
+
             try:
-                self.client = AzureOpenAI(
+                self.client = AsyncAzureOpenAI(
                     azure_endpoint=self.endpoint,
                     api_key=self.api_key,
                     api_version=self.api_version,
+                    timeout=settings.LLM_TIMEOUT,
+                    max_retries=0,                      # retried by ResilientLLM
+                    http_client=get_llm_http_client(),
                 )
             except Exception as e:
                 raise ClientInitializationError(f"Failed to initialize Azure OpenAI client: {str(e)}")
                 
             self._initialized = True
 
-    async def get_completion(self, system_instruction: str, messages: List[Message]) -> AssistantMessage:
+    def _format_messages(self, system_instruction: str, messages: List[Message]) -> List[Dict[str, str]]:
+        """Format messages for the chat completions API"""
+        formatted_messages = [
+            {"role": Role.SYSTEM, "content": system_instruction}   # Add system message first
+        ]
+        # Extend the list directly instead of using unpacking
+        formatted_messages.extend(
+            message.model_dump(include={"role", "content"})
+            for message in messages
+        )
+        return formatted_messages
+
+    async def get_completion(self, system_instruction: str, messages: List[Message], json_mode: bool = False) -> AssistantMessage:
         """Get completion from Azure GPT-4o-mini model"""
+        from openai import NOT_GIVEN
+
         try:
-            formatted_messages = [
-                {"role": Role.SYSTEM, "content": system_instruction}       # Add system message first
-            ]
-            # Extend the list directly instead of using unpacking
-            formatted_messages.extend(
-                message.model_dump(include={"role", "content"}) 
-                for message in messages
-            )
-            
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=self.deployment,
-                messages=formatted_messages,
+                messages=self._format_messages(system_instruction, messages),
+                response_format={"type": "json_object"} if json_mode else NOT_GIVEN,
             )
 
             return AssistantMessage(
@@ -72,4 +84,20 @@ class AzureGPT4oMini(BaseLLM):
                 content=response.choices[0].message.content
             )
         except Exception as e:
-            raise GenerateCompletionError(f"Failed to get completion: {str(e)}")
+            raise GenerateCompletionError(f"Failed to get completion: {str(e)}") from e
+
+    async def stream_completion(self, system_instruction: str, messages: List[Message]) -> AsyncIterator[str]:
+        """Stream completion deltas from Azure GPT-4o-mini model"""
+        try:
+            stream = await self.client.chat.completions.create(
+                model=self.deployment,
+                messages=self._format_messages(system_instruction, messages),
+                stream=True,
+            )
+
+            async for chunk in stream:
+                # Azure sends a leading chunk without choices for content filter results
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except Exception as e:
+            raise GenerateCompletionError(f"Failed to stream completion: {str(e)}") from e
@@ -1,8 +1,10 @@
 from abc import ABC, abstractmethod
 from typing import ClassVar
 from src.schemas.llm import ModelInfo
-from src.schemas.chat import Message, AssistantMessage
-from typing import List
+from src.schemas.chat import Message, AssistantMessage, Role
+from src.cache.completion_cache import CompletionCache
+from src.config.settings import settings
+from typing import AsyncIterator, List
 
 class BaseLLM(ABC):
     """Base class for LLM implementations"""
@@ -14,6 +16,43 @@ class BaseLLM(ABC):
         pass
 
     @abstractmethod
-    async def get_completion(self, system_instruction: str, messages: List[Message]) -> AssistantMessage:
-        """Get completion from LLM"""
-        pass
\ No newline at end of file
+    async def get_completion(self, system_instruction: str, messages: List[Message], json_mode: bool = False) -> AssistantMessage:
+        """Get completion from LLM, constrained to a JSON object when `json_mode` is set"""
+        pass
+
+    async def get_cached_completion(
+        self,
+        system_instruction: str,
+        messages: List[Message],
+        json_mode: bool = False,
+        bypass_cache: bool = False,
+    ) -> AssistantMessage:
+        """
+        Get a completion through the exact-match completion cache.
+
+        Opt-in for deterministic helper calls whose identical prompts recur; user-facing
+        answers keep calling `get_completion` directly.
+
+        Args:
+            system_instruction: The system prompt
+            messages: The conversation messages
+            json_mode: Constrain the output to a JSON object
+            bypass_cache: Skip the cache for this call
+        """
+        if bypass_cache or not settings.COMPLETION_CACHE_ENABLED:
+            return await self.get_completion(system_instruction, messages, json_mode=json_mode)
+
+        cache = CompletionCache()
+        key = cache.make_key(self.MODEL_INFO.model_id, system_instruction, messages, {"json_mode": json_mode})
+        content = await cache.get(key)
+        if content is not None:
+            return AssistantMessage(role=Role.ASSISTANT, content=content)
+
+        response = await self.get_completion(system_instruction, messages, json_mode=json_mode)
+        await cache.set(key, response.content)
+        return response
+
+    @abstractmethod
+    def stream_completion(self, system_instruction: str, messages: List[Message]) -> AsyncIterator[str]:
+        """Stream completion from LLM as an async generator of text deltas"""
+        pass
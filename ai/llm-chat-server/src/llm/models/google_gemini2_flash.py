@@ -4,8 +4,10 @@ from src.schemas.chat import Role, Message, AssistantMessage
 from src.utils.decorators import singleton
 from src.config.settings import settings
 from src.exceptions.llm  import ConfigurationError, ClientInitializationError, GenerateCompletionError
-from typing import ClassVar, List
-from google.genai import Client, types
+from typing import TYPE_CHECKING, AsyncIterator, ClassVar, List
+
+if TYPE_CHECKING:
+    from google.genai import types
 
 @singleton
 class GoogleGemini2Flash(BaseLLM):
@@ -18,6 +20,7 @@ class GoogleGemini2Flash(BaseLLM):
         provider="Google",
         context_length=1048576,
         max_output_tokens=8192,
+        max_input_tokens=131072,    # cheap long context, batched summaries get whole pages
     )
 
     def __init__(self):
@@ -30,36 +33,48 @@ class GoogleGemini2Flash(BaseLLM):
             if not self.model:
                 raise ConfigurationError("GOOGLE_GEMINI2_FLASH_MODEL environment variable is not set")
             
+            # The SDK is imported on first use so startup does not pay for it
+            from google.genai import Client, types
+
             try:
                 self.client = Client(
                     api_key=settings.GOOGLE_GEMINI2_FLASH_API_KEY,
+                    http_options=types.HttpOptions(
+                        timeout=int(settings.LLM_TIMEOUT * 1000),     # milliseconds
+                    ),
                 )
             except Exception as e:
                 raise ClientInitializationError(f"Failed to initialize Google Gemini client: {str(e)}")
                 
             self._initialized = True
 
-    async def get_completion(self, system_instruction: str, messages: List[Message]) -> AssistantMessage:
+    def _format_messages(self, messages: List[Message]) -> List["types.Content"]:
+        """Format messages as Gemini chat history"""
+        from google.genai import types
+
+        return [
+            types.Content(
+                role=("user" if message.role == Role.USER else "model"),
+                parts=[
+                    types.Part(
+                        text=message.content
+                    )
+                ]
+            ) for message in messages
+        ]
+
+    async def get_completion(self, system_instruction: str, messages: List[Message], json_mode: bool = False) -> AssistantMessage:
         """Get completion from Google Gemini 2.0 Flash model"""
-        try:
-            # format messages for Gemini
-            chat_history = [
-                types.Content(
-                    role=("user" if message.role == Role.USER else "model"),
-                    parts=[
-                        types.Part(
-                            text=message.content
-                        )
-                    ]
-                ) for message in messages
-            ]
+        from google.genai import types
 
-            response = self.client.models.generate_content(
+        try:
+            response = await self.client.aio.models.generate_content(
                 model=self.model,
                 config=types.GenerateContentConfig(
-                    system_instruction=system_instruction
+                    system_instruction=system_instruction,
+                    response_mime_type="application/json" if json_mode else None,
                 ),
-                contents=chat_history
+                contents=self._format_messages(messages)
             )
 
             return AssistantMessage(
@@ -67,4 +82,23 @@ class GoogleGemini2Flash(BaseLLM):
                 content=response.text
             )
         except Exception as e:
-            raise GenerateCompletionError(f"Failed to get completion: {str(e)}")
+            raise GenerateCompletionError(f"Failed to get completion: {str(e)}") from e
+
+    async def stream_completion(self, system_instruction: str, messages: List[Message]) -> AsyncIterator[str]:
+        """Stream completion deltas from Google Gemini 2.0 Flash model"""
+        from google.genai import types
+
+        try:
+            stream = await self.client.aio.models.generate_content_stream(
+                model=self.model,
+                config=types.GenerateContentConfig(
+                    system_instruction=system_instruction
+                ),
+                contents=self._format_messages(messages)
+            )
+
+            async for chunk in stream:
+                if chunk.text:
+                    yield chunk.text
+        except Exception as e:
+            raise GenerateCompletionError(f"Failed to stream completion: {str(e)}") from e
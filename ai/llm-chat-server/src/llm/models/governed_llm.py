@@ -0,0 +1,46 @@
+from typing import AsyncIterator, List
+from src.llm.models.base_llm import BaseLLM
+from src.llm.token_budget import get_token_counter
+from src.schemas.chat import AssistantMessage, Message
+from src.schemas.llm import ModelInfo
+from src.utils.rate_limit import ProviderGovernor
+
+class GovernedLLM(BaseLLM):
+    """
+    Rate limiting wrapper usable around any LLM.
+
+    Every call waits for its provider's governor: one request plus the prompt's tokens up
+    front, the generated tokens are charged once known. Streams hold their concurrency
+    slot until the last delta.
+    """
+
+    def __init__(self, llm: BaseLLM, governor: ProviderGovernor):
+        super().__init__()
+        self._llm = llm
+        self._governor = governor
+        self._counter = get_token_counter(llm.MODEL_INFO.provider)
+
+    @property
+    def MODEL_INFO(self) -> ModelInfo:
+        return self._llm.MODEL_INFO
+
+    def _prompt_tokens(self, system_instruction: str, messages: List[Message]) -> int:
+        return self._counter.count(system_instruction) + self._counter.count_messages(messages)
+
+    async def get_completion(self, system_instruction: str, messages: List[Message], json_mode: bool = False) -> AssistantMessage:
+        """Get completion from the wrapped LLM once the provider admits the call"""
+        async with self._governor.acquire(tokens=self._prompt_tokens(system_instruction, messages)):
+            response = await self._llm.get_completion(system_instruction, messages, json_mode=json_mode)
+        self._governor.consume_tokens(self._counter.count(response.content or ""))
+        return response
+
+    async def stream_completion(self, system_instruction: str, messages: List[Message]) -> AsyncIterator[str]:
+        """Stream completion deltas from the wrapped LLM once the provider admits the call"""
+        async with self._governor.acquire(tokens=self._prompt_tokens(system_instruction, messages)):
+            output: List[str] = []
+            try:
+                async for delta in self._llm.stream_completion(system_instruction=system_instruction, messages=messages):
+                    output.append(delta)
+                    yield delta
+            finally:
+                self._governor.consume_tokens(self._counter.count("".join(output)))
@@ -4,8 +4,8 @@ from src.schemas.chat import Role, Message, AssistantMessage
 from src.utils.decorators import singleton
 from src.config.settings import settings
 from src.exceptions.llm  import ConfigurationError, ClientInitializationError, GenerateCompletionError
-from typing import ClassVar, List
-import openai
+from typing import AsyncIterator, ClassVar, Dict, List
+from src.llm.http_client import get_llm_http_client
 
 @singleton
 class OpenAIGPT4oMini(BaseLLM):
@@ -33,28 +33,43 @@ class OpenAIGPT4oMini(BaseLLM):
             if not self.model:
                 raise ConfigurationError("OPENAI_MODEL environment variable is not set")
             
+            # The SDK is imported on first use so startup does not pay for it
+            from openai import AsyncOpenAI
+
             try:
-                self.client = openai.Client(api_key=self.api_key)
+                self.client = AsyncOpenAI(
+                    api_key=self.api_key,
+                    base_url=settings.OPENAI_BASE_URL or None,
+                    timeout=settings.LLM_TIMEOUT,
+                    max_retries=0,                      # retried by ResilientLLM
+                    http_client=get_llm_http_client(),
+                )
             except Exception as e:
                 raise ClientInitializationError(f"Failed to initialize OpenAI client: {str(e)}")
             
             self._initialized = True
 
-    async def get_completion(self, system_instruction: str, messages: List[Message]) -> AssistantMessage:
+    def _format_messages(self, system_instruction: str, messages: List[Message]) -> List[Dict[str, str]]:
+        """Format messages for the chat completions API"""
+        formatted_messages = [
+            {"role": Role.SYSTEM, "content": system_instruction}   # Add system message first
+        ]
+        # Extend the list directly instead of using unpacking
+        formatted_messages.extend(
+            message.model_dump(include={"role", "content"})
+            for message in messages
+        )
+        return formatted_messages
+
+    async def get_completion(self, system_instruction: str, messages: List[Message], json_mode: bool = False) -> AssistantMessage:
         """Get completion from OpenAI GPT-4o-mini model"""
-        try:
-            formatted_messages = [
-                {"role": Role.SYSTEM, "content": system_instruction}   # Add system message first
-            ]
-            # Extend the list directly instead of using unpacking
-            formatted_messages.extend(
-                message.model_dump(include={"role", "content"})
-                for message in messages
-            )
+        from openai import NOT_GIVEN
 
-            response = self.client.chat.completions.create(
+        try:
+            response = await self.client.chat.completions.create(
                 model=self.model,
-                messages=formatted_messages,
+                messages=self._format_messages(system_instruction, messages),
+                response_format={"type": "json_object"} if json_mode else NOT_GIVEN,
             )
 
             return AssistantMessage(
@@ -62,4 +77,20 @@ class OpenAIGPT4oMini(BaseLLM):
                 content=response.choices[0].message.content
             )
         except Exception as e:
-            raise GenerateCompletionError(f"Failed to get completion: {str(e)}")
+            raise GenerateCompletionError(f"Failed to get completion: {str(e)}") from e
+
+    async def stream_completion(self, system_instruction: str, messages: List[Message]) -> AsyncIterator[str]:
+        """Stream completion deltas from OpenAI GPT-4o-mini model"""
+        try:
+            stream = await self.client.chat.completions.create(
+                model=self.model,
+                messages=self._format_messages(system_instruction, messages),
+                stream=True,
+            )
+
+            async for chunk in stream:
+                # Skip chunks without text, e.g. the final chunk carrying finish_reason
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except Exception as e:
+            raise GenerateCompletionError(f"Failed to stream completion: {str(e)}") from e
@@ -0,0 +1,54 @@
+from typing import AsyncIterator, List
+from src.llm.models.base_llm import BaseLLM
+from src.schemas.chat import AssistantMessage, Message
+from src.schemas.llm import ModelInfo
+from src.utils.resilience import RetryPolicy
+
+class ResilientLLM(BaseLLM):
+    """
+    Retry and circuit breaking wrapper usable around any LLM.
+
+    Completions have no side effects, so transient failures are retried with backoff. A
+    stream is only retried until its first delta; once text reached the client a failure
+    is raised as is.
+    """
+
+    def __init__(self, llm: BaseLLM, policy: RetryPolicy):
+        super().__init__()
+        self._llm = llm
+        self._policy = policy
+
+    @property
+    def MODEL_INFO(self) -> ModelInfo:
+        return self._llm.MODEL_INFO
+
+    async def get_completion(self, system_instruction: str, messages: List[Message], json_mode: bool = False) -> AssistantMessage:
+        """Get completion from the wrapped LLM, retrying transient failures"""
+        return await self._policy.run(
+            lambda: self._llm.get_completion(system_instruction, messages, json_mode=json_mode)
+        )
+
+    async def stream_completion(self, system_instruction: str, messages: List[Message]) -> AsyncIterator[str]:
+        """Stream completion deltas from the wrapped LLM, retrying transient failures before the first delta"""
+        async def open_stream():
+            stream = self._llm.stream_completion(system_instruction=system_instruction, messages=messages)
+            try:
+                return stream, await stream.__anext__()
+            except StopAsyncIteration:
+                return stream, None
+            except BaseException:
+                await stream.aclose()
+                raise
+
+        stream, first = await self._policy.run(open_stream)
+        if first is None:
+            return
+        try:
+            yield first
+            async for delta in stream:
+                yield delta
+        except Exception as e:
+            self._policy.record(e)
+            raise
+        finally:
+            await stream.aclose()
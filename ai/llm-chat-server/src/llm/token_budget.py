@@ -0,0 +1,102 @@
+import logging
+import math
+from functools import lru_cache
+from typing import Any, List, Optional
+from src.config.settings import settings
+from src.schemas.chat import Message
+from src.schemas.llm import ContextBudget, ModelInfo
+
+APPROX_CHARS_PER_TOKEN = 4      # estimate for providers without a local tokenizer
+MESSAGE_OVERHEAD_TOKENS = 4     # role and separators added to every chat message
+
+# tiktoken encodings of the provider families that can be counted locally.
+# Gemini only exposes token counting as a remote API call, so it is estimated.
+PROVIDER_ENCODINGS = {
+    "OpenAI": "o200k_base",
+    "Azure": "o200k_base",
+}
+
+logger = logging.getLogger(__name__)
+
+@lru_cache(maxsize=None)
+def _load_encoding(name: str) -> Optional[Any]:
+    """Load a tiktoken encoding once, None when tiktoken or its data is unavailable"""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(name)
+    except Exception as e:
+        logger.warning(f"Tokenizer '{name}' unavailable, estimating token counts: {str(e)}")
+        return None
+
+class TokenCounter:
+    """Counts and trims text in the tokens of one provider family"""
+
+    def __init__(self, encoding_name: Optional[str] = None):
+        self._encoding = _load_encoding(encoding_name) if encoding_name else None
+
+    @property
+    def exact(self) -> bool:
+        """Whether counts come from the provider's tokenizer rather than an estimate"""
+        return self._encoding is not None
+
+    def count(self, text: str) -> int:
+        """Count the tokens in a text"""
+        if self._encoding is None:
+            return math.ceil(len(text) / APPROX_CHARS_PER_TOKEN)
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+    def count_messages(self, messages: List[Message]) -> int:
+        """Count the tokens of chat messages including their per-message overhead"""
+        return sum(self.count(message.content) + MESSAGE_OVERHEAD_TOKENS for message in messages)
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Trim a text to at most `max_tokens` tokens"""
+        if max_tokens <= 0:
+            return ""
+        if self._encoding is None:
+            max_chars = max_tokens * APPROX_CHARS_PER_TOKEN
+            return text if len(text) <= max_chars else text[:max_chars]
+        # Every token spans at least one character, so short texts never need encoding
+        if len(text) <= max_tokens:
+            return text
+        tokens = self._encoding.encode(text, disallowed_special=())
+        if len(tokens) <= max_tokens:
+            return text
+        return self._encoding.decode(tokens[:max_tokens])
+
+@lru_cache(maxsize=None)
+def get_token_counter(provider: str) -> TokenCounter:
+    """Get the (cached) token counter for a provider family"""
+    return TokenCounter(PROVIDER_ENCODINGS.get(provider))
+
+def plan_context_budget(model_info: ModelInfo, prompt_tokens: int, with_search: bool = True, capped: bool = True) -> ContextBudget:
+    """
+    Split a model's context window between the answer, the chat history and the search context.
+
+    The input side is capped at the model's `max_input_tokens` (CONTEXT_MAX_INPUT_TOKENS unless
+    the model sets its own) so large-context models are not sent more paid tokens than the
+    answer needs.
+
+    Args:
+        model_info: Information about the model the prompt is sent to
+        prompt_tokens: Tokens of the fixed part of the prompt (system prompt and current message)
+        with_search: Whether search context is included; otherwise the history gets all the room
+        capped: Whether the input cap applies; prompts that pack several inputs (batched
+            summaries) are only limited by the context window, like one call per input would be
+
+    Returns:
+        ContextBudget: Token budget for each part of the prompt
+    """
+    output = min(settings.CONTEXT_OUTPUT_TOKENS, model_info.max_output_tokens)
+    max_input = model_info.context_length - output
+    if capped:
+        max_input = min(max_input, model_info.max_input_tokens or settings.CONTEXT_MAX_INPUT_TOKENS)
+    available = max(max_input - prompt_tokens, 0)
+    search_context = int(available * settings.CONTEXT_SEARCH_SHARE) if with_search else 0
+    return ContextBudget(
+        output=output,
+        prompt=prompt_tokens,
+        available=available,
+        history=available - search_context,
+        search_context=search_context,
+    )
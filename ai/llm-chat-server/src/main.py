@@ -1,6 +1,12 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from src.routers.v1 import chat, models
 from src.config.settings import settings
+from src.utils.http import HTTPClient
+from src.llm.http_client import close_llm_http_client
+from src.repositories.chat import close_chat_repository
+from src.utils.metrics import MetricsRegistry
+from src.utils.resilience import breaker_states
 import logging
 
 # Configure logging
@@ -15,10 +21,20 @@ logging.basicConfig(
 # Set debug level for our chat module
 logging.getLogger('src.routers.v1.chat').setLevel(logging.DEBUG)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Manage resources shared for the whole app lifetime"""
+    yield
+    # Release pooled connections on shutdown
+    await HTTPClient().aclose()
+    await close_llm_http_client()
+    await close_chat_repository()
+
 app = FastAPI(
     title="LLM Chat Server",
     description="A server for chat with LLMs",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 @app.get("/health")
@@ -30,9 +46,16 @@ def get_status():
             "openai_gpt4o_mini_configured": bool(settings.OPENAI_API_KEY),
             "azure_gpt4o_mini_configured": bool(settings.AZURE_GPT4O_MINI_API_KEY),
             "google_gemini2_flash_configured": bool(settings.GOOGLE_GEMINI2_FLASH_MODEL)
-        }
+        },
+        # "closed", "open" or "half_open" for every provider used since startup
+        "circuit_breakers": breaker_states(),
     }
 
+@app.get("/metrics")
+def get_metrics():
+    """In-process counters and gauges (cache hit rates, etc.)"""
+    return MetricsRegistry().snapshot()
+
 # Register api routes
 app.include_router(chat.router, prefix="/api")
 app.include_router(models.router, prefix="/api")
@@ -1,4 +1,22 @@
 GENERAL_CHAT_PROMPT = """
 You are a helpful assistant. Your task is to assist the user with their questions and provide information as needed. Please respond in a friendly and informative manner.
 If the user asks for information that is not available in your training data, you should inform them that you do not have access to real-time information and suggest they check a reliable source.
-"""
\ No newline at end of file
+"""
+CHAT_HISTORY_SUMMARY = """
+Summary of the earlier part of this conversation (older messages are not shown):
+{summary}
+"""
+
+SUMMARIZE_CHAT_HISTORY = """
+You maintain a running summary of a conversation between a user and an assistant.
+
+You receive the current summary (possibly empty) followed by the next messages of the conversation.
+Return an updated summary that merges the new messages into the current one.
+
+Rules:
+1. Keep facts, decisions, user preferences, names, numbers and open questions needed to continue the conversation
+2. Drop greetings, filler and details that were superseded later
+3. Write in the third person ("The user asked...", "The assistant explained...")
+4. Keep the summary under {character_limit} characters
+5. Return ONLY the summary text, without headings or commentary
+"""
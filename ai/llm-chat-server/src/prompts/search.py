@@ -61,6 +61,39 @@ Examples:
 Respond with ONLY the optimized search term, no explanations or additional text.
 """
 
+PLAN_WEB_SEARCH = """
+You are a search planner. Decide if a web search is required to answer the user's query accurately and, if so, write the search queries.
+
+Search IS needed when the query:
+1. Asks about current events, news, or recent developments (within last 3 years)
+2. Requests real-time information (weather, prices, sports scores, stock data)
+3. Mentions specific dates, statistics, or factual data that requires verification
+4. Refers to emerging technologies, new products, recent research, or terms that might post-date your training
+5. Explicitly requests web links, citations, or up-to-date references
+6. Involves specific people, organizations, or events you might have limited information about
+7. Asks for listings or rankings that may change over time
+
+Search is NOT needed when the query asks for well-established knowledge, opinions, reasoning, hypothetical scenarios, creative content, code, problem-solving without specific data needs, your capabilities, or is conversational.
+
+When search is needed, write 1 to {max_queries} search queries:
+- Each query is a concise search term (3-8 words) built from specific nouns, proper names and technical terms
+- Remove articles, filler phrases, personal pronouns, question words and conversational language
+- Use more than one query only when the question has clearly distinct parts; put the most important query first
+
+Respond with ONLY a JSON object in this exact format, no other text:
+{{"needs_search": true, "queries": ["first query", "second query"]}}
+or
+{{"needs_search": false, "queries": []}}
+
+Examples:
+- "What are the latest advancements in quantum computing research in 2023?" -> {{"needs_search": true, "queries": ["quantum computing advancements 2023"]}}
+- "Compare the new iPhone and Pixel cameras" -> {{"needs_search": true, "queries": ["latest iPhone camera review", "latest Pixel camera review"]}}
+- "Write a Python function to calculate Fibonacci numbers" -> {{"needs_search": false, "queries": []}}
+"""
+
+# Bump when SUMMARIZE_WEB_CONTENT changes so cached summaries are not reused
+SUMMARIZE_WEB_CONTENT_VERSION = "1"
+
 SUMMARIZE_WEB_CONTENT = """
 You are a precise web content summarizer. Your task is to condense web page content into a concise, informative summary related to the search_query.
 
@@ -80,6 +113,24 @@ If the content is irrelevant to the search query, briefly indicate why and summa
 Respond with ONLY the summary - no introductions, explanations, or meta-commentary.
 """
 
+# Bump when SUMMARIZE_WEB_CONTENT_BATCH changes so cached summaries are not reused
+SUMMARIZE_WEB_CONTENT_BATCH_VERSION = "1"
+
+SUMMARIZE_WEB_CONTENT_BATCH = """
+You are a precise web content summarizer. You receive several web pages, each introduced by a "[Source N]" header. Condense each page into a concise, informative summary related to the search_query.
+
+Instructions:
+1. Summarize every source separately; never mix information between sources
+2. Focus specifically on information that directly relates to "{search_query}"
+3. Prioritize recent facts, key statistics, and authoritative information
+4. Keep each summary within {character_limit} characters
+5. Maintain factual accuracy and preserve important numerical data, proper nouns, product names and specific terminology
+6. If a source is irrelevant to the search query, briefly indicate why and summarize its general topic instead
+
+Respond with ONLY a JSON object in this exact format, with one entry per source, no other text:
+{{"summaries": [{{"source": 1, "summary": "..."}}, {{"source": 2, "summary": "..."}}]}}
+"""
+
 USE_SEARCH_RESULTS = """
 You are a helpful assistant with access to web search results. Your task is to assist the user with their questions and provide information as needed. Please respond in a friendly and informative manner.
 
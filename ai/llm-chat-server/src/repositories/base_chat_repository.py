@@ -0,0 +1,69 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional, Tuple
+from src.schemas.chat import Chat, ChatSummary, Message
+from ulid import ULID
+
+# Keyset position in the chat listing: (updated_at, chat_id) of the last chat on the previous page
+ChatKey = Tuple[str, str]
+
+class BaseChatRepository(ABC):
+    """
+    Base class for chat storage backends.
+
+    Returned chats are copies: mutating them does not change the stored chat, use the
+    update methods instead.
+    """
+
+    @abstractmethod
+    async def create(self, chat: Chat) -> Chat:
+        """Create a new chat"""
+        pass
+
+    @abstractmethod
+    async def chat_exists(self, chat_id: ULID) -> bool:
+        """Check if a chat exists"""
+        pass
+
+    @abstractmethod
+    async def get(self, chat_id: ULID) -> Optional[Chat]:
+        """Get a chat by ID"""
+        pass
+
+    @abstractmethod
+    async def list(self) -> List[Chat]:
+        """List all chats"""
+        pass
+
+    @abstractmethod
+    async def list_summaries(self, limit: int, after: Optional[ChatKey] = None) -> List[ChatSummary]:
+        """List chat summaries, most recently updated first, starting after the given position"""
+        pass
+
+    @abstractmethod
+    async def list_messages(self, chat_id: ULID, limit: int, offset: int = 0) -> Optional[List[Message]]:
+        """List a chat's messages oldest first starting at `offset`, None if the chat does not exist"""
+        pass
+
+    @abstractmethod
+    async def append_messages(self, chat_id: ULID, messages: List[Message]) -> None:
+        """Append messages to the end of a chat"""
+        pass
+
+    @abstractmethod
+    async def update_messages(self, chat_id: ULID, messages: List[Message]) -> Chat:
+        """Replace all messages of a chat"""
+        pass
+
+    @abstractmethod
+    async def update_summary(self, chat_id: ULID, summary: str, summarized_until: int) -> None:
+        """Update the rolling summary of a chat's older messages"""
+        pass
+
+    @abstractmethod
+    async def delete(self, chat_id: ULID) -> None:
+        """Delete a chat"""
+        pass
+
+    async def aclose(self) -> None:
+        """Release the backend's resources"""
+        pass
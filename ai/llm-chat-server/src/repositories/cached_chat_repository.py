@@ -0,0 +1,102 @@
+import logging
+from datetime import datetime
+from typing import List, Optional
+from src.cache.memory import TTLCache
+from src.config.settings import settings
+from src.repositories.base_chat_repository import BaseChatRepository, ChatKey
+from src.schemas.chat import Chat, ChatSummary, Message
+from src.utils.metrics import MetricsRegistry
+from ulid import ULID
+
+class CachedChatRepository(BaseChatRepository):
+    """
+    Write-through LRU cache of hot chats in front of a durable repository.
+
+    An active conversation is read on every turn; keeping it in memory avoids reloading its
+    whole history from the backend, while writes still go to the backend first.
+    """
+
+    def __init__(self, repository: BaseChatRepository):
+        self.logger = logging.getLogger(__name__)
+        self._repository = repository
+        self._metrics = MetricsRegistry()
+        self._cache: TTLCache[Chat] = TTLCache(
+            max_entries=settings.CHAT_CACHE_MAX_ENTRIES,
+            ttl=settings.CHAT_CACHE_TTL,
+        )
+
+    @staticmethod
+    def _copy(chat: Chat) -> Chat:
+        return chat.model_copy(update={"messages": list(chat.messages)})
+
+    async def create(self, chat: Chat) -> Chat:
+        """Create a new chat"""
+        chat = await self._repository.create(chat)
+        self._cache.set(chat.chat_id, self._copy(chat))
+        return chat
+
+    async def chat_exists(self, chat_id: ULID) -> bool:
+        """Check if a chat exists"""
+        if self._cache.get(chat_id) is not None:
+            return True
+        return await self._repository.chat_exists(chat_id)
+
+    async def get(self, chat_id: ULID) -> Optional[Chat]:
+        """Get a chat by ID"""
+        chat = self._cache.get(chat_id)
+        if chat is not None:
+            self._metrics.incr("chat_cache.hits")
+            return self._copy(chat)
+
+        self._metrics.incr("chat_cache.misses")
+        chat = await self._repository.get(chat_id)
+        if chat is not None:
+            self._cache.set(chat_id, self._copy(chat))
+        return chat
+
+    async def list(self) -> List[Chat]:
+        """List all chats"""
+        return await self._repository.list()
+
+    async def list_summaries(self, limit: int, after: Optional[ChatKey] = None) -> List[ChatSummary]:
+        """List chat summaries, most recently updated first, starting after the given position"""
+        return await self._repository.list_summaries(limit, after)
+
+    async def list_messages(self, chat_id: ULID, limit: int, offset: int = 0) -> Optional[List[Message]]:
+        """List a chat's messages oldest first starting at `offset`, None if the chat does not exist"""
+        chat = self._cache.get(chat_id)
+        if chat is not None:
+            return chat.messages[offset:offset + limit]
+        return await self._repository.list_messages(chat_id, limit, offset)
+
+    async def append_messages(self, chat_id: ULID, messages: List[Message]) -> None:
+        """Append messages to the end of a chat"""
+        await self._repository.append_messages(chat_id, messages)
+        chat = self._cache.get(chat_id)
+        if chat is not None:
+            chat.messages.extend(messages)
+            chat.updated_at = datetime.now().isoformat()
+
+    async def update_messages(self, chat_id: ULID, messages: List[Message]) -> Chat:
+        """Replace all messages of a chat"""
+        chat = await self._repository.update_messages(chat_id, messages)
+        self._cache.set(chat_id, self._copy(chat))
+        return chat
+
+    async def update_summary(self, chat_id: ULID, summary: str, summarized_until: int) -> None:
+        """Update the rolling summary of a chat's older messages"""
+        await self._repository.update_summary(chat_id, summary, summarized_until)
+        chat = self._cache.get(chat_id)
+        if chat is not None:
+            chat.summary = summary
+            chat.summarized_until = summarized_until
+
+    async def delete(self, chat_id: ULID) -> None:
+        """Delete a chat"""
+        self._cache.delete(chat_id)
+        await self._repository.delete(chat_id)
+
+    async def aclose(self) -> None:
+        """Release the backend's resources"""
+        self._cache.clear()
+        await self._repository.aclose()
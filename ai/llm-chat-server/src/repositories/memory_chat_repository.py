@@ -0,0 +1,96 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+from src.exceptions.chat import DuplicateMessageError
+from src.repositories.base_chat_repository import BaseChatRepository, ChatKey
+from src.schemas.chat import Chat, ChatSummary, Message
+from ulid import ULID
+
+class InMemoryChatRepository(BaseChatRepository):
+    """Repository for managing chat objects in memory, lost on restart"""
+
+    def __init__(self):
+        self._chats: Dict[ULID, Chat] = {}
+
+    @staticmethod
+    def _copy(chat: Chat) -> Chat:
+        # Copying the list is enough: messages are never mutated once stored
+        return chat.model_copy(update={"messages": list(chat.messages)})
+
+    async def create(self, chat: Chat) -> Chat:
+        """Create a new chat"""
+        chat.updated_at = datetime.now().isoformat()
+        self._chats[chat.chat_id] = self._copy(chat)
+        return chat
+
+    async def chat_exists(self, chat_id: ULID) -> bool:
+        """Check if a chat exists"""
+        return chat_id in self._chats
+
+    async def get(self, chat_id: ULID) -> Optional[Chat]:
+        """Get a chat by ID"""
+        chat = self._chats.get(chat_id)
+        return self._copy(chat) if chat is not None else None
+
+    async def list(self) -> List[Chat]:
+        """List all chats"""
+        return [self._copy(chat) for chat in self._chats.values()]
+
+    async def list_summaries(self, limit: int, after: Optional[ChatKey] = None) -> List[ChatSummary]:
+        """List chat summaries, most recently updated first, starting after the given position"""
+        chats = sorted(self._chats.values(), key=lambda chat: (chat.updated_at, str(chat.chat_id)), reverse=True)
+        if after is not None:
+            chats = [chat for chat in chats if (chat.updated_at, str(chat.chat_id)) < after]
+        return [
+            ChatSummary(
+                chat_id=chat.chat_id,
+                title=chat.title,
+                message_count=len(chat.messages),
+                created_at=chat.created_at,
+                updated_at=chat.updated_at,
+            )
+            for chat in chats[:limit]
+        ]
+
+    async def list_messages(self, chat_id: ULID, limit: int, offset: int = 0) -> Optional[List[Message]]:
+        """List a chat's messages oldest first starting at `offset`, None if the chat does not exist"""
+        chat = self._chats.get(chat_id)
+        if chat is None:
+            return None
+        return chat.messages[offset:offset + limit]
+
+    async def append_messages(self, chat_id: ULID, messages: List[Message]) -> None:
+        """Append messages to the end of a chat"""
+        if chat_id not in self._chats:
+            raise KeyError(f"Chat with ID {chat_id} not found")
+
+        chat = self._chats[chat_id]
+        # Same contract as the unique (chat_id, message_id) index of the SQLite store
+        stored_ids = {message.message_id for message in chat.messages}
+        if any(message.message_id in stored_ids for message in messages):
+            raise DuplicateMessageError(f"Message ID already exists in chat {chat_id}")
+        chat.messages.extend(messages)
+        chat.updated_at = datetime.now().isoformat()
+
+    async def update_messages(self, chat_id: ULID, messages: List[Message]) -> Chat:
+        """Replace all messages of a chat"""
+        if chat_id not in self._chats:
+            raise KeyError(f"Chat with ID {chat_id} not found")
+
+        chat = self._chats[chat_id]
+        chat.messages = list(messages)
+        chat.updated_at = datetime.now().isoformat()
+        return self._copy(chat)
+
+    async def update_summary(self, chat_id: ULID, summary: str, summarized_until: int) -> None:
+        """Update the rolling summary of a chat's older messages"""
+        if chat_id not in self._chats:
+            raise KeyError(f"Chat with ID {chat_id} not found")
+
+        chat = self._chats[chat_id]
+        chat.summary = summary
+        chat.summarized_until = summarized_until
+
+    async def delete(self, chat_id: ULID) -> None:
+        """Delete a chat"""
+        if chat_id in self._chats:
+            del self._chats[chat_id]
@@ -0,0 +1,271 @@
+import asyncio
+import logging
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, List, Optional, TypeVar
+from src.exceptions.chat import DuplicateMessageError
+from src.repositories.base_chat_repository import BaseChatRepository, ChatKey
+from src.schemas.chat import Chat, ChatSummary, Message, Role
+from ulid import ULID
+
+T = TypeVar('T')
+
+# Each entry upgrades the schema by one version, tracked in PRAGMA user_version
+MIGRATIONS = [
+    """
+    CREATE TABLE chats (
+        chat_id TEXT PRIMARY KEY,
+        title TEXT NOT NULL,
+        summary TEXT,
+        summarized_until INTEGER NOT NULL DEFAULT 0,
+        message_count INTEGER NOT NULL DEFAULT 0,
+        created_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL
+    );
+    CREATE TABLE messages (
+        chat_id TEXT NOT NULL REFERENCES chats(chat_id) ON DELETE CASCADE,
+        seq INTEGER NOT NULL,
+        message_id TEXT NOT NULL,
+        role TEXT NOT NULL,
+        content TEXT NOT NULL,
+        PRIMARY KEY (chat_id, seq)
+    ) WITHOUT ROWID;
+    CREATE UNIQUE INDEX idx_messages_chat_message ON messages (chat_id, message_id);
+    """,
+    # Keyset pagination of the chat listing
+    """
+    CREATE INDEX idx_chats_updated ON chats (updated_at, chat_id);
+    """,
+]
+
+class SQLiteChatRepository(BaseChatRepository):
+    """
+    Durable chat storage in SQLite (WAL mode).
+
+    Chats live in a `chats` table and their messages in an append-only `messages` table,
+    so saving a turn inserts two rows instead of rewriting the whole history. All queries
+    run on one dedicated worker thread that owns the connection, keeping the event loop free.
+    """
+
+    def __init__(self, path: str):
+        self.logger = logging.getLogger(__name__)
+        self.path = path
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-chats")
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the connection on the worker thread and migrate the schema on first use"""
+        if self._conn is None:
+            if self.path != ":memory:":
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")     # durable with WAL, without an fsync per commit
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._migrate(conn)
+            self._conn = conn
+        return self._conn
+
+    def _migrate(self, conn: sqlite3.Connection) -> None:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+            self.logger.info(f"Migrating chat database {self.path} to schema version {number}")
+            conn.executescript(f"BEGIN; {migration} PRAGMA user_version = {number}; COMMIT;")
+
+    async def _run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run a blocking database function on the worker thread"""
+        def call() -> T:
+            return fn(self._connect(), *args)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+
+    @staticmethod
+    def _row_to_message(row: sqlite3.Row) -> Message:
+        message_id, role, content = row
+        return Message(message_id=ULID.from_str(message_id), role=Role(role), content=content)
+
+    @staticmethod
+    def _insert_messages(conn: sqlite3.Connection, chat_id: str, start: int, messages: List[Message]) -> None:
+        try:
+            conn.executemany(
+                "INSERT INTO messages (chat_id, seq, message_id, role, content) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (chat_id, seq, str(message.message_id), message.role.value, message.content)
+                    for seq, message in enumerate(messages, start)
+                ],
+            )
+        except sqlite3.IntegrityError as e:
+            # idx_messages_chat_message: the client reused a message_id, e.g. a retried request
+            if "message_id" not in str(e):
+                raise
+            raise DuplicateMessageError(f"Message ID already exists in chat {chat_id}") from e
+
+    async def create(self, chat: Chat) -> Chat:
+        """Create a new chat"""
+        chat.updated_at = datetime.now().isoformat()
+        return await self.import_chat(chat)
+
+    async def import_chat(self, chat: Chat) -> Chat:
+        """Insert a chat as is, keeping its timestamps (used to migrate existing chats)"""
+        def create(conn: sqlite3.Connection) -> None:
+            with conn:
+                conn.execute("BEGIN")
+                conn.execute(
+                    "INSERT INTO chats (chat_id, title, summary, summarized_until, message_count, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (str(chat.chat_id), chat.title, chat.summary, chat.summarized_until,
+                     len(chat.messages), chat.created_at, chat.updated_at),
+                )
+                self._insert_messages(conn, str(chat.chat_id), 0, chat.messages)
+
+        await self._run(create)
+        return chat
+
+    async def chat_exists(self, chat_id: ULID) -> bool:
+        """Check if a chat exists"""
+        def exists(conn: sqlite3.Connection) -> bool:
+            return conn.execute("SELECT 1 FROM chats WHERE chat_id = ?", (str(chat_id),)).fetchone() is not None
+        return await self._run(exists)
+
+    async def get(self, chat_id: ULID) -> Optional[Chat]:
+        """Get a chat by ID"""
+        def get(conn: sqlite3.Connection) -> Optional[Chat]:
+            row = conn.execute(
+                "SELECT title, summary, summarized_until, created_at, updated_at FROM chats WHERE chat_id = ?",
+                (str(chat_id),),
+            ).fetchone()
+            if row is None:
+                return None
+            title, summary, summarized_until, created_at, updated_at = row
+            messages = conn.execute(
+                "SELECT message_id, role, content FROM messages WHERE chat_id = ? ORDER BY seq",
+                (str(chat_id),),
+            ).fetchall()
+            return Chat(
+                chat_id=chat_id,
+                title=title,
+                messages=[self._row_to_message(message) for message in messages],
+                summary=summary,
+                summarized_until=summarized_until,
+                created_at=created_at,
+                updated_at=updated_at,
+            )
+        return await self._run(get)
+
+    async def list(self) -> List[Chat]:
+        """List all chats"""
+        def list_chats(conn: sqlite3.Connection) -> List[Chat]:
+            # One query for all chats and their messages, grouped by chat in listing order
+            rows = conn.execute(
+                "SELECT c.chat_id, c.title, c.summary, c.summarized_until, c.created_at, c.updated_at, "
+                "m.message_id, m.role, m.content "
+                "FROM chats c LEFT JOIN messages m ON m.chat_id = c.chat_id "
+                "ORDER BY c.updated_at DESC, c.chat_id DESC, m.seq"
+            )
+            chats: List[Chat] = []
+            for chat_id, title, summary, summarized_until, created_at, updated_at, *message in rows:
+                if not chats or str(chats[-1].chat_id) != chat_id:
+                    chats.append(Chat(
+                        chat_id=ULID.from_str(chat_id),
+                        title=title,
+                        messages=[],
+                        summary=summary,
+                        summarized_until=summarized_until,
+                        created_at=created_at,
+                        updated_at=updated_at,
+                    ))
+                if message[0] is not None:
+                    chats[-1].messages.append(self._row_to_message(message))
+            return chats
+        return await self._run(list_chats)
+
+    async def list_summaries(self, limit: int, after: Optional[ChatKey] = None) -> List[ChatSummary]:
+        """List chat summaries, most recently updated first, starting after the given position"""
+        def list_summaries(conn: sqlite3.Connection) -> List[ChatSummary]:
+            query = "SELECT chat_id, title, message_count, created_at, updated_at FROM chats"
+            params: tuple = ()
+            if after is not None:
+                query += " WHERE (updated_at, chat_id) < (?, ?)"
+                params = after
+            rows = conn.execute(query + " ORDER BY updated_at DESC, chat_id DESC LIMIT ?", (*params, limit))
+            return [
+                ChatSummary(
+                    chat_id=ULID.from_str(chat_id),
+                    title=title,
+                    message_count=message_count,
+                    created_at=created_at,
+                    updated_at=updated_at,
+                )
+                for chat_id, title, message_count, created_at, updated_at in rows
+            ]
+        return await self._run(list_summaries)
+
+    async def list_messages(self, chat_id: ULID, limit: int, offset: int = 0) -> Optional[List[Message]]:
+        """List a chat's messages oldest first starting at `offset`, None if the chat does not exist"""
+        def list_messages(conn: sqlite3.Connection) -> Optional[List[Message]]:
+            rows = conn.execute(
+                "SELECT message_id, role, content FROM messages WHERE chat_id = ? AND seq >= ? ORDER BY seq LIMIT ?",
+                (str(chat_id), offset, limit),
+            ).fetchall()
+            if not rows and conn.execute("SELECT 1 FROM chats WHERE chat_id = ?", (str(chat_id),)).fetchone() is None:
+                return None
+            return [self._row_to_message(row) for row in rows]
+        return await self._run(list_messages)
+
+    async def append_messages(self, chat_id: ULID, messages: List[Message]) -> None:
+        """Append messages to the end of a chat"""
+        def append(conn: sqlite3.Connection) -> None:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")     # take the write lock before reading message_count
+                row = conn.execute("SELECT message_count FROM chats WHERE chat_id = ?", (str(chat_id),)).fetchone()
+                if row is None:
+                    raise KeyError(f"Chat with ID {chat_id} not found")
+                self._insert_messages(conn, str(chat_id), row[0], messages)
+                conn.execute(
+                    "UPDATE chats SET message_count = message_count + ?, updated_at = ? WHERE chat_id = ?",
+                    (len(messages), datetime.now().isoformat(), str(chat_id)),
+                )
+        await self._run(append)
+
+    async def update_messages(self, chat_id: ULID, messages: List[Message]) -> Chat:
+        """Replace all messages of a chat"""
+        def replace(conn: sqlite3.Connection) -> None:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                updated = conn.execute(
+                    "UPDATE chats SET message_count = ?, updated_at = ? WHERE chat_id = ?",
+                    (len(messages), datetime.now().isoformat(), str(chat_id)),
+                ).rowcount
+                if not updated:
+                    raise KeyError(f"Chat with ID {chat_id} not found")
+                conn.execute("DELETE FROM messages WHERE chat_id = ?", (str(chat_id),))
+                self._insert_messages(conn, str(chat_id), 0, messages)
+        await self._run(replace)
+        return await self.get(chat_id)
+
+    async def update_summary(self, chat_id: ULID, summary: str, summarized_until: int) -> None:
+        """Update the rolling summary of a chat's older messages"""
+        def update(conn: sqlite3.Connection) -> None:
+            updated = conn.execute(
+                "UPDATE chats SET summary = ?, summarized_until = ? WHERE chat_id = ?",
+                (summary, summarized_until, str(chat_id)),
+            ).rowcount
+            if not updated:
+                raise KeyError(f"Chat with ID {chat_id} not found")
+        await self._run(update)
+
+    async def delete(self, chat_id: ULID) -> None:
+        """Delete a chat and its messages"""
+        def delete(conn: sqlite3.Connection) -> None:
+            conn.execute("DELETE FROM chats WHERE chat_id = ?", (str(chat_id),))
+        await self._run(delete)
+
+    async def aclose(self) -> None:
+        """Close the connection and stop the worker thread"""
+        def close() -> None:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+        await asyncio.get_running_loop().run_in_executor(self._executor, close)
+        self._executor.shutdown(wait=False)
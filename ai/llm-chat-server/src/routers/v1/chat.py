@@ -1,9 +1,12 @@
-from fastapi import APIRouter, status, HTTPException, Path
-from typing import List
+from fastapi import APIRouter, status, HTTPException, Path, Query
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, Optional
 import logging
 from src.services.chat import ChatService
-from src.schemas.chat import Chat, ChatRequest, ChatResponse
-from src.exceptions.chat import ChatNotFoundError
+from src.schemas.chat import Chat, ChatPage, ChatRequest, ChatResponse, ChatStreamEvent, ChatStreamEventType, MessagePage
+from src.exceptions.chat import ChatNotFoundError, DuplicateMessageError, InvalidCursorError
+from src.exceptions.rate_limit import RateLimitExceededError
+from src.exceptions.resilience import CircuitOpenError
 from ulid import ULID
 import time
 
@@ -24,10 +27,46 @@ async def create_chat(chat_request: ChatRequest) -> ChatResponse:
         response = await chat_service.generate_chat_completion(chat_request)
         logger.info(f"Chat completion processed in {(time.time() - start_time) * 1000:.2f}ms")
         return response
+    except (RateLimitExceededError, CircuitOpenError) as e:
+        # Over the provider's quota even after queueing, or the provider is down: tell the client when to come back
+        logger.warning(f"Chat request rejected: {str(e)}")
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(max(int(e.retry_after), 1))})
+    except DuplicateMessageError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         logger.error(f"Failed to process chat request: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/stream", status_code=status.HTTP_200_OK)
+async def stream_chat(chat_request: ChatRequest) -> StreamingResponse:
+    """Create a chat from a user message, streaming the answer as server-sent events"""
+    logger.debug(f"Received streaming chat request for chat_id={chat_request.chat_id}")
+
+    async def event_stream() -> AsyncIterator[str]:
+        start_time = time.time()
+        first_token_logged = False
+        try:
+            async for event in chat_service.stream_chat_completion(chat_request):
+                if event.event == ChatStreamEventType.DELTA and not first_token_logged:
+                    logger.info(f"Time to first token: {(time.time() - start_time) * 1000:.2f}ms")
+                    first_token_logged = True
+                yield event.to_sse()
+            logger.info(f"Streaming chat completion processed in {(time.time() - start_time) * 1000:.2f}ms")
+        except Exception as e:
+            # Headers are already sent, so report the failure as an event instead of a 500
+            logger.error(f"Failed to process streaming chat request: {str(e)}")
+            yield ChatStreamEvent(
+                event=ChatStreamEventType.ERROR,
+                chat_id=chat_request.chat_id,
+                detail=str(e)
+            ).to_sse()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @router.get("/{chat_id}", response_model=Chat)
 async def get_chat(chat_id: ULID = Path(description="The chat ID to get")) -> Chat:
     logger.debug(f"Fetching chat with ID: {chat_id}")
@@ -36,10 +75,32 @@ async def get_chat(chat_id: ULID = Path(description="The chat ID to get")) -> Ch
     except ChatNotFoundError:
         raise HTTPException(status_code=404, detail=f"Chat {chat_id} not found")
 
-@router.get("", response_model=List[Chat])
-async def list_chats() -> List[Chat]:
-    logger.debug("Fetching all chats")
-    return await chat_service.list_chats()
+@router.get("/{chat_id}/messages", response_model=MessagePage)
+async def list_messages(
+    chat_id: ULID = Path(description="The chat ID to get messages for"),
+    limit: int = Query(default=50, ge=1, le=500, description="Maximum number of messages to return"),
+    cursor: Optional[str] = Query(default=None, description="next_cursor from the previous page"),
+) -> MessagePage:
+    """List a chat's messages, oldest first"""
+    logger.debug(f"Fetching messages of chat {chat_id} (limit={limit})")
+    try:
+        return await chat_service.list_messages(chat_id, limit=limit, cursor=cursor)
+    except ChatNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Chat {chat_id} not found")
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("", response_model=ChatPage)
+async def list_chats(
+    limit: int = Query(default=20, ge=1, le=100, description="Maximum number of chats to return"),
+    cursor: Optional[str] = Query(default=None, description="next_cursor from the previous page"),
+) -> ChatPage:
+    """List chat summaries (without messages), most recently updated first"""
+    logger.debug(f"Fetching chats (limit={limit})")
+    try:
+        return await chat_service.list_chats(limit=limit, cursor=cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.delete("/{chat_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_chat(chat_id: ULID = Path(description="The chat ID to delete")) -> None:
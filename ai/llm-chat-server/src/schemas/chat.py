@@ -1,7 +1,7 @@
 from datetime import datetime
 from pydantic import BaseModel, Field, model_validator
 from typing import Literal, Optional, List
-from src.schemas.llm import ModelID
+from src.schemas.llm import ModelID, SummarizationMode
 from enum import Enum
 from ulid import ULID
 
@@ -65,6 +65,15 @@ class Chat(BaseModel):
         default_factory=list,
         description="List of messages in the chat."
     )
+    summary: Optional[str] = Field(
+        default=None,
+        description="Rolling summary of the messages older than the verbatim history window."
+    )
+    summarized_until: int = Field(
+        default=0,
+        ge=0,
+        description="Number of leading messages folded into the summary."
+    )
     created_at: str = Field(
         default_factory=lambda: datetime.now().isoformat(),
         description="Timestamp when the chat was created."
@@ -74,6 +83,51 @@ class Chat(BaseModel):
         description="Timestamp when the chat was last updated."
     )
 
+class ChatSummary(BaseModel):
+    """Lightweight projection of a chat for listings, without its messages."""
+
+    chat_id: ULID = Field(
+        description="Unique identifier for the chat using ULID."
+    )
+    title: str = Field(
+        description="Title of the chat."
+    )
+    message_count: int = Field(
+        ge=0,
+        description="Number of messages in the chat."
+    )
+    created_at: str = Field(
+        description="Timestamp when the chat was created."
+    )
+    updated_at: str = Field(
+        description="Timestamp when the chat was last updated."
+    )
+
+class ChatPage(BaseModel):
+    """A page of chats, most recently updated first."""
+
+    chats: List[ChatSummary] = Field(
+        description="Chats on this page."
+    )
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="Cursor for the next page, null on the last page."
+    )
+
+class MessagePage(BaseModel):
+    """A page of a chat's messages, oldest first."""
+
+    chat_id: ULID = Field(
+        description="The chat ULID"
+    )
+    messages: List[Message] = Field(
+        description="Messages on this page."
+    )
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="Cursor for the next page, null on the last page."
+    )
+
 class ChatRequest(BaseModel):
     """Request body for chat endpoint"""
     
@@ -88,6 +142,10 @@ class ChatRequest(BaseModel):
         default=ModelID.OPENAI_GPT4O_MINI,
         description="The model to use for the chat completion"
     )
+    summarization_mode: Optional[SummarizationMode] = Field(
+        default=None,
+        description="How web pages are summarized for the search context, the model's default when omitted"
+    )
 
     class Config:
         """Configuration for ChatRequest model"""
@@ -148,4 +206,49 @@ class ChatResponse(BaseModel):
                     }
                 ]
             }
-        }
\ No newline at end of file
+        }
+
+class ChatStreamEventType(str, Enum):
+    """Server-sent event types emitted by the streaming chat endpoint"""
+    CONTEXT = "context"     # web RAG context, sent before generation starts
+    DELTA = "delta"         # a chunk of the assistant answer
+    DONE = "done"           # the complete assistant message, sent after it is persisted
+    ERROR = "error"         # generation failed, the stream ends
+
+class ChatStreamEvent(BaseModel):
+    """A single event of the streaming chat endpoint"""
+
+    event: ChatStreamEventType = Field(
+        description="The type of the event"
+    )
+    chat_id: ULID = Field(
+        description="The chat ULID"
+    )
+    delta: Optional[str] = Field(
+        default=None,
+        description="Text chunk of the assistant answer (delta events)"
+    )
+    web_search: Optional[bool] = Field(
+        default=None,
+        description="Indicates if a web search was performed (context events)"
+    )
+    search_results: Optional[List[SearchResult]] = Field(
+        default=None,
+        description="The search results returned by the web search (context events)"
+    )
+    message: Optional[AssistantMessage] = Field(
+        default=None,
+        description="The complete assistant message (done events)"
+    )
+    model_id: Optional[ModelID] = Field(
+        default=None,
+        description="The model used for the chat completion (done events)"
+    )
+    detail: Optional[str] = Field(
+        default=None,
+        description="Error details (error events)"
+    )
+
+    def to_sse(self) -> str:
+        """Serialize the event in server-sent events wire format"""
+        return f"event: {self.event.value}\ndata: {self.model_dump_json(exclude_none=True)}\n\n"
@@ -1,4 +1,5 @@
 from enum import Enum
+from typing import Optional
 from pydantic import BaseModel, Field
 
 class ModelID(str, Enum):
@@ -8,6 +9,12 @@ class ModelID(str, Enum):
     GOOGLE_GEMINI2_FLASH = "google_gemini-2.0-flash"
     OPENAI_GPT4O_MINI = "openai_gpt-4o-mini"
 
+class SummarizationMode(str, Enum):
+    """How web pages are summarized for RAG context"""
+    PER_PAGE = "per_page"   # one LLM call per page
+    BATCHED = "batched"     # all pages packed into one call with per-source JSON output
+    EXTRACTIVE = "extractive"   # local sentence extraction, no LLM call (needs numpy)
+
 class ModelInfo(BaseModel):
     """Information about the model"""
     model_id: str = Field(description="Unique identifier for the model")
@@ -15,4 +22,13 @@ class ModelInfo(BaseModel):
     provider: str = Field(description="Model provider e.g. OpenAI, Azure, Google")
     description: str = Field(description="Detailed description of the model")
     context_length: int = Field(gt=0, description="Context window length for the model")
-    max_output_tokens: int = Field(gt=0, description="Maximum output tokens for the model")
\ No newline at end of file
+    max_output_tokens: int = Field(gt=0, description="Maximum output tokens for the model")
+    max_input_tokens: Optional[int] = Field(default=None, gt=0, description="Cap on prompt tokens, CONTEXT_MAX_INPUT_TOKENS when unset")
+
+class ContextBudget(BaseModel):
+    """Token budget of one prompt, split between its parts"""
+    output: int = Field(ge=0, description="Tokens reserved for the model's answer")
+    prompt: int = Field(ge=0, description="Tokens of the system prompt and current message")
+    available: int = Field(ge=0, description="Input tokens left for history and search context")
+    history: int = Field(ge=0, description="Tokens for previous chat messages")
+    search_context: int = Field(ge=0, description="Tokens for web search results")
@@ -1,5 +1,5 @@
 from enum import Enum
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional, List
 
 class SearchEngineID(str, Enum):
@@ -14,6 +14,7 @@ class SearchEngineInfo(BaseModel):
     engine_id: SearchEngineID = Field(description="Unique identifier for the search engine")
     name: str = Field(description="Display name for the search engine")
     max_results_per_query: int = Field(gt=0, description="Maximum number of results per query")
+    cache_ttl: int = Field(default=300, ge=0, description="Seconds a cached result for this engine stays fresh")
 
 class SearchResult(BaseModel):
     """A single search result item from the search engine"""
@@ -27,11 +28,56 @@ class AISearchResult(SearchResult):
     summary: str = Field(description="Generated LLM summary of the web page content")
     ## Can add more fields like score, rank, etc. if needed
 
+class DropReason(str, Enum):
+    """Why a search result was left out of the search context"""
+    FETCH_FAILED = "fetch_failed"           # the page could not be retrieved (error, timeout, no text)
+    SUMMARIZE_FAILED = "summarize_failed"   # the summary failed or timed out
+    ENOUGH_SOURCES = "enough_sources"       # cancelled, enough good sources were summarized already
+    LATENCY_BUDGET = "latency_budget"       # cancelled, the search context latency budget expired
+
+class DroppedSource(SearchResult):
+    """Search result left out of the search context"""
+    reason: DropReason = Field(description="Why the source was dropped")
+
+class SearchGateDecision(BaseModel):
+    """Decision of the local search gate"""
+    needs_search: Optional[bool] = Field(description="Whether a web search is needed, None when the gate is uncertain")
+    score: float = Field(ge=0, le=1, description="Estimated probability that a web search is needed")
+    reason: str = Field(description="What decided: rules, model or uncertain")
+
+class SearchPlan(BaseModel):
+    """Structured output of the search planning call: gate decision and search queries in one round trip"""
+    needs_search: bool = Field(description="Whether a web search is needed to answer the user's message")
+    queries: List[str] = Field(default=[], description="Concise search engine queries, most important first")
+
+    @field_validator("queries")
+    @classmethod
+    def clean_queries(cls, queries: List[str]) -> List[str]:
+        """Strip queries and drop empty or duplicate ones, keeping their order"""
+        cleaned: List[str] = []
+        for query in queries:
+            query = query.strip().strip('"')
+            if query and query.lower() not in (q.lower() for q in cleaned):
+                cleaned.append(query)
+        return cleaned
+
+class SourceSummary(BaseModel):
+    """Summary of one numbered source in a batched summarization call"""
+    source: int = Field(description="1-based number of the source in the request")
+    summary: str = Field(description="Generated LLM summary of the source")
+
+class BatchSummaries(BaseModel):
+    """Structured output of a batched summarization call"""
+    summaries: List[SourceSummary] = Field(description="One summary per source")
+
 class WebRAGResponse(BaseModel):
     """Response model for web search results"""
     search_performed: bool = Field(description="Indicates if web search was performed")
     search_query: str = Field(description="Original search query")
-    search_results: List[SearchResult] = Field(default=[], description="List of search result without AI summary")
+    generated_queries: List[str] = Field(default=[], description="Search engine queries generated from the original query")
+    search_results: List[SearchResult] = Field(default=[], description="Search results used in the search context, without AI summary")
+    dropped_sources: List[DroppedSource] = Field(default=[], description="Search results left out of the search context and why")
     formatted_results: str = Field(default="", description="Formatted search results ready for LLM consumption")
     total_results: int = Field(description="Total number of results found")
-    engine_id: SearchEngineID = Field(description="ID of the search engine used")
\ No newline at end of file
+    engine_id: SearchEngineID = Field(description="ID of the search engine used")
+    cached_from: Optional[str] = Field(default=None, description="Earlier query whose search context was reused by the semantic cache")
\ No newline at end of file
@@ -1,3 +1,4 @@
+import asyncio
 from abc import ABC, abstractmethod
 from typing import ClassVar
 from src.schemas.search import SearchEngineInfo, SearchResult
@@ -15,4 +16,8 @@ class BaseSearch(ABC):
     @abstractmethod
     def search(self, query: str, num_results: int = 5) -> List[SearchResult]:
         """Perform a search and return results."""
-        pass
\ No newline at end of file
+        pass
+
+    async def asearch(self, query: str, num_results: int = 5) -> List[SearchResult]:
+        """Perform a search from the event loop; engines are blocking, so by default in a worker thread."""
+        return await asyncio.to_thread(self.search, query=query, num_results=num_results)
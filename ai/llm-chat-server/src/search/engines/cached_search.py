@@ -0,0 +1,117 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Set
+from src.cache.memory import TTLCache
+from src.cache.search_cache import SearchCacheBackend
+from src.config.settings import settings
+from src.search.engines.base_search import BaseSearch
+from src.schemas.search import SearchEngineInfo, SearchResult
+from src.utils.metrics import MetricsRegistry
+from src.utils.text import normalize_query
+
+class CachedSearch(BaseSearch):
+    """
+    Caching wrapper usable around any search engine.
+
+    Results are keyed by engine, normalized query and `num_results`, kept in a bounded
+    in-process LRU and optionally in a shared backend. Fresh results are returned for
+    `ENGINE_INFO.cache_ttl` seconds; for `SEARCH_CACHE_STALE_TTL` seconds after that,
+    stale results are returned immediately while a background refresh updates them.
+    """
+
+    # Background refreshes run the wrapped engine's blocking `search` off the request path
+    _refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="search-refresh")
+
+    def __init__(self, engine: BaseSearch, backend: Optional[SearchCacheBackend] = None):
+        super().__init__()
+        self.logger = logging.getLogger(__name__)
+        self._engine = engine
+        self._backend = backend
+        self._metrics = MetricsRegistry()
+        self.ttl = engine.ENGINE_INFO.cache_ttl
+        self.stale_ttl = settings.SEARCH_CACHE_STALE_TTL
+        self._local: TTLCache[Dict[str, Any]] = TTLCache(
+            max_entries=settings.SEARCH_CACHE_MAX_ENTRIES,
+            ttl=self.ttl + self.stale_ttl,
+        )
+        self._refreshing: Set[str] = set()
+        self._refresh_lock = threading.Lock()
+
+    @property
+    def ENGINE_INFO(self) -> SearchEngineInfo:
+        return self._engine.ENGINE_INFO
+
+    def _key(self, query: str, num_results: int) -> str:
+        return f"{self.ENGINE_INFO.engine_id.value}:{num_results}:{normalize_query(query)}"
+
+    def _lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        record = self._local.get(key)
+        if record is None and self._backend is not None:
+            record = self._backend.get(key)
+            if record is not None:
+                age = time.time() - record["stored_at"]
+                self._local.set(key, record, ttl=max(self.ttl + self.stale_ttl - age, 0))
+        return record
+
+    def _store(self, key: str, results: List[SearchResult]) -> None:
+        record = {
+            "stored_at": time.time(),
+            "results": [result.model_dump() for result in results],
+        }
+        self._local.set(key, record)
+        if self._backend is not None:
+            self._backend.set(key, record, ttl=self.ttl + self.stale_ttl)
+
+    def _refresh(self, key: str, query: str, num_results: int) -> None:
+        """Re-run a query in the background and update the cache"""
+        try:
+            self._store(key, self._engine.search(query=query, num_results=num_results))
+            self._metrics.incr("search_cache.refreshes")
+        except Exception as e:
+            self.logger.warning(f"Background search refresh failed for '{query[:50]}': {str(e)}")
+        finally:
+            with self._refresh_lock:
+                self._refreshing.discard(key)
+
+    def _cached(self, key: str, query: str, num_results: int, record: Optional[Dict[str, Any]]) -> Optional[List[SearchResult]]:
+        """Results of a cache record, scheduling a refresh when stale; None on a miss"""
+        if record is not None:
+            results = [SearchResult.model_validate(item) for item in record["results"]]
+            if time.time() - record["stored_at"] < self.ttl:
+                self._metrics.incr("search_cache.hits")
+                return results
+
+            # Stale while revalidate: answer now, refresh once in the background
+            self._metrics.incr("search_cache.stale_hits")
+            with self._refresh_lock:
+                if key not in self._refreshing:
+                    self._refreshing.add(key)
+                    self._refresh_executor.submit(self._refresh, key, query, num_results)
+            return results
+
+        self._metrics.incr("search_cache.misses")
+        return None
+
+    def search(self, query: str, num_results: int = 5) -> List[SearchResult]:
+        key = self._key(query, num_results)
+        results = self._cached(key, query, num_results, self._lookup(key))
+        if results is None:
+            results = self._engine.search(query=query, num_results=num_results)
+            self._store(key, results)
+        return results
+
+    async def asearch(self, query: str, num_results: int = 5) -> List[SearchResult]:
+        key = self._key(query, num_results)
+        # The shared backend reads files, keep it off the event loop
+        record = await asyncio.to_thread(self._lookup, key) if self._backend is not None else self._lookup(key)
+        results = self._cached(key, query, num_results, record)
+        if results is None:
+            results = await self._engine.asearch(query=query, num_results=num_results)
+            if self._backend is not None:
+                await asyncio.to_thread(self._store, key, results)
+            else:
+                self._store(key, results)
+        return results
@@ -16,6 +16,7 @@ class GoogleSearchAPI(BaseSearch):
         engine_id=SearchEngineID.GOOGLE,
         name="Google Custom Search",
         max_results_per_query=10,
+        cache_ttl=600,
     )
 
     def __init__(self):
@@ -59,7 +60,8 @@ class GoogleSearchAPI(BaseSearch):
             if response.status_code in (401, 403):
                 raise SearchQueryError(f"Authentication error: {response.status_code}")
             elif response.status_code == 429:
-                raise SearchQueryError("Rate limit exceeded for Google Search API")
+                # Chain the HTTP error so the retry layer sees the status and Retry-After
+                raise SearchQueryError("Rate limit exceeded for Google Search API") from requests.HTTPError(response=response)
 
             response.raise_for_status()
             results = response.json()
@@ -80,9 +82,9 @@ class GoogleSearchAPI(BaseSearch):
 
             return formatted_results
 
-        except requests.Timeout:
-            raise SearchQueryError("Search request timed out")
-        except requests.ConnectionError:
-            raise SearchQueryError("Connection error during search")
+        except requests.Timeout as e:
+            raise SearchQueryError("Search request timed out") from e
+        except requests.ConnectionError as e:
+            raise SearchQueryError("Connection error during search") from e
         except requests.exceptions.RequestException as e:
-            raise SearchQueryError(f"Search query failed: {str(e)}")
\ No newline at end of file
+            raise SearchQueryError(f"Search query failed: {str(e)}") from e
\ No newline at end of file
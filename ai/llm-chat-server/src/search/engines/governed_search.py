@@ -0,0 +1,32 @@
+import asyncio
+from typing import List
+from src.search.engines.base_search import BaseSearch
+from src.schemas.search import SearchEngineInfo, SearchResult
+from src.utils.rate_limit import ProviderGovernor
+
+class GovernedSearch(BaseSearch):
+    """
+    Rate limiting wrapper usable around any search engine.
+
+    `asearch` queues on the event loop and only then dispatches the blocking engine to a
+    worker thread, so queued searches don't hold executor threads. `search` is for callers
+    already in a worker thread (background cache refreshes) and queues with `acquire_sync`.
+    Wrap it inside CachedSearch so cache hits never spend quota.
+    """
+
+    def __init__(self, engine: BaseSearch, governor: ProviderGovernor):
+        super().__init__()
+        self._engine = engine
+        self._governor = governor
+
+    @property
+    def ENGINE_INFO(self) -> SearchEngineInfo:
+        return self._engine.ENGINE_INFO
+
+    def search(self, query: str, num_results: int = 5) -> List[SearchResult]:
+        with self._governor.acquire_sync():
+            return self._engine.search(query=query, num_results=num_results)
+
+    async def asearch(self, query: str, num_results: int = 5) -> List[SearchResult]:
+        async with self._governor.acquire():
+            return await asyncio.to_thread(self._engine.search, query=query, num_results=num_results)
@@ -0,0 +1,22 @@
+from typing import List
+from src.search.engines.base_search import BaseSearch
+from src.schemas.search import SearchEngineInfo, SearchResult
+from src.utils.resilience import RetryPolicy
+
+class ResilientSearch(BaseSearch):
+    """Retry and circuit breaking wrapper usable around any search engine"""
+
+    def __init__(self, engine: BaseSearch, policy: RetryPolicy):
+        super().__init__()
+        self._engine = engine
+        self._policy = policy
+
+    @property
+    def ENGINE_INFO(self) -> SearchEngineInfo:
+        return self._engine.ENGINE_INFO
+
+    def search(self, query: str, num_results: int = 5) -> List[SearchResult]:
+        return self._policy.run_sync(lambda: self._engine.search(query=query, num_results=num_results))
+
+    async def asearch(self, query: str, num_results: int = 5) -> List[SearchResult]:
+        return await self._policy.run(lambda: self._engine.asearch(query=query, num_results=num_results))
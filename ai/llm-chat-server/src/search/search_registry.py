@@ -1,29 +1,60 @@
-from typing import Dict, List
+from functools import lru_cache
+from typing import Dict, List, Optional, Type
 from src.search.engines.base_search import BaseSearch
+from src.search.engines.cached_search import CachedSearch
 from src.search.engines.google_search import GoogleSearchAPI
+from src.search.engines.governed_search import GovernedSearch
+from src.search.engines.resilient_search import ResilientSearch
+from src.cache.search_cache import SearchCacheBackend, DiskSearchCacheBackend
+from src.config.settings import settings
 from src.schemas.search import SearchEngineID, SearchEngineInfo
 from src.utils.decorators import singleton
+from src.utils.rate_limit import get_governor
+from src.utils.resilience import RetryPolicy
 from src.exceptions.search import SearchEngineNotFoundError
 
+@lru_cache(maxsize=1)
+def _search_cache_backend() -> Optional[SearchCacheBackend]:
+    """Build the shared search cache backend configured in settings"""
+    if settings.SEARCH_CACHE_BACKEND == "disk":
+        return DiskSearchCacheBackend(settings.SEARCH_CACHE_DIR, max_bytes=settings.SEARCH_CACHE_DISK_MAX_BYTES)
+    return None
+
+def _with_cache(engine: BaseSearch, backend: Optional[SearchCacheBackend]) -> BaseSearch:
+    """Transparently wrap an engine with the result cache when enabled"""
+    return CachedSearch(engine, backend=backend) if settings.SEARCH_CACHE_ENABLED else engine
+
+def _with_governor(engine: BaseSearch) -> BaseSearch:
+    """Queue the engine's calls behind its per-engine rate limiter when enabled"""
+    if not settings.RATE_LIMIT_ENABLED:
+        return engine
+    return GovernedSearch(engine, get_governor(f"{engine.ENGINE_INFO.engine_id.value}_search"))
+
+def _with_retries(engine: BaseSearch) -> BaseSearch:
+    """Retry transient failures and fail fast through the engine's circuit breaker"""
+    return ResilientSearch(engine, RetryPolicy(f"{engine.ENGINE_INFO.engine_id.value}_search", settings.SEARCH_MAX_RETRIES))
+
 @singleton
 class SearchRegistry:
-    """Registry for managing search engines"""
+    """Registry for managing search engines, each constructed on first use"""
 
-    # Initialize the engines dictionary
-    _engines: Dict[SearchEngineID, BaseSearch] = {
-        SearchEngineID.GOOGLE: GoogleSearchAPI(),
+    _engine_classes: Dict[SearchEngineID, Type[BaseSearch]] = {
+        SearchEngineID.GOOGLE: GoogleSearchAPI,
         # Add more engines as they're implemented
     }
 
+    # Constructed engines, filled by get_engine
+    _engines: Dict[SearchEngineID, BaseSearch] = {}
+
     def list_engines(self) -> List[SearchEngineInfo]:
         """List all available search engines"""
-        return [engine.ENGINE_INFO for engine in self._engines.values()]
+        return [engine_class.ENGINE_INFO for engine_class in self._engine_classes.values()]
 
     def get_engine_info(self, engine_id: str) -> SearchEngineInfo:
         """Get engine information for a specific search engine"""
         try:
             engine_enum = SearchEngineID(engine_id)
-            return self._engines[engine_enum].ENGINE_INFO
+            return self._engine_classes[engine_enum].ENGINE_INFO
         except (ValueError, KeyError):
             raise SearchEngineNotFoundError(
                 f"Invalid engine_id: {engine_id}. "
@@ -31,12 +62,17 @@ class SearchRegistry:
             )
 
     def get_engine(self, engine_id: SearchEngineID) -> BaseSearch:
-        """Get the search engine instance for the specified engine_id"""
+        """Get the search engine instance for the specified engine_id, constructing it on first use"""
         try:
             engine_enum = SearchEngineID(engine_id)
-            return self._engines[engine_enum]
+            engine_class = self._engine_classes[engine_enum]
         except (ValueError, KeyError):
             raise SearchEngineNotFoundError(
                 f"Invalid engine_id: {engine_id}. "
                 f"Supported engines: {[e.value for e in SearchEngineID]}"
-            )
\ No newline at end of file
+            )
+
+        if engine_enum not in self._engines:
+            # Raises SearchEngineConfigError when the engine's environment variables are missing
+            self._engines[engine_enum] = _with_cache(_with_retries(_with_governor(engine_class())), _search_cache_backend())
+        return self._engines[engine_enum]
@@ -1,33 +1,43 @@
 from src.prompts.search import USE_SEARCH_RESULTS, USER_SEARCH_QUERY
-from src.schemas.chat import Chat, ChatRequest, ChatResponse, UserMessage, Role
+from src.schemas.chat import (
+    Chat, ChatPage, ChatRequest, ChatResponse, ChatStreamEvent, ChatStreamEventType,
+    Message, MessagePage, UserMessage, AssistantMessage, Role
+)
 from src.schemas.search import WebRAGResponse
 from src.llm.llm_registry import LLMRegistry
+from src.llm.llm_router import LLMRouter
+from src.llm.models.base_llm import BaseLLM
+from src.llm.token_budget import MESSAGE_OVERHEAD_TOKENS, TokenCounter, get_token_counter, plan_context_budget
 from src.services.web_rag import WebRAGService
-from src.repositories.chat import ChatRepository
-from src.exceptions.chat import ChatNotFoundError
-from src.prompts.chat import GENERAL_CHAT_PROMPT
+from src.services.history import HistoryCompactor
+from src.repositories.chat import get_chat_repository
+from src.exceptions.chat import ChatNotFoundError, InvalidCursorError
+from src.utils.pagination import encode_cursor, decode_cursor
+from src.prompts.chat import GENERAL_CHAT_PROMPT, CHAT_HISTORY_SUMMARY
 
 # search
 from src.schemas.search import SearchEngineID
 
 from ulid import ULID
-from typing import List
+from typing import AsyncIterator, List, Optional, Tuple
 import logging
 
 class ChatService:
     def __init__(self):
         self._llm_registry = LLMRegistry()
-        self._chat_repository = ChatRepository()
+        self._llm_router = LLMRouter()
+        self._chat_repository = get_chat_repository()
         self._web_rag_service = WebRAGService()
+        self._history = HistoryCompactor()
         self.logger = logging.getLogger(__name__)
 
-    async def generate_chat_completion(self, chat_request: ChatRequest) -> ChatResponse:
-        """Generate a chat completion from a user message."""
-        self.logger.debug(f"Starting chat completion for chat_id={chat_request.chat_id}")
-        
-        llm = self._llm_registry.get_model(chat_request.model_id)
-        self.logger.debug(f"Using LLM model: {chat_request.model_id}")
-        
+    async def _prepare_completion(self, chat_request: ChatRequest, llm: BaseLLM) -> Tuple[WebRAGResponse, str, List[Message], Optional[Chat]]:
+        """
+        Run web RAG and build the prompt for a chat request.
+
+        Returns:
+            Tuple of the RAG response, the system prompt, the messages to send and the existing chat (if any)
+        """
         chat_exists = await self._chat_repository.chat_exists(chat_request.chat_id)
         self.logger.debug(f"Chat exists: {chat_exists}")
 
@@ -35,47 +45,106 @@ class ChatService:
         rag_response = await self._web_rag_service.execute_web_rag(
             user_message=chat_request.message,
             llm=llm,
-            engine_id=SearchEngineID.GOOGLE
+            engine_id=SearchEngineID.GOOGLE,
+            chat_id=str(chat_request.chat_id),
+            summarization_mode=chat_request.summarization_mode
         )
 
         self.logger.debug(f"Web search performed: {rag_response.search_performed}")
-        if rag_response.search_performed and rag_response.search_results:
+        counter = get_token_counter(llm.MODEL_INFO.provider)
+        use_search = rag_response.search_performed and bool(rag_response.search_results)
+        if use_search:
             system_prompt = USE_SEARCH_RESULTS
             self.logger.debug("Using search-based system prompt")
+            message_template = USER_SEARCH_QUERY.format(search_query=rag_response.search_query, formatted_results="")
+        else:
+            system_prompt = GENERAL_CHAT_PROMPT
+            self.logger.debug("Using general system prompt")
+            message_template = chat_request.message.content
+
+        existing_chat = None
+        recent_messages: List[Message] = []
+        if chat_exists:
+            existing_chat = await self._chat_repository.get(chat_request.chat_id)
+            summary, recent_messages = self._history.window(existing_chat)
+            if summary:
+                # Older turns travel as a summary in the system prompt
+                system_prompt += CHAT_HISTORY_SUMMARY.format(summary=summary)
+
+        budget = plan_context_budget(
+            llm.MODEL_INFO,
+            prompt_tokens=counter.count(system_prompt) + counter.count(message_template) + 2 * MESSAGE_OVERHEAD_TOKENS,
+            with_search=use_search,
+        )
+        self.logger.debug(f"Context budget: {budget}")
+
+        history_budget = budget.history
+        if use_search:
+            formatted_results = counter.truncate(rag_response.formatted_results, budget.search_context)
+            # Search context left unused goes to the history
+            history_budget += budget.search_context - counter.count(formatted_results)
             message_with_web_rag_context = UserMessage(
                 role=Role.USER,
                 content=USER_SEARCH_QUERY.format(
                     search_query=rag_response.search_query,
-                    formatted_results=rag_response.formatted_results
+                    formatted_results=formatted_results
                 )
             )
         else:
-            system_prompt = GENERAL_CHAT_PROMPT
-            self.logger.debug("Using general system prompt")
             message_with_web_rag_context = UserMessage(
                 role=Role.USER,
                 content=chat_request.message.content
             )
 
-        if chat_exists:
-            self.logger.debug("Updating existing chat")
-            existing_chat = await self._chat_repository.get(chat_request.chat_id)
+        if existing_chat is not None:
             self.logger.debug("Generating completion with chat history")
-            assistant_message = await llm.get_completion(
-                system_instruction=system_prompt,
-                messages=existing_chat.messages + [message_with_web_rag_context]
-            )
-            existing_chat.messages.extend([chat_request.message, assistant_message])
-            await self._chat_repository.update_messages(
+            history = self._fit_history(recent_messages, counter, history_budget)
+            messages = history + [message_with_web_rag_context]
+        else:
+            messages = [message_with_web_rag_context]
+
+        return rag_response, system_prompt, messages, existing_chat
+
+    def _fit_history(self, messages: List[Message], counter: TokenCounter, max_tokens: int) -> List[Message]:
+        """
+        Keep the most recent messages that fit in the history token budget.
+
+        Args:
+            messages: The chat history, oldest first
+            counter: Token counter of the model's provider
+            max_tokens: The history token budget
+
+        Returns:
+            List[Message]: The newest messages within budget, starting with a user message
+        """
+        kept = 0
+        used = 0
+        for message in reversed(messages):
+            used += counter.count(message.content) + MESSAGE_OVERHEAD_TOKENS
+            if used > max_tokens:
+                break
+            kept += 1
+        history = messages[len(messages) - kept:]
+        # Don't open the conversation with an orphaned assistant reply
+        while history and history[0].role != Role.USER:
+            history = history[1:]
+        if len(history) < len(messages):
+            self.logger.debug(f"History trimmed to the last {len(history)} of {len(messages)} messages")
+        return history
+
+    async def _save_turn(self, chat_request: ChatRequest, assistant_message: AssistantMessage, existing_chat: Optional[Chat], llm: BaseLLM) -> None:
+        """Persist the user message and the assistant answer, compacting long histories in the background"""
+        if existing_chat is not None:
+            self.logger.debug("Updating existing chat")
+            new_messages = [chat_request.message, assistant_message]
+            await self._chat_repository.append_messages(
                 chat_id=chat_request.chat_id,
-                messages=existing_chat.messages
+                messages=new_messages
             )
+            existing_chat.messages.extend(new_messages)
+            self._history.schedule_refresh(existing_chat, llm)
         else:
             self.logger.debug("Creating new chat")
-            assistant_message = await llm.get_completion(
-                system_instruction=system_prompt,
-                messages=[message_with_web_rag_context]
-            )
             chat_history = [chat_request.message, assistant_message]
             new_chat = Chat(
                 chat_id=chat_request.chat_id,
@@ -84,15 +153,74 @@ class ChatService:
             )
             await self._chat_repository.create(new_chat)
 
-        self.logger.debug("Completing chat generation")
+    async def generate_chat_completion(self, chat_request: ChatRequest) -> ChatResponse:
+        """Generate a chat completion from a user message."""
+        self.logger.debug(f"Starting chat completion for chat_id={chat_request.chat_id}")
+        
+        # Helper calls go to an equivalent model while the requested provider's breaker is open
+        llm = self._llm_registry.get_model(self._llm_router.select_model(chat_request.model_id))
+        self.logger.debug(f"Using LLM model: {chat_request.model_id}")
+
+        rag_response, system_prompt, messages, existing_chat = await self._prepare_completion(chat_request, llm)
+        # The router may answer with an equivalent model, report the one that did
+        assistant_message, answered_by = await self._llm_router.get_completion(
+            chat_request.model_id,
+            system_instruction=system_prompt,
+            messages=messages
+        )
+        await self._save_turn(chat_request, assistant_message, existing_chat, llm)
+
+        self.logger.debug(f"Completing chat generation, answered by {answered_by.value}")
         return ChatResponse(
             chat_id=chat_request.chat_id,
             message=assistant_message,
-            model_id=chat_request.model_id,
+            model_id=answered_by,
+            web_search=rag_response.search_performed,
+            search_results=rag_response.search_results
+        )
+
+    async def stream_chat_completion(self, chat_request: ChatRequest) -> AsyncIterator[ChatStreamEvent]:
+        """Stream a chat completion from a user message as chat stream events."""
+        self.logger.debug(f"Starting streaming chat completion for chat_id={chat_request.chat_id}")
+
+        # Helper calls go to an equivalent model while the requested provider's breaker is open
+        llm = self._llm_registry.get_model(self._llm_router.select_model(chat_request.model_id))
+        self.logger.debug(f"Using LLM model: {chat_request.model_id}")
+
+        rag_response, system_prompt, messages, existing_chat = await self._prepare_completion(chat_request, llm)
+
+        # Emit the RAG context before generation starts
+        yield ChatStreamEvent(
+            event=ChatStreamEventType.CONTEXT,
+            chat_id=chat_request.chat_id,
             web_search=rag_response.search_performed,
             search_results=rag_response.search_results
         )
 
+        deltas: List[str] = []
+        answered_by = chat_request.model_id
+        async for answered_by, delta in self._llm_router.stream_completion(
+            chat_request.model_id, system_instruction=system_prompt, messages=messages
+        ):
+            deltas.append(delta)
+            yield ChatStreamEvent(
+                event=ChatStreamEventType.DELTA,
+                chat_id=chat_request.chat_id,
+                delta=delta
+            )
+
+        # Persist only once the stream completed
+        assistant_message = AssistantMessage(role=Role.ASSISTANT, content="".join(deltas))
+        await self._save_turn(chat_request, assistant_message, existing_chat, llm)
+
+        self.logger.debug("Completing streaming chat generation")
+        yield ChatStreamEvent(
+            event=ChatStreamEventType.DONE,
+            chat_id=chat_request.chat_id,
+            message=assistant_message,
+            model_id=answered_by
+        )
+
     async def get_chat(self, chat_id: ULID) -> Chat:
         """Retrieve a chat by its ID."""
         chat = await self._chat_repository.get(chat_id)
@@ -100,9 +228,63 @@ class ChatService:
             raise ChatNotFoundError(f"Chat with ID {chat_id} not found")
         return chat
 
-    async def list_chats(self) -> List[Chat]:
-        """Retrieve all chats."""
-        return await self._chat_repository.list()
+    async def list_chats(self, limit: int = 20, cursor: Optional[str] = None) -> ChatPage:
+        """
+        Retrieve a page of chat summaries, most recently updated first.
+
+        Args:
+            limit: Maximum number of chats on the page
+            cursor: `next_cursor` of the previous page, None for the first page
+
+        Returns:
+            ChatPage: The chat summaries and the cursor of the next page
+        """
+        after = None
+        if cursor:
+            try:
+                updated_at, chat_id = decode_cursor(cursor, size=2)
+                after = (str(updated_at), str(chat_id))
+            except ValueError as e:
+                raise InvalidCursorError(str(e))
+
+        # Fetch one extra row to know whether another page follows
+        summaries = await self._chat_repository.list_summaries(limit + 1, after)
+        next_cursor = None
+        if len(summaries) > limit:
+            summaries = summaries[:limit]
+            next_cursor = encode_cursor(summaries[-1].updated_at, str(summaries[-1].chat_id))
+        return ChatPage(chats=summaries, next_cursor=next_cursor)
+
+    async def list_messages(self, chat_id: ULID, limit: int = 50, cursor: Optional[str] = None) -> MessagePage:
+        """
+        Retrieve a page of a chat's messages, oldest first.
+
+        Args:
+            chat_id: The chat ID
+            limit: Maximum number of messages on the page
+            cursor: `next_cursor` of the previous page, None for the first page
+
+        Returns:
+            MessagePage: The messages and the cursor of the next page
+        """
+        offset = 0
+        if cursor:
+            try:
+                offset, = decode_cursor(cursor, size=1)
+                if not isinstance(offset, int) or offset < 0:
+                    raise ValueError(f"Invalid cursor: {cursor}")
+            except ValueError as e:
+                raise InvalidCursorError(str(e))
+
+        # Messages are append-only, so their position is a stable keyset
+        messages = await self._chat_repository.list_messages(chat_id, limit + 1, offset)
+        if messages is None:
+            raise ChatNotFoundError(f"Chat with ID {chat_id} not found")
+        next_cursor = None
+        if len(messages) > limit:
+            messages = messages[:limit]
+            next_cursor = encode_cursor(offset + limit)
+        return MessagePage(chat_id=chat_id, messages=messages, next_cursor=next_cursor)
 
     async def delete_chat(self, chat_id: ULID) -> None:
         """Delete a chat by its ID."""
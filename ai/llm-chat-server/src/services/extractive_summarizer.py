@@ -0,0 +1,133 @@
+import logging
+import re
+from typing import Dict, List
+from src.cache.semantic_cache import STOP_WORDS
+from src.utils.decorators import singleton
+
+try:
+    import numpy as np
+except ImportError:     # optional `extractive-summary` extra
+    np = None
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+# Sentence ends: terminal punctuation followed by an uppercase start, or a line break
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?])[\"')\]]?\s+(?=[\"'(\[]?[A-Z0-9])|\s*\n+\s*")
+_WHITESPACE = re.compile(r"\s+")
+
+MIN_SENTENCE_CHARS = 30     # shorter fragments are menus, captions and buttons
+MAX_SENTENCE_CHARS = 600    # longer "sentences" are unsplit boilerplate
+MAX_SENTENCES = 400         # sentences scored per page, pages are capped at MAX_PAGE_CHARS anyway
+BM25_K1 = 1.2
+BM25_B = 0.75
+QUERY_WEIGHT = 0.7          # share of the score from query relevance, the rest is centrality
+TEXTRANK_DAMPING = 0.85
+TEXTRANK_ITERATIONS = 30
+REDUNDANCY_THRESHOLD = 0.7  # cosine similarity above which a sentence repeats one already picked
+
+@singleton
+class ExtractiveSummarizer:
+    """
+    CPU-only, query-focused extractive summarizer.
+
+    Splits the page into sentences and scores each one by BM25 relevance to the search query
+    and TextRank centrality over their TF-IDF similarity graph, both computed with NumPy
+    matrix operations. The best non-redundant sentences that fit the character limit are
+    returned in page order. Runs in milliseconds, an alternative to per-page LLM summaries.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self.enabled = np is not None
+        if not self.enabled:
+            self.logger.warning("numpy is not installed, extractive summaries disabled")
+
+    def split_sentences(self, content: str) -> List[str]:
+        """Split page text into sentences, dropping fragments and boilerplate"""
+        sentences: List[str] = []
+        for sentence in _SENTENCE_BREAK.split(content):
+            sentence = _WHITESPACE.sub(" ", sentence).strip()
+            if MIN_SENTENCE_CHARS <= len(sentence) <= MAX_SENTENCE_CHARS:
+                sentences.append(sentence)
+                if len(sentences) == MAX_SENTENCES:
+                    break
+        return sentences
+
+    def _tokenize(self, text: str) -> List[str]:
+        return [token for token in _TOKEN.findall(text.lower()) if token not in STOP_WORDS]
+
+    def summarize(self, content: str, query: str, character_limit: int) -> str:
+        """
+        Build a query-focused summary from the page's own sentences.
+
+        Args:
+            content: Extracted page text
+            query: The original search query
+            character_limit: Maximum length of the summary
+
+        Returns:
+            str: The selected sentences in page order, empty if the page has none
+        """
+        sentences = self.split_sentences(content)
+        if not sentences:
+            return ""
+
+        # Sentence-term count matrix over the page vocabulary
+        vocabulary: Dict[str, int] = {}
+        rows: List[List[int]] = []
+        for sentence in sentences:
+            rows.append([vocabulary.setdefault(token, len(vocabulary)) for token in self._tokenize(sentence)])
+        counts = np.zeros((len(sentences), max(len(vocabulary), 1)), dtype=np.float32)
+        for row, indices in enumerate(rows):
+            np.add.at(counts[row], indices, 1.0)
+
+        n = len(sentences)
+        document_frequency = np.count_nonzero(counts, axis=0)
+        idf = np.log(1.0 + (n - document_frequency + 0.5) / (document_frequency + 0.5)).astype(np.float32)
+
+        # BM25 relevance to the query terms found on the page
+        query_indices = sorted({vocabulary[token] for token in self._tokenize(query) if token in vocabulary})
+        relevance = np.zeros(n, dtype=np.float32)
+        if query_indices:
+            lengths = counts.sum(axis=1, keepdims=True)
+            tf = counts[:, query_indices]
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths / max(float(lengths.mean()), 1.0))
+            relevance = (tf * (BM25_K1 + 1) / (tf + norm) * idf[query_indices]).sum(axis=1)
+
+        # TextRank: PageRank over the cosine similarity graph of TF-IDF sentence vectors
+        tfidf = counts * idf
+        tfidf /= np.maximum(np.linalg.norm(tfidf, axis=1, keepdims=True), 1e-9)
+        similarity = tfidf @ tfidf.T
+        np.fill_diagonal(similarity, 0.0)
+        out_weight = similarity.sum(axis=1, keepdims=True)
+        transition = np.divide(similarity, out_weight, out=np.full_like(similarity, 1.0 / n), where=out_weight > 0)
+        centrality = np.full(n, 1.0 / n, dtype=np.float32)
+        for _ in range(TEXTRANK_ITERATIONS):
+            updated = (1 - TEXTRANK_DAMPING) / n + TEXTRANK_DAMPING * (transition.T @ centrality)
+            if np.abs(updated - centrality).sum() < 1e-6:
+                centrality = updated
+                break
+            centrality = updated
+
+        def scaled(values: "np.ndarray") -> "np.ndarray":
+            peak = float(values.max())
+            return values / peak if peak > 0 else values
+
+        weight = QUERY_WEIGHT if query_indices else 0.0
+        scores = weight * scaled(relevance) + (1 - weight) * scaled(centrality)
+
+        # Greedy pick by score, skipping near-duplicates and sentences that no longer fit
+        selected: List[int] = []
+        used = 0
+        for index in np.argsort(-scores, kind="stable"):
+            length = len(sentences[index]) + (1 if selected else 0)
+            if used + length > character_limit:
+                continue
+            if selected and float(similarity[index, selected].max()) > REDUNDANCY_THRESHOLD:
+                continue
+            selected.append(int(index))
+            used += length
+        if not selected:
+            # Even the best sentence is too long, cut it at a word boundary
+            best = sentences[int(np.argmax(scores))]
+            return best[:max(character_limit - 3, 0)].rsplit(" ", 1)[0] + "..."
+        return " ".join(sentences[index] for index in sorted(selected))
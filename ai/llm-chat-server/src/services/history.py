@@ -0,0 +1,111 @@
+import asyncio
+import logging
+from typing import List, Optional, Set, Tuple
+from ulid import ULID
+from src.config.settings import settings
+from src.llm.llm_registry import LLMRegistry
+from src.llm.models.base_llm import BaseLLM
+from src.llm.token_budget import MESSAGE_OVERHEAD_TOKENS, get_token_counter, plan_context_budget
+from src.prompts.chat import SUMMARIZE_CHAT_HISTORY
+from src.repositories.chat import get_chat_repository
+from src.schemas.chat import Chat, Message, UserMessage, Role
+from src.utils.metrics import MetricsRegistry
+
+class HistoryCompactor:
+    """
+    Sliding-window chat history with a rolling summary.
+
+    The last K turns (configured per model) are sent verbatim. Once 2K unsummarized turns
+    have piled up, everything but the last K is folded into the chat's stored summary with
+    one LLM call that reads only the previous summary and the newly folded messages, so a
+    refresh costs the same on turn 20 as on turn 500.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._llm_registry = LLMRegistry()
+        self._chat_repository = get_chat_repository()
+        self._metrics = MetricsRegistry()
+        self._in_flight: Set[ULID] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+    def window(self, chat: Chat) -> Tuple[Optional[str], List[Message]]:
+        """
+        Get the history to send for a chat.
+
+        Returns:
+            Tuple[Optional[str], List[Message]]: The summary of older messages (if any) and the messages to send verbatim
+        """
+        if not settings.CHAT_HISTORY_COMPACTION_ENABLED:
+            return None, chat.messages
+        return chat.summary, chat.messages[chat.summarized_until:]
+
+    def needs_refresh(self, chat: Chat, llm: BaseLLM) -> bool:
+        """Whether enough turns have accumulated to fold the older ones into the summary"""
+        if not settings.CHAT_HISTORY_COMPACTION_ENABLED:
+            return False
+        window_messages = 2 * self._llm_registry.get_history_window(llm.MODEL_INFO.model_id)
+        return len(chat.messages) - chat.summarized_until >= 2 * window_messages
+
+    async def refresh(self, chat: Chat, llm: BaseLLM) -> None:
+        """
+        Fold the messages before the verbatim window into the chat's summary.
+
+        Args:
+            chat: The chat to compact
+            llm: The language model writing the summary
+        """
+        window_messages = 2 * self._llm_registry.get_history_window(llm.MODEL_INFO.model_id)
+        fold_until = len(chat.messages) - window_messages
+        # Start the verbatim window on a user message so turns stay whole
+        while fold_until < len(chat.messages) and chat.messages[fold_until].role != Role.USER:
+            fold_until += 1
+        if fold_until <= chat.summarized_until:
+            return
+
+        new_messages = chat.messages[chat.summarized_until:fold_until]
+        self.logger.debug(f"Folding {len(new_messages)} messages into the summary of chat {chat.chat_id}")
+        system_prompt = SUMMARIZE_CHAT_HISTORY.format(character_limit=settings.CHAT_HISTORY_SUMMARY_MAX_CHARS)
+        header = f"Current summary:\n{chat.summary or '(empty)'}\n\nNew messages:\n"
+
+        counter = get_token_counter(llm.MODEL_INFO.provider)
+        budget = plan_context_budget(
+            llm.MODEL_INFO,
+            prompt_tokens=counter.count(system_prompt) + counter.count(header) + 2 * MESSAGE_OVERHEAD_TOKENS,
+            with_search=False,
+        )
+        # Each message is capped so one huge message cannot crowd out the rest of the batch
+        per_message_tokens = max(budget.available // len(new_messages) - MESSAGE_OVERHEAD_TOKENS, 1)
+        transcript = "\n\n".join(
+            f"{message.role.value}: {counter.truncate(message.content, per_message_tokens)}"
+            for message in new_messages
+        )
+
+        response = await llm.get_completion(
+            system_instruction=system_prompt,
+            messages=[UserMessage(content=header + transcript)]
+        )
+        summary = response.content.strip()[:settings.CHAT_HISTORY_SUMMARY_MAX_CHARS]
+        await self._chat_repository.update_summary(chat.chat_id, summary, fold_until)
+        chat.summary = summary
+        chat.summarized_until = fold_until
+        self._metrics.incr("chat_history.summaries")
+
+    def schedule_refresh(self, chat: Chat, llm: BaseLLM) -> None:
+        """Refresh the summary in the background when needed, so the answer is not delayed"""
+        if chat.chat_id in self._in_flight or not self.needs_refresh(chat, llm):
+            return
+        self._in_flight.add(chat.chat_id)
+        task = asyncio.create_task(self._refresh_in_background(chat, llm))
+        # Keep a reference so the task is not garbage collected before it finishes
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _refresh_in_background(self, chat: Chat, llm: BaseLLM) -> None:
+        try:
+            await self.refresh(chat, llm)
+        except Exception as e:
+            # The full window is still sent on the next turn, so a failed refresh only costs tokens
+            self.logger.error(f"Failed to refresh history summary for chat {chat.chat_id}: {str(e)}")
+        finally:
+            self._in_flight.discard(chat.chat_id)
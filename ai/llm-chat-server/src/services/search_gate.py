@@ -0,0 +1,159 @@
+import json
+import logging
+import math
+import random
+import re
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from src.config.settings import settings
+from src.schemas.search import SearchGateDecision
+from src.utils.decorators import singleton
+from src.utils.metrics import MetricsRegistry
+
+# Queries that clearly need fresh information from the web
+SEARCH_RULES = [
+    re.compile(r"\b(latest|newest|breaking|recent(ly)?|currently|right now|today|tonight|yesterday|tomorrow|this (week|month|year)|last (week|month|night))\b"),
+    re.compile(r"\b(news|headlines|weather|forecast|stock price|share price|exchange rate|scores?|standings|release date|election results?)\b"),
+    re.compile(r"\b(who is the (current )?(ceo|president|prime minister|head|leader|owner))\b"),
+    re.compile(r"\b20(2[4-9]|[3-9][0-9])\b"),
+    re.compile(r"\b(links?|sources|citations?|references) (for|to|about|on)\b"),
+]
+
+# Queries that never benefit from a web search
+NO_SEARCH_RULES = [
+    re.compile(r"^\s*(hi|hello|hey|thanks|thank you|good (morning|evening|night))\b[\s!.?]*$"),
+    re.compile(r"\b(write|compose|draft|create|generate|make up)\b.*\b(poem|haiku|limerick|story|song|lyrics|essay|joke|email|letter|tweet|slogan)\b"),
+    re.compile(r"\b(write|fix|debug|refactor|optimi[sz]e|implement|review)\b.*\b(code|function|class|script|query|regex|program|bug)\b"),
+    re.compile(r"\b(translate|rephrase|paraphrase|proofread|summari[sz]e this|rewrite)\b"),
+    re.compile(r"^[\d\s+\-*/().^%=x]+\??$"),
+    re.compile(r"\b(who are you|what can you do|your (name|capabilities|limitations))\b"),
+]
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+def text_hash(text: str) -> int:
+    """Hash of a normalized message, recorded for training examples so evaluations can skip them"""
+    return zlib.crc32(" ".join(_TOKEN.findall(text.lower())).encode())
+
+class HashedNgramModel:
+    """Logistic regression over hashed word unigrams and bigrams"""
+
+    def __init__(
+        self,
+        n_features: int = 2 ** 18,
+        weights: Optional[Dict[int, float]] = None,
+        bias: float = 0.0,
+        trained_on: Optional[Set[int]] = None,
+        validation: Optional[Dict[str, float]] = None,
+    ):
+        self.n_features = n_features
+        self.weights: Dict[int, float] = weights or {}
+        self.bias = bias
+        self.trained_on: Set[int] = trained_on or set()     # text_hash of every training example
+        self.validation = validation                        # cross-validated agreement, see scripts/train_search_gate.py
+
+    def features(self, text: str) -> List[int]:
+        """Hash the text's unigrams and bigrams into feature indices"""
+        tokens = _TOKEN.findall(text.lower())
+        grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        return [zlib.crc32(gram.encode()) % self.n_features for gram in grams]
+
+    def predict_proba(self, text: str) -> float:
+        """Probability that the text needs a web search"""
+        score = self.bias + sum(self.weights.get(index, 0.0) for index in self.features(text))
+        return 1.0 / (1.0 + math.exp(-max(min(score, 30.0), -30.0)))
+
+    def fit(self, examples: Iterable[Tuple[str, bool]], epochs: int = 10, learning_rate: float = 0.1, l2: float = 1e-4, seed: int = 0) -> None:
+        """Train with plain SGD on (text, needs_search) examples"""
+        examples = list(examples)
+        self.trained_on.update(text_hash(text) for text, _ in examples)
+        data = [(self.features(text), 1.0 if label else 0.0) for text, label in examples]
+        rng = random.Random(seed)
+        for _ in range(epochs):
+            rng.shuffle(data)
+            for indices, label in data:
+                score = self.bias + sum(self.weights.get(index, 0.0) for index in indices)
+                error = 1.0 / (1.0 + math.exp(-max(min(score, 30.0), -30.0))) - label
+                self.bias -= learning_rate * error
+                for index in indices:
+                    weight = self.weights.get(index, 0.0)
+                    self.weights[index] = weight - learning_rate * (error + l2 * weight)
+
+    def save(self, path: str) -> None:
+        """Write the non-zero weights to a JSON file"""
+        Path(path).write_text(json.dumps({
+            "n_features": self.n_features,
+            "bias": self.bias,
+            "weights": {str(index): round(weight, 6) for index, weight in self.weights.items() if abs(weight) > 1e-6},
+            "trained_on": sorted(self.trained_on),
+            "validation": self.validation,
+        }))
+
+    @classmethod
+    def load(cls, path: str) -> "HashedNgramModel":
+        """Load a model saved with `save`"""
+        data = json.loads(Path(path).read_text())
+        return cls(
+            n_features=data["n_features"],
+            weights={int(index): weight for index, weight in data["weights"].items()},
+            bias=data["bias"],
+            trained_on=set(data.get("trained_on", [])),
+            validation=data.get("validation"),
+        )
+
+    def is_validated(self) -> bool:
+        """Whether held-out agreement with the LLM gate is good enough to skip the LLM"""
+        if not self.validation:
+            return False
+        return (
+            self.validation.get("decided", 0) >= settings.SEARCH_GATE_MIN_HELD_OUT_DECISIONS
+            and self.validation.get("agreement", 0.0) >= settings.SEARCH_GATE_MIN_HELD_OUT_AGREEMENT
+        )
+
+@singleton
+class SearchGate:
+    """
+    Local first-stage classifier for the "should use web search" decision.
+
+    Keyword rules decide unambiguous queries; otherwise the hashed n-gram model decides
+    when its probability is outside the uncertainty band. Everything else returns an
+    undecided result so the caller falls back to the LLM gate. A model file is only used
+    when its cross-validated agreement with the LLM gate on unseen messages is recorded and
+    reaches SEARCH_GATE_MIN_HELD_OUT_AGREEMENT.
+    """
+
+    def __init__(self, model: Optional[HashedNgramModel] = None):
+        self.logger = logging.getLogger(__name__)
+        self._metrics = MetricsRegistry()
+        self.model = model
+        if self.model is None and settings.SEARCH_GATE_MODEL_PATH:
+            try:
+                self.model = HashedNgramModel.load(settings.SEARCH_GATE_MODEL_PATH)
+            except (OSError, ValueError, KeyError) as e:
+                self.logger.warning(f"Failed to load search gate model, using rules only: {str(e)}")
+            if self.model is not None and not self.model.is_validated():
+                self.logger.warning(f"Search gate model has no or too weak held-out validation ({self.model.validation}), using rules only")
+                self.model = None
+
+    def classify(self, text: str) -> SearchGateDecision:
+        """Decide locally whether the query needs a web search"""
+        normalized = text.lower()
+        search_hit = any(rule.search(normalized) for rule in SEARCH_RULES)
+        no_search_hit = any(rule.search(normalized) for rule in NO_SEARCH_RULES)
+
+        if search_hit != no_search_hit:
+            decision = SearchGateDecision(needs_search=search_hit, score=1.0 if search_hit else 0.0, reason="rules")
+        elif self.model is not None:
+            score = self.model.predict_proba(text)
+            if score >= settings.SEARCH_GATE_UPPER_THRESHOLD:
+                decision = SearchGateDecision(needs_search=True, score=score, reason="model")
+            elif score <= settings.SEARCH_GATE_LOWER_THRESHOLD:
+                decision = SearchGateDecision(needs_search=False, score=score, reason="model")
+            else:
+                decision = SearchGateDecision(needs_search=None, score=score, reason="uncertain")
+        else:
+            decision = SearchGateDecision(needs_search=None, score=0.5, reason="uncertain")
+
+        self._metrics.incr(f"search_gate.{decision.reason}")
+        return decision
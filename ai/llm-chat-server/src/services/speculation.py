@@ -0,0 +1,73 @@
+import threading
+from typing import Dict, Optional
+from src.cache.memory import TTLCache
+from src.config.settings import settings
+from src.utils.decorators import singleton
+
+CHAT_STATS_TTL = 24 * 3600  # seconds, gate history of an idle chat is forgotten after a day
+
+class GateStats:
+    """EWMA rate at which the LLM gate said "search", and how many decisions it is based on"""
+
+    def __init__(self):
+        self.true_rate = 0.0
+        self.samples = 0
+
+    def record(self, needs_search: bool) -> None:
+        alpha = settings.WEB_RAG_SPECULATION_EWMA_ALPHA
+        value = 1.0 if needs_search else 0.0
+        self.true_rate = value if self.samples == 0 else alpha * value + (1 - alpha) * self.true_rate
+        self.samples += 1
+
+@singleton
+class SpeculationPolicy:
+    """
+    Decides when to generate the search query before the LLM gate has answered.
+
+    A speculative query (and search) is wasted whenever the gate then says no, so it only
+    pays off where the gate usually says yes. The policy tracks the gate's "true" rate per
+    model and per chat: a chat with enough decisions of its own is judged on them,
+    otherwise the model's rate is used. Without enough history it does not speculate.
+    """
+
+    def __init__(self):
+        self._models: Dict[str, GateStats] = {}
+        self._chats: TTLCache[GateStats] = TTLCache(
+            max_entries=settings.WEB_RAG_SPECULATION_MAX_CHATS,
+            ttl=CHAT_STATS_TTL,
+        )
+        self._lock = threading.Lock()
+
+    def record(self, model_id: str, chat_id: Optional[str], needs_search: bool) -> None:
+        """Record an LLM gate decision for the model and the chat"""
+        with self._lock:
+            self._models.setdefault(model_id, GateStats()).record(needs_search)
+            if chat_id is not None:
+                stats = self._chats.get(chat_id)
+                if stats is None:
+                    stats = GateStats()
+                # Setting again refreshes the chat's TTL and LRU position
+                stats.record(needs_search)
+                self._chats.set(chat_id, stats)
+
+    def should_speculate(self, model_id: str, chat_id: Optional[str] = None) -> bool:
+        """
+        Whether to start query generation in parallel with the LLM gate.
+
+        Args:
+            model_id: ID of the model answering the gate
+            chat_id: ID of the chat, if known
+
+        Returns:
+            bool: True if the gate's historical "true" rate is above the threshold
+        """
+        if not settings.WEB_RAG_SPECULATION_ENABLED:
+            return False
+        min_samples = settings.WEB_RAG_SPECULATION_MIN_SAMPLES
+        with self._lock:
+            stats = self._chats.get(chat_id) if chat_id is not None else None
+            if stats is None or stats.samples < min_samples:
+                stats = self._models.get(model_id)
+            if stats is None or stats.samples < min_samples:
+                return False
+            return stats.true_rate >= settings.WEB_RAG_SPECULATION_MIN_TRUE_RATE
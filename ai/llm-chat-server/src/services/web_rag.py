@@ -1,15 +1,45 @@
-import requests
-from bs4 import BeautifulSoup
+import asyncio
+import time
+import httpx
 import logging
-from typing import List, Optional
-from src.prompts.search import SHOULD_USE_WEB_SEARCH, GENERATE_SEARCH_QUERY, SUMMARIZE_WEB_CONTENT
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+from src.config.settings import settings
+from pydantic import ValidationError
+from src.prompts.search import (
+    SHOULD_USE_WEB_SEARCH, GENERATE_SEARCH_QUERY, PLAN_WEB_SEARCH,
+    SUMMARIZE_WEB_CONTENT, SUMMARIZE_WEB_CONTENT_VERSION,
+    SUMMARIZE_WEB_CONTENT_BATCH, SUMMARIZE_WEB_CONTENT_BATCH_VERSION
+)
 from src.llm.models.base_llm import BaseLLM
-from src.schemas.search import SearchEngineID, SearchResult, AISearchResult, WebRAGResponse
+from src.schemas.search import (
+    SearchEngineID, SearchResult, AISearchResult, SearchPlan, BatchSummaries,
+    DropReason, DroppedSource, WebRAGResponse
+)
+from src.schemas.llm import SummarizationMode
+from src.llm.llm_registry import LLMRegistry
+from src.llm.token_budget import APPROX_CHARS_PER_TOKEN, MESSAGE_OVERHEAD_TOKENS, get_token_counter, plan_context_budget
 from src.schemas.chat import UserMessage, AssistantMessage
 from src.search.search_registry import SearchRegistry
-
-TRUNCATE_SCRAPED_TEXT = 10000  # adjust based on Model's context window
-CHARACTER_LIMIT = 1000  # adjust for tokenization considerations
+from src.exceptions.resilience import CircuitOpenError
+from src.utils.http import HTTPClient
+from src.utils.single_flight import SingleFlight
+from src.utils.text import normalize_query
+from src.extraction.extractor_registry import ExtractorRegistry
+from src.extraction.engines.base_extractor import BaseExtractor
+from src.cache.page_cache import PageCache, CachedPage, canonicalize_url
+from src.cache.summary_cache import SummaryCache
+from src.cache.semantic_cache import SemanticCache
+from src.services.search_gate import SearchGate
+from src.services.speculation import SpeculationPolicy
+from src.services.extractive_summarizer import ExtractiveSummarizer
+from src.utils.text import strip_code_fences
+from src.utils.metrics import MetricsRegistry
+
+MAX_PAGE_CHARS = 40000  # model-independent cap on cached page text, trimmed per model by the token budget
+CHARACTER_LIMIT = 1000  # longest summary per source, shortened for models with a small context budget
+HTML_MEDIA_TYPES = ("text/html", "application/xhtml+xml")
+
+T = TypeVar('T')
 
 class WebRAGService:
     """Web Retrieval-Augmented Generation (RAG) service for handling web searches and content summarization."""
@@ -17,32 +47,80 @@ class WebRAGService:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         self._search_registry = SearchRegistry()
-
-    async def perform_web_search(self, user_message: UserMessage, llm: BaseLLM, engine_id: SearchEngineID = SearchEngineID.GOOGLE) -> List[SearchResult]:
+        self._llm_registry = LLMRegistry()
+        self._http_client = HTTPClient()
+        self._page_cache = PageCache()
+        self._extractor = ExtractorRegistry().get_default()
+        self._summary_cache = SummaryCache()
+        self._extractive_summarizer = ExtractiveSummarizer()
+        self._search_gate = SearchGate()
+        self._speculation_policy = SpeculationPolicy()
+        self._semantic_cache = SemanticCache()
+        self._metrics = MetricsRegistry()
+        # Concurrent chats asking the same thing share one upstream search / page download
+        self._search_flight: SingleFlight[List[SearchResult]] = SingleFlight("search")
+        self._fetch_flight: SingleFlight[Optional[str]] = SingleFlight("fetch")
+
+    async def generate_search_query(self, user_message: UserMessage, llm: BaseLLM) -> str:
         """
-        Perform a web search based on the user's message.
+        Generate a single search engine query from the user's message.
 
         Args:
             user_message: The user's message
             llm: The language model instance
-            engine_id: The search engine ID
 
         Returns:
-            List[SearchResult]: A list of search results
+            str: The generated search query
         """
         self.logger.debug("Generating search query from user message")
-        search_query: AssistantMessage = await llm.get_completion(
+        search_query: AssistantMessage = await llm.get_cached_completion(
             system_instruction=GENERATE_SEARCH_QUERY,
             messages=[user_message]
         )
         self.logger.debug(f"Generated search query: {search_query.content}")
-        
-        self.logger.debug(f"Executing search with engine: {engine_id}")
+        return search_query.content
+
+    async def perform_web_search(self, queries: List[str], engine_id: SearchEngineID = SearchEngineID.GOOGLE, num_results: int = 5) -> List[SearchResult]:
+        """
+        Run the search queries concurrently and merge their results.
+
+        Args:
+            queries: Search engine queries, most important first
+            engine_id: The search engine ID
+            num_results: Maximum number of merged results
+
+        Returns:
+            List[SearchResult]: A list of search results
+        """
+        self.logger.debug(f"Executing {len(queries)} search(es) with engine: {engine_id}")
         search_engine = self._search_registry.get_engine(engine_id)
-        return search_engine.search(
-            query=search_query.content,
-            num_results=5
-        )
+
+        def search(query: str) -> Awaitable[List[SearchResult]]:
+            return self._search_flight.do(
+                f"{engine_id.value}:{num_results}:{normalize_query(query)}",
+                lambda: search_engine.asearch(query=query, num_results=num_results),
+            )
+
+        outcomes = await asyncio.gather(*(search(query) for query in queries), return_exceptions=True)
+
+        result_lists: List[List[SearchResult]] = []
+        for query, outcome in zip(queries, outcomes):
+            if isinstance(outcome, BaseException):
+                self.logger.error(f"Search failed for query '{query}': {str(outcome)}")
+            else:
+                result_lists.append(outcome)
+        if not result_lists:
+            raise next(outcome for outcome in outcomes if isinstance(outcome, BaseException))
+
+        # Interleave by rank so every query contributes its top hits, skipping duplicate links
+        merged: List[SearchResult] = []
+        seen_links = set()
+        for rank in range(max(len(results) for results in result_lists)):
+            for results in result_lists:
+                if rank < len(results) and canonicalize_url(results[rank].link) not in seen_links:
+                    seen_links.add(canonicalize_url(results[rank].link))
+                    merged.append(results[rank])
+        return merged[:num_results]
 
     async def retrieve_content(self, url: str) -> Optional[str]:
         """
@@ -54,89 +132,579 @@ class WebRAGService:
         Returns:
             Optional[str]: The retrieved content or None if retrieval fails
         """
+        return await self._fetch_flight.do(canonicalize_url(url), lambda: self._retrieve_content(url))
+
+    async def _retrieve_content(self, url: str) -> Optional[str]:
+        """Retrieve content from a given URL, once for all concurrent callers"""
         self.logger.debug(f"Retrieving content from URL: {url}")
         try:
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-            }
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-
-            self.logger.debug("Parsing and cleaning content")
-            soup = BeautifulSoup(response.content, 'html.parser')
-            for element in soup(['script', 'style', 'nav', 'footer', 'header', 'aside']):
-                element.decompose()
-
-            text = soup.get_text(separator='\n', strip=True)
-            lines = [line.strip() for line in text.splitlines() if line.strip()]
-            content = '\n'.join(lines)
-
-            max_content_length = TRUNCATE_SCRAPED_TEXT * 4
-            if len(content) > max_content_length:
-                self.logger.debug(f"Content truncated from {len(content)} to {max_content_length} characters")
-                content = content[:max_content_length] + "..."
-
+            cached_page, fresh = await self._page_cache.get(url)
+            if cached_page is not None and fresh:
+                self.logger.debug(f"Page cache hit for {url}")
+                return cached_page.content
+
+            # Revalidate a stale page instead of downloading it again
+            headers = cached_page.validation_headers if cached_page is not None else {}
+            async with self._http_client.stream(url, headers=headers) as response:
+                if response.status_code == 304 and cached_page is not None:
+                    self.logger.debug(f"Page not modified, reusing cached content for {url}")
+                    self._page_cache.record_revalidated()
+                    await self._page_cache.set(cached_page.model_copy(update={"fetched_at": time.time()}))
+                    return cached_page.content
+                response.raise_for_status()
+                self._page_cache.record_miss()
+
+                # Skip binaries (PDFs, images, ...) before downloading the body
+                media_type = response.headers.get("Content-Type", "text/html").split(";")[0].strip().lower()
+                if media_type not in HTML_MEDIA_TYPES and media_type != "text/plain":
+                    self.logger.debug(f"Skipping unsupported content type '{media_type}' for {url}")
+                    return None
+
+                body = await self._read_capped(response, settings.EXTRACTION_MAX_BYTES)
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+                encoding = response.encoding or "utf-8"
+                charset = response.charset_encoding
+
+            self.logger.debug(f"Extracting text from {len(body)} bytes")
+            if media_type == "text/plain":
+                content = BaseExtractor.clean_lines(body.decode(encoding, errors="replace"))
+            else:
+                # Parsing is CPU-bound, keep it off the event loop
+                content = await asyncio.to_thread(self._extractor.extract, body, charset)
+            content = self._truncate_content(content)
+
+            await self._page_cache.set(CachedPage(
+                url=url,
+                content=content,
+                etag=etag,
+                last_modified=last_modified,
+            ))
             return content
         except Exception as e:
             self.logger.error(f"Failed to retrieve content from {url}: {str(e)}")
             return None
 
+    async def _read_capped(self, response: httpx.Response, max_bytes: int) -> bytes:
+        """
+        Read a streamed response body, stopping once `max_bytes` have been received.
+
+        Args:
+            response: The streamed response
+            max_bytes: The byte budget
+
+        Returns:
+            bytes: At most `max_bytes` of the body
+        """
+        chunks: List[bytes] = []
+        received = 0
+        async for chunk in response.aiter_bytes():
+            chunks.append(chunk)
+            received += len(chunk)
+            if received >= max_bytes:
+                self.logger.debug(f"Byte budget of {max_bytes} reached, stopping download of {response.url}")
+                break
+        return b"".join(chunks)[:max_bytes]
+
+    def _truncate_content(self, content: str) -> str:
+        """Truncate extracted text to the page text limit"""
+        max_content_length = MAX_PAGE_CHARS
+        if len(content) > max_content_length:
+            self.logger.debug(f"Content truncated from {len(content)} to {max_content_length} characters")
+            content = content[:max_content_length] + "..."
+        return content
+
+    def _summary_character_limit(self, llm: BaseLLM) -> int:
+        """Summary length that lets every result fit the search context budget of the final answer"""
+        budget = plan_context_budget(llm.MODEL_INFO, prompt_tokens=0)
+        per_source_tokens = budget.search_context // max(settings.WEB_RAG_NUM_RESULTS, 1)
+        return max(min(CHARACTER_LIMIT, per_source_tokens * APPROX_CHARS_PER_TOKEN), 100)
+
     async def summarize_content(self, content: str, query: str, llm: BaseLLM) -> str:
         if not content:
             return "No content available for summarization."
 
         system_prompt = SUMMARIZE_WEB_CONTENT.format(
             search_query=query,
-            character_limit=CHARACTER_LIMIT,
+            character_limit=self._summary_character_limit(llm),
+        )
+
+        cache_key = self._summary_cache.make_key(content, query, llm.MODEL_INFO.model_id, SUMMARIZE_WEB_CONTENT_VERSION)
+        cached_summary = self._summary_cache.get(cache_key, prompt_chars=len(system_prompt) + len(content))
+        if cached_summary is not None:
+            return cached_summary
+
+        # Trim the page to what the model's input budget leaves after the prompt
+        counter = get_token_counter(llm.MODEL_INFO.provider)
+        prefix = f"search_query: {query}\nweb_page_content:"
+        budget = plan_context_budget(
+            llm.MODEL_INFO,
+            prompt_tokens=counter.count(system_prompt) + counter.count(prefix) + 2 * MESSAGE_OVERHEAD_TOKENS,
+            with_search=False,
         )
-        
-        user_message = UserMessage(content=f"search_query: {query}\nweb_page_content:{content}")
+        user_message = UserMessage(content=prefix + counter.truncate(content, budget.available))
+
         summary_response: AssistantMessage = await llm.get_completion(
             system_instruction=system_prompt,
             messages=[user_message]
         )
 
+        self._summary_cache.set(cache_key, summary_response.content)
         return summary_response.content
 
-    async def build_search_context(self, search_results: List[SearchResult], search_query: str, llm: BaseLLM) -> List[AISearchResult]:
+    async def summarize_extractive(self, content: str, query: str, llm: BaseLLM) -> str:
+        """
+        Summarize a page locally by extracting its sentences most relevant to the query.
+
+        No LLM call is made; `llm` only sets the summary length for its context budget.
+
+        Args:
+            content: The page content
+            query: The original search query
+            llm: The language model that will read the summary
+
+        Returns:
+            str: The extractive summary, empty if the page has no usable sentences
+        """
+        start = time.perf_counter()
+        # CPU-bound, keep it off the event loop
+        summary = await asyncio.to_thread(
+            self._extractive_summarizer.summarize, content, query, self._summary_character_limit(llm)
+        )
+        self._metrics.set_gauge("web_rag.extractive_summary_ms", (time.perf_counter() - start) * 1000)
+        return summary
+
+    async def summarize_batch(self, contents: List[Optional[str]], query: str, llm: BaseLLM) -> List[Optional[str]]:
+        """
+        Summarize several pages with one LLM call per batch, returning per-source summaries.
+
+        Pages are trimmed so the batch fits the model's context window, and split into several
+        batches only when the combined summaries would not fit its output limit.
+
+        Args:
+            contents: Page contents in rank order, None for pages that could not be retrieved
+            query: The original search query
+            llm: The language model instance
+
+        Returns:
+            List[Optional[str]]: Summaries aligned with `contents`
+        """
+        summaries: List[Optional[str]] = [None] * len(contents)
+        pending: List[int] = []
+        cache_keys = {}
+        for index, content in enumerate(contents):
+            if not content:
+                continue
+            cache_keys[index] = self._summary_cache.make_key(content, query, llm.MODEL_INFO.model_id, SUMMARIZE_WEB_CONTENT_BATCH_VERSION)
+            summaries[index] = self._summary_cache.get(cache_keys[index], prompt_chars=len(content))
+            if summaries[index] is None:
+                pending.append(index)
+        if not pending:
+            return summaries
+
+        character_limit = self._summary_character_limit(llm)
+        system_prompt = SUMMARIZE_WEB_CONTENT_BATCH.format(
+            search_query=query,
+            character_limit=character_limit,
+        )
+        model_info = llm.MODEL_INFO
+        counter = get_token_counter(model_info.provider)
+        # Output budget: every summary in a batch (with JSON overhead) has to fit in max_output_tokens
+        summary_tokens = character_limit // APPROX_CHARS_PER_TOKEN
+        batch_size = max(1, model_info.max_output_tokens // (summary_tokens * 2))
+        batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+        prompt_tokens = counter.count(system_prompt) + counter.count(query) + 2 * MESSAGE_OVERHEAD_TOKENS
+
+        async def run_batch(batch: List[int]) -> None:
+            # Input budget: what is left after output and prompt, shared evenly by the sources. Not capped,
+            # a batch packs pages that one call per page would each send in full.
+            budget = plan_context_budget(model_info, prompt_tokens=prompt_tokens, with_search=False, capped=False)
+            per_source_tokens = budget.available // len(batch) - MESSAGE_OVERHEAD_TOKENS
+            sources = "\n\n".join(
+                f"[Source {number}]\n{counter.truncate(contents[index], per_source_tokens)}"
+                for number, index in enumerate(batch, 1)
+            )
+            response = await llm.get_completion(
+                system_instruction=system_prompt,
+                messages=[UserMessage(content=f"search_query: {query}\n\n{sources}")],
+                json_mode=True
+            )
+            batch_summaries = BatchSummaries.model_validate_json(strip_code_fences(response.content))
+            for item in batch_summaries.summaries:
+                if 1 <= item.source <= len(batch) and item.summary:
+                    index = batch[item.source - 1]
+                    summaries[index] = item.summary
+                    self._summary_cache.set(cache_keys[index], item.summary)
+
+        await asyncio.gather(*(run_batch(batch) for batch in batches))
+        return summaries
+
+    async def build_search_context(
+        self,
+        search_results: List[SearchResult],
+        search_query: str,
+        llm: BaseLLM,
+        mode: Optional[SummarizationMode] = None,
+    ) -> Tuple[List[AISearchResult], List[DroppedSource]]:
         """
         Build a search context by retrieving and summarizing content from search results.
 
+        Sources are assembled as they complete. Once WEB_RAG_MIN_GOOD_SOURCES of them are good
+        or WEB_RAG_CONTEXT_BUDGET has passed, the stragglers are cancelled and the context
+        is built from what finished, so one slow site doesn't hold up the answer.
+
         Args:
             search_results: List of search results from `perform_web_search()`
             search_query: The original search query (not the generated one)
             llm: The language model instance
+            mode: How pages are summarized, the model's default when None
 
         Returns:
-            List[AISearchResult]: A list of AI-enhanced search results with summaries
+            Tuple of the AI-enhanced search results with summaries, in rank order, and the dropped sources
         """
-        ai_search_results: List[AISearchResult] = []
+        start = time.perf_counter()
+        deadline = start + settings.WEB_RAG_CONTEXT_BUDGET if settings.WEB_RAG_CONTEXT_BUDGET > 0 else None
+        fetch_semaphore = asyncio.Semaphore(settings.WEB_RAG_MAX_CONCURRENCY)
+        summarize_semaphore = asyncio.Semaphore(settings.WEB_RAG_MAX_CONCURRENCY)
 
-        for result in search_results:
+        async def fetch(result: SearchResult) -> Optional[str]:
             # Retrieve content from the link
-            self.logger.info(f"Retrieving content from: {result.link}")
-            content = await self.retrieve_content(result.link)
+            async with fetch_semaphore:
+                self.logger.info(f"Retrieving content from: {result.link}")
+                return await self._run_stage(
+                    stage="fetch",
+                    link=result.link,
+                    coro=self.retrieve_content(result.link),
+                    timeout=settings.WEB_RAG_FETCH_TIMEOUT,
+                )
+
+        async def summarize(result: SearchResult, content: Optional[str]) -> Optional[str]:
+            # get summary of the content if available
+            if not content:
+                return None
+            async with summarize_semaphore:
+                self.logger.info(f"Summarizing content for: {result.link}")
+                if mode == SummarizationMode.EXTRACTIVE:
+                    coro = self.summarize_extractive(content, search_query, llm)
+                else:
+                    coro = self.summarize_content(content, search_query, llm)
+                return await self._run_stage(
+                    stage="summarize",
+                    link=result.link,
+                    coro=coro,
+                    timeout=settings.WEB_RAG_SUMMARIZE_TIMEOUT,
+                )
+
+        async def fetch_and_summarize(result: SearchResult) -> Tuple[Optional[str], Optional[DropReason]]:
+            content = await fetch(result)
+            if not content:
+                return None, DropReason.FETCH_FAILED
+            summary = await summarize(result, content)
+            return summary, None if summary else DropReason.SUMMARIZE_FAILED
+
+        async def fetch_only(result: SearchResult) -> Tuple[Optional[str], Optional[DropReason]]:
+            content = await fetch(result)
+            return content, None if content else DropReason.FETCH_FAILED
+
+        async def summarize_only(result: SearchResult, content: str) -> Tuple[Optional[str], Optional[DropReason]]:
+            summary = await summarize(result, content)
+            return summary, None if summary else DropReason.SUMMARIZE_FAILED
+
+        def is_good_summary(summary: str) -> bool:
+            return len(summary.strip()) >= settings.WEB_RAG_MIN_SUMMARY_CHARS
+
+        mode = mode or self._llm_registry.get_summarization_mode(llm.MODEL_INFO.model_id)
+        if mode == SummarizationMode.EXTRACTIVE and not self._extractive_summarizer.enabled:
+            mode = SummarizationMode.PER_PAGE
+        if mode == SummarizationMode.BATCHED:
+            # The cutoff applies to fetching, every fetched page goes into the one summary call
+            contents, reasons = await self._gather_as_completed(
+                [fetch_only(result) for result in search_results], is_good=bool, deadline=deadline
+            )
+            self.logger.info(f"Summarizing {sum(1 for c in contents if c)} pages in batched mode")
+            summaries = await self._run_stage(
+                stage="summarize_batch",
+                link=f"{len(search_results)} results",
+                coro=self.summarize_batch(contents, search_query, llm),
+                timeout=settings.WEB_RAG_SUMMARIZE_TIMEOUT,
+            )
+            if summaries is None:
+                self.logger.info("Falling back to per-page summaries")
+                # Pages dropped at the fetch stage keep their reason
+                fetched = [index for index, content in enumerate(contents) if content]
+                fetched_summaries, fallback_reasons = await self._gather_as_completed(
+                    [summarize_only(search_results[index], contents[index]) for index in fetched],
+                    is_good=is_good_summary,
+                    deadline=deadline,
+                )
+                summaries = [None] * len(contents)
+                for position, index in enumerate(fetched):
+                    summaries[index] = fetched_summaries[position]
+                    if position in fallback_reasons:
+                        reasons[index] = fallback_reasons[position]
+            for index, (content, summary) in enumerate(zip(contents, summaries)):
+                if content and not summary and index not in reasons:
+                    reasons[index] = DropReason.SUMMARIZE_FAILED
+        else:
+            summaries, reasons = await self._gather_as_completed(
+                [fetch_and_summarize(result) for result in search_results], is_good=is_good_summary, deadline=deadline
+            )
 
-            # create ai_search_result object
-            ai_search_result = AISearchResult(
+        # Results stay in the original rank order
+        ai_search_results: List[AISearchResult] = []
+        dropped: List[DroppedSource] = []
+        for index, (result, summary) in enumerate(zip(search_results, summaries)):
+            if index in reasons:
+                dropped.append(DroppedSource(title=result.title, link=result.link, snippet=result.snippet, reason=reasons[index]))
+                self._metrics.incr(f"web_rag.dropped.{reasons[index].value}")
+                continue
+            ai_search_results.append(AISearchResult(
                 title=result.title,
                 link=result.link,
                 snippet=result.snippet,
-                summary="",         # placeholder for now
-            )
+                summary=summary or "",
+            ))
+        if dropped:
+            self.logger.info(f"Dropped {len(dropped)} of {len(search_results)} sources: {[source.reason.value for source in dropped]}")
+        self._metrics.set_gauge("web_rag.context_ms", (time.perf_counter() - start) * 1000)
+        return ai_search_results, dropped
+
+    async def _gather_as_completed(
+        self,
+        calls: List[Awaitable[Tuple[Optional[str], Optional[DropReason]]]],
+        is_good: Callable[[str], bool],
+        deadline: Optional[float],
+    ) -> Tuple[List[Optional[str]], Dict[int, DropReason]]:
+        """
+        Run per-source calls concurrently and stop early once enough of them are good.
 
-            # get summary of the content if available
-            if content:
-                self.logger.info(f"Summarizing content for: {result.link}")
-                summary = await self.summarize_content(content, search_query, llm)
-                ai_search_result.summary = summary
+        Args:
+            calls: One call per source, returning its text or the reason it has none
+            is_good: Whether a source's text counts towards WEB_RAG_MIN_GOOD_SOURCES
+            deadline: `time.perf_counter()` value at which the stragglers are cancelled, None to wait
+
+        Returns:
+            Tuple of the texts aligned with `calls` and the drop reason of each source without one
+        """
+        tasks = {asyncio.ensure_future(call): index for index, call in enumerate(calls)}
+        texts: List[Optional[str]] = [None] * len(calls)
+        reasons: Dict[int, DropReason] = {}
+        min_good = settings.WEB_RAG_MIN_GOOD_SOURCES or len(calls)
+        good = 0
+        pending = set(tasks)
+        try:
+            while pending and good < min_good:
+                timeout = max(deadline - time.perf_counter(), 0.0) if deadline is not None else None
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    break
+                for task in done:
+                    index = tasks[task]
+                    texts[index], reason = task.result()
+                    if reason is not None:
+                        reasons[index] = reason
+                    elif is_good(texts[index]):
+                        good += 1
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                # Let the cancelled stages release their connections and semaphores before moving on
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        reason = DropReason.ENOUGH_SOURCES if good >= min_good else DropReason.LATENCY_BUDGET
+        for task in pending:
+            reasons[tasks[task]] = reason
+        if pending:
+            self.logger.info(f"Cancelled {len(pending)} straggling sources ({reason.value})")
+        return texts, reasons
+
+    async def _run_stage(self, stage: str, link: str, coro: Awaitable[T], timeout: float) -> Optional[T]:
+        """
+        Run a single pipeline stage for one search result under a deadline.
+
+        Args:
+            stage: Name of the stage, used for logging
+            link: URL of the search result being processed
+            coro: The stage coroutine
+            timeout: Deadline for the stage in seconds
 
-            # add the ai_search_result to the list
-            ai_search_results.append(ai_search_result)
+        Returns:
+            Optional[T]: The stage result or None if it timed out or failed
+        """
+        try:
+            return await asyncio.wait_for(coro, timeout=timeout)
+        except asyncio.TimeoutError:
+            self.logger.warning(f"Stage '{stage}' timed out after {timeout}s for {link}")
+        except Exception as e:
+            self.logger.error(f"Stage '{stage}' failed for {link}: {str(e)}")
+        return None
+
+    async def should_use_web_search(self, user_message: UserMessage, llm: BaseLLM) -> bool:
+        """
+        Ask the LLM if the user's message needs a web search.
 
-        return ai_search_results
+        Args:
+            user_message: The user's message
+            llm: The language model instance
 
-    async def execute_web_rag(self, user_message: UserMessage, llm: BaseLLM, engine_id: SearchEngineID = SearchEngineID.GOOGLE):
+        Returns:
+            bool: True if a web search should be performed
+        """
+        should_use_web_search = await llm.get_cached_completion(
+            system_instruction=SHOULD_USE_WEB_SEARCH,
+            messages=[user_message]
+        )
+        return should_use_web_search.content.strip().lower() == "true"
+
+    async def plan_web_search(
+        self,
+        user_message: UserMessage,
+        llm: BaseLLM,
+        engine_id: Optional[SearchEngineID] = None,
+        chat_id: Optional[str] = None,
+    ) -> Tuple[SearchPlan, Optional[List[SearchResult]]]:
+        """
+        Decide if the user's message needs a web search and generate the search queries.
+
+        The local search gate answers confidently for most messages. Otherwise, in
+        "structured" planning mode a single JSON call returns both the decision and the
+        queries; "sequential" mode (and unparseable structured output) asks the gate and
+        the query writer in two calls, speculatively in parallel when the policy allows it.
+
+        Args:
+            user_message: The user's message
+            llm: The language model instance
+            engine_id: The search engine ID, enables the speculative search
+            chat_id: ID of the chat, used by the speculation policy
+
+        Returns:
+            Tuple of the search plan and the speculative search results (None if not searched yet)
+        """
+        local_decision: Optional[bool] = None
+        if settings.SEARCH_GATE_ENABLED:
+            decision = self._search_gate.classify(user_message.content)
+            self.logger.debug(f"Search gate: needs_search={decision.needs_search} ({decision.reason}, score={decision.score:.2f})")
+            if decision.needs_search is False:
+                return SearchPlan(needs_search=False), None
+            local_decision = decision.needs_search
+
+        model_id = llm.MODEL_INFO.model_id
+        plan: Optional[SearchPlan] = None
+        search_results: Optional[List[SearchResult]] = None
+        if settings.WEB_RAG_PLANNING_MODE == "structured":
+            plan = await self._plan_structured(user_message, llm)
+            if plan is not None and local_decision is None:
+                self._speculation_policy.record(model_id, chat_id, plan.needs_search)
+        if plan is None:
+            needs_search = local_decision
+            queries: List[str] = []
+            if needs_search is None and self._speculation_policy.should_speculate(model_id, chat_id):
+                needs_search, queries, search_results = await self._gate_speculatively(user_message, llm, engine_id)
+            elif needs_search is None:
+                needs_search = await self.should_use_web_search(user_message, llm)
+            if local_decision is None:
+                self._speculation_policy.record(model_id, chat_id, needs_search)
+            if needs_search and not queries:
+                queries = [await self.generate_search_query(user_message, llm)]
+            plan = SearchPlan(needs_search=needs_search, queries=queries)
+
+        # A confident local gate wins over the LLM
+        if local_decision:
+            plan.needs_search = True
+        if plan.needs_search and not plan.queries:
+            plan.queries = [user_message.content]
+        plan.queries = plan.queries[:settings.WEB_RAG_MAX_SEARCH_QUERIES]
+        return plan, search_results
+
+    async def _gate_speculatively(
+        self,
+        user_message: UserMessage,
+        llm: BaseLLM,
+        engine_id: Optional[SearchEngineID],
+    ) -> Tuple[bool, List[str], Optional[List[SearchResult]]]:
+        """
+        Ask the LLM gate while the search query (and, if enabled, the search) already run.
+
+        The speculative work is cancelled when the gate says no. Metrics record the latency
+        saved when it is used (the part of it done while the gate was deciding) and the
+        calls wasted when it is not.
+
+        Returns:
+            Tuple of the gate decision, the generated queries and the speculative search results
+        """
+        start = time.perf_counter()
+        calls = 0
+        finished_at: Optional[float] = None
+
+        async def run_ahead() -> Tuple[str, Optional[List[SearchResult]]]:
+            nonlocal calls, finished_at
+            calls += 1
+            query = await self.generate_search_query(user_message, llm)
+            results: Optional[List[SearchResult]] = None
+            if engine_id is not None and settings.WEB_RAG_SPECULATIVE_SEARCH:
+                calls += 1
+                try:
+                    results = await self.perform_web_search([query], engine_id=engine_id, num_results=settings.WEB_RAG_NUM_RESULTS)
+                except Exception as e:
+                    # Leave the search to the regular path, which handles engine failures
+                    self.logger.warning(f"Speculative search failed: {str(e)}")
+            finished_at = time.perf_counter()
+            return query, results
+
+        self._metrics.incr("speculation.started")
+        task = asyncio.ensure_future(run_ahead())
+        try:
+            needs_search = await self.should_use_web_search(user_message, llm)
+        except BaseException:
+            self._discard(task, calls)
+            raise
+        gate_done_at = time.perf_counter()
+
+        if not needs_search:
+            self.logger.debug("Gate said no, discarding speculative query")
+            self._discard(task, calls)
+            return False, [], None
+
+        query, results = await task
+        saved_ms = (min(gate_done_at, finished_at) - start) * 1000
+        self._metrics.incr("speculation.used")
+        self._metrics.incr("speculation.saved_ms", saved_ms)
+        self.logger.debug(f"Speculative planning saved {saved_ms:.0f} ms")
+        return True, [query], results
+
+    def _discard(self, task: asyncio.Task, calls: int) -> None:
+        """Cancel unused speculative work and count the upstream calls it started"""
+        task.cancel()
+        if task.done() and not task.cancelled():
+            # Mark a failure as retrieved, nobody awaits this task anymore
+            task.exception()
+        self._metrics.incr("speculation.discarded")
+        self._metrics.incr("speculation.wasted_calls", calls)
+
+    async def _plan_structured(self, user_message: UserMessage, llm: BaseLLM) -> Optional[SearchPlan]:
+        """Run the single structured planning call, None if its output cannot be parsed"""
+        response = await llm.get_cached_completion(
+            system_instruction=PLAN_WEB_SEARCH.format(max_queries=settings.WEB_RAG_MAX_SEARCH_QUERIES),
+            messages=[user_message],
+            json_mode=True
+        )
+        try:
+            plan = SearchPlan.model_validate_json(strip_code_fences(response.content))
+            self.logger.debug(f"Search plan: {plan}")
+            return plan
+        except ValidationError as e:
+            self.logger.warning(f"Invalid search plan, falling back to sequential planning: {str(e)}")
+            return None
+
+    async def execute_web_rag(
+        self,
+        user_message: UserMessage,
+        llm: BaseLLM,
+        engine_id: SearchEngineID = SearchEngineID.GOOGLE,
+        chat_id: Optional[str] = None,
+        summarization_mode: Optional[SummarizationMode] = None,
+    ):
         """
         Execute the Web Retrieval-Augmented Generation (RAG) process.
 
@@ -144,11 +712,23 @@ class WebRAGService:
             user_message: The user's message
             llm: The language model instance
             engine_id: The search engine ID
+            chat_id: ID of the chat, used by the speculation policy
+            summarization_mode: How pages are summarized, the model's default when None
 
         Returns:
             WebRAGResponse: The response containing search results and formatted results
         """
         self.logger.debug("Starting Web RAG execution")
+        summarization_mode = summarization_mode or self._llm_registry.get_summarization_mode(llm.MODEL_INFO.model_id)
+        # Summaries of another model or mode are not interchangeable
+        summarizer = f"{llm.MODEL_INFO.model_id.value}/{summarization_mode.value}"
+        cached_response = self._semantic_cache.lookup(user_message.content, engine_id, summarizer)
+        if cached_response is not None:
+            # Estimate the time saved from the latest full pipeline run
+            self._metrics.incr("semantic_cache.saved_ms", self._metrics.get("web_rag.pipeline_ms"))
+            return cached_response
+
+        start = time.perf_counter()
         rag_response = WebRAGResponse(
             search_performed=False,
             search_query=user_message.content,
@@ -158,25 +738,30 @@ class WebRAGService:
             engine_id=engine_id
         )
 
-        self.logger.debug("Checking if web search is needed")
-        should_use_web_search = await llm.get_completion(
-            system_instruction=SHOULD_USE_WEB_SEARCH,
-            messages=[user_message]
-        )
-
-        if should_use_web_search.content == "true":
-            self.logger.debug("Web search needed, performing search")
-            search_results = await self.perform_web_search(
-                user_message=user_message,
-                llm=llm,
-                engine_id=engine_id
-            )
+        self.logger.debug("Planning web search")
+        plan, search_results = await self.plan_web_search(user_message, llm, engine_id=engine_id, chat_id=chat_id)
+
+        if plan.needs_search:
+            self.logger.debug(f"Web search needed, performing search for {plan.queries}")
+            try:
+                if search_results is None:
+                    search_results = await self.perform_web_search(
+                        queries=plan.queries,
+                        engine_id=engine_id,
+                        num_results=settings.WEB_RAG_NUM_RESULTS
+                    )
+            except CircuitOpenError as e:
+                # No engine is reachable: answer without search context rather than fail the chat
+                self.logger.warning(f"Skipping web search: {str(e)}")
+                return rag_response
+            rag_response.generated_queries = plan.queries
 
             self.logger.debug("Building search context")
-            ai_search_results = await self.build_search_context(
+            ai_search_results, dropped_sources = await self.build_search_context(
                 search_results=search_results,
                 search_query=user_message.content,
-                llm=llm
+                llm=llm,
+                mode=summarization_mode
             )
 
             self.logger.debug("Formatting search results")
@@ -187,9 +772,18 @@ class WebRAGService:
                 formatted_results += f"Summary: {result.summary}\n\n"
 
             rag_response.search_performed = True
-            rag_response.search_results = search_results
+            # Only the sources in the context, so their numbers match the [Source N] citations
+            rag_response.search_results = [
+                SearchResult(title=result.title, link=result.link, snippet=result.snippet)
+                for result in ai_search_results
+            ]
+            rag_response.dropped_sources = dropped_sources
             rag_response.formatted_results = formatted_results
             rag_response.total_results = len(search_results)
+            self._metrics.set_gauge("web_rag.pipeline_ms", (time.perf_counter() - start) * 1000)
+            # A context cut short by the latency budget is not worth reusing for similar questions
+            if not any(source.reason == DropReason.LATENCY_BUDGET for source in dropped_sources):
+                self._semantic_cache.store(user_message.content, rag_response, summarizer)
         else:
             self.logger.debug("Web search not needed")
 
@@ -0,0 +1,89 @@
+import asyncio
+import importlib.util
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+from src.config.settings import settings
+from src.utils.decorators import singleton
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+
+@singleton
+class HTTPClient:
+    """Shared async HTTP client with connection pooling, keep-alive and per-host limits.
+
+    One instance lives for the whole app lifetime; it is closed from the FastAPI lifespan.
+    """
+
+    def __init__(self):
+        if not hasattr(self, '_initialized'):
+            self.logger = logging.getLogger(__name__)
+            self._client: Optional[httpx.AsyncClient] = None
+            # Only hosts with requests in flight or queued: semaphore and number of its users
+            self._host_slots: Dict[str, Tuple[asyncio.Semaphore, int]] = {}
+            # HTTP/2 needs the optional `h2` package, fall back to HTTP/1.1 without it
+            self.http2 = settings.HTTP_ENABLE_HTTP2 and importlib.util.find_spec("h2") is not None
+            self._initialized = True
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Lazily build the underlying pooled client"""
+        if self._client is None or self._client.is_closed:
+            self.logger.debug(f"Creating pooled HTTP client (http2={self.http2})")
+            self._client = httpx.AsyncClient(
+                http2=self.http2,
+                headers=DEFAULT_HEADERS,
+                follow_redirects=True,
+                timeout=httpx.Timeout(settings.HTTP_TIMEOUT, connect=settings.HTTP_CONNECT_TIMEOUT),
+                limits=httpx.Limits(
+                    max_connections=settings.HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+                ),
+            )
+        return self._client
+
+    @asynccontextmanager
+    async def _host_slot(self, url: str) -> AsyncIterator[None]:
+        """
+        Hold one of the URL host's HTTP_MAX_CONNECTIONS_PER_HOST slots.
+
+        A host's semaphore is dropped once its last user leaves, so the map only grows with
+        the hosts in use, not with every host ever fetched.
+        """
+        host = urlsplit(url).netloc.lower()
+        semaphore, users = self._host_slots.get(host) or (asyncio.Semaphore(settings.HTTP_MAX_CONNECTIONS_PER_HOST), 0)
+        self._host_slots[host] = (semaphore, users + 1)
+        try:
+            async with semaphore:
+                yield
+        finally:
+            semaphore, users = self._host_slots[host]
+            if users == 1:
+                del self._host_slots[host]
+            else:
+                self._host_slots[host] = (semaphore, users - 1)
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        """Send a GET request through the shared pool, respecting the per-host limit"""
+        async with self._host_slot(url):
+            return await self.client.get(url, **kwargs)
+
+    @asynccontextmanager
+    async def stream(self, url: str, **kwargs) -> AsyncIterator[httpx.Response]:
+        """Stream a GET response through the shared pool, holding a per-host slot until the body is consumed"""
+        async with self._host_slot(url):
+            async with self.client.stream("GET", url, **kwargs) as response:
+                yield response
+
+    async def aclose(self) -> None:
+        """Close the pooled client and release its connections"""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
@@ -0,0 +1,36 @@
+import threading
+from collections import defaultdict
+from typing import Dict
+from src.utils.decorators import singleton
+
+@singleton
+class MetricsRegistry:
+    """In-process registry of counters and gauges, exported on the /metrics endpoint"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = defaultdict(float)
+        self._gauges: Dict[str, float] = {}
+
+    def incr(self, name: str, value: float = 1) -> None:
+        """Increment a counter"""
+        with self._lock:
+            self._counters[name] += value
+
+    def set_gauge(self, name: str, value: float) -> None:
+        """Set a gauge to the given value"""
+        with self._lock:
+            self._gauges[name] = value
+
+    def get(self, name: str) -> float:
+        """Get the current value of a counter or gauge"""
+        with self._lock:
+            return self._counters.get(name, self._gauges.get(name, 0))
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Get a copy of all counters and gauges"""
+        with self._lock:
+            return {
+                "counters": dict(sorted(self._counters.items())),
+                "gauges": dict(sorted(self._gauges.items())),
+            }
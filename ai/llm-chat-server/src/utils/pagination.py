@@ -0,0 +1,22 @@
+import base64
+import json
+from typing import List
+
+def encode_cursor(*values: object) -> str:
+    """Encode the sort key of the last item on a page as an opaque, URL-safe cursor"""
+    return base64.urlsafe_b64encode(json.dumps(values, separators=(",", ":")).encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, size: int) -> List[object]:
+    """
+    Decode a cursor built by `encode_cursor`.
+
+    Raises:
+        ValueError: If the cursor is malformed or does not hold `size` values
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return values
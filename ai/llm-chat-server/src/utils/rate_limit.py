@@ -0,0 +1,207 @@
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from functools import lru_cache
+from typing import AsyncIterator, Iterator, Optional
+from src.config.settings import settings
+from src.exceptions.rate_limit import RateLimitExceededError
+from src.utils.metrics import MetricsRegistry
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at `rate_per_minute`.
+
+    Callers reserve capacity up front and the balance may go negative: each reservation
+    returns how long to wait until its share is refilled, so requests are served in
+    arrival order (a fair FIFO queue) without keeping a list of waiters. Reservations are
+    charged in full; by default the bucket holds one minute of budget.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else max(rate_per_minute, 1.0)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def reserve(self, amount: float, max_wait: float = float("inf")) -> Optional[float]:
+        """
+        Reserve `amount` tokens.
+
+        Returns:
+            Optional[float]: Seconds to wait before using the reservation, None if that would exceed `max_wait`
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            wait = max(amount - self._tokens, 0.0) / self.rate
+            if wait > max_wait:
+                return None
+            self._tokens -= amount
+            return wait
+
+    def refund(self, amount: float) -> None:
+        """Give back tokens of a reservation that was not used"""
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+    def consume(self, amount: float) -> None:
+        """Charge tokens after the fact, delaying later reservations"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= amount
+
+class ProviderGovernor:
+    """
+    Admission control for one provider: requests-per-minute and tokens-per-minute buckets
+    in front of a bounded concurrency limit.
+
+    Excess load queues in arrival order instead of failing. A request whose queue wait
+    would exceed RATE_LIMIT_MAX_QUEUE_WAIT is rejected right away with RateLimitExceededError.
+    `acquire` is used from the event loop, also in front of blocking clients dispatched to
+    worker threads, so queued calls don't hold a thread; `acquire_sync` is for code that
+    already runs in a worker thread.
+    """
+
+    def __init__(self, name: str, requests_per_minute: int, tokens_per_minute: int, max_concurrency: int):
+        self.name = name
+        self._metrics = MetricsRegistry()
+        # Request bursts of one second of quota: providers enforce limits over windows shorter than a minute.
+        # Tokens get the whole minute, a single large prompt may need much more than a second's share.
+        request_burst = max(requests_per_minute / 60.0, 1.0)
+        self._requests = TokenBucket(requests_per_minute, capacity=request_burst) if requests_per_minute > 0 else None
+        self._tokens = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self._max_concurrency = max_concurrency
+        self._async_slots: Optional[asyncio.Semaphore] = None
+        self._thread_slots = threading.BoundedSemaphore(max_concurrency) if max_concurrency > 0 else None
+        self._waiting = 0
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: int) -> float:
+        """Reserve one request and `tokens` tokens, returning the rate limit wait in seconds"""
+        if self._tokens is not None and tokens > self._tokens.capacity:
+            # Would never fit the per-minute budget, retrying cannot help
+            self._metrics.incr(f"governor.{self.name}.rejected")
+            raise RateLimitExceededError(
+                f"{self.name} request of {tokens} tokens exceeds the budget of {self._tokens.capacity:.0f} tokens per minute",
+                retry_after=0.0,
+            )
+        max_wait = settings.RATE_LIMIT_MAX_QUEUE_WAIT
+        request_wait = self._requests.reserve(1, max_wait) if self._requests is not None else 0.0
+        if request_wait is None:
+            self._reject()
+        token_wait = self._tokens.reserve(tokens, max_wait) if self._tokens is not None and tokens > 0 else 0.0
+        if token_wait is None:
+            if self._requests is not None:
+                self._requests.refund(1)
+            self._reject()
+        return max(request_wait, token_wait)
+
+    def _refund(self, tokens: int) -> None:
+        """Give back a reservation that was never used: the caller was cancelled or timed out"""
+        if self._requests is not None:
+            self._requests.refund(1)
+        if self._tokens is not None and tokens > 0:
+            self._tokens.refund(tokens)
+
+    def _reject(self) -> None:
+        self._metrics.incr(f"governor.{self.name}.rejected")
+        raise RateLimitExceededError(
+            f"{self.name} is over its rate limit, retry later",
+            retry_after=settings.RATE_LIMIT_MAX_QUEUE_WAIT,
+        )
+
+    def _enter_queue(self) -> float:
+        with self._lock:
+            self._waiting += 1
+            self._metrics.set_gauge(f"governor.{self.name}.queue_depth", self._waiting)
+        return time.perf_counter()
+
+    def _leave_queue(self, queued_at: float) -> None:
+        wait_ms = (time.perf_counter() - queued_at) * 1000
+        with self._lock:
+            self._waiting -= 1
+            self._metrics.set_gauge(f"governor.{self.name}.queue_depth", self._waiting)
+        self._metrics.incr(f"governor.{self.name}.wait_ms_total", wait_ms)
+        self._metrics.set_gauge(f"governor.{self.name}.wait_ms", wait_ms)
+
+    @asynccontextmanager
+    async def acquire(self, tokens: int = 0) -> AsyncIterator[None]:
+        """Wait for rate limit budget and a concurrency slot, from the event loop"""
+        if self._async_slots is None and self._max_concurrency > 0:
+            self._async_slots = asyncio.Semaphore(self._max_concurrency)
+
+        queued_at = self._enter_queue()
+        try:
+            wait = self._reserve(tokens)
+            try:
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                if self._async_slots is not None:
+                    remaining = max(settings.RATE_LIMIT_MAX_QUEUE_WAIT - (time.perf_counter() - queued_at), 0.0)
+                    try:
+                        await asyncio.wait_for(self._async_slots.acquire(), timeout=remaining)
+                    except asyncio.TimeoutError:
+                        self._reject()
+            except BaseException:
+                # Cancelled while queued (e.g. a hedge loser) or rejected: the budget was never spent
+                self._refund(tokens)
+                raise
+        finally:
+            self._leave_queue(queued_at)
+        self._metrics.incr(f"governor.{self.name}.admitted")
+
+        try:
+            yield
+        finally:
+            if self._async_slots is not None:
+                self._async_slots.release()
+
+    @contextmanager
+    def acquire_sync(self, tokens: int = 0) -> Iterator[None]:
+        """Wait for rate limit budget and a concurrency slot, blocking the calling thread"""
+        queued_at = self._enter_queue()
+        try:
+            wait = self._reserve(tokens)
+            if wait > 0:
+                time.sleep(wait)
+            if self._thread_slots is not None:
+                remaining = max(settings.RATE_LIMIT_MAX_QUEUE_WAIT - (time.perf_counter() - queued_at), 0.0)
+                if not self._thread_slots.acquire(timeout=remaining):
+                    self._refund(tokens)
+                    self._reject()
+        finally:
+            self._leave_queue(queued_at)
+        self._metrics.incr(f"governor.{self.name}.admitted")
+
+        try:
+            yield
+        finally:
+            if self._thread_slots is not None:
+                self._thread_slots.release()
+
+    def consume_tokens(self, tokens: int) -> None:
+        """Charge tokens only known after the call, e.g. the generated output"""
+        if self._tokens is not None and tokens > 0:
+            self._tokens.consume(tokens)
+
+@lru_cache(maxsize=None)
+def get_governor(name: str) -> ProviderGovernor:
+    """
+    Get the (shared) governor of a provider, configured from settings.
+
+    Args:
+        name: "azure", "openai" or "google" for LLM providers, "<engine_id>_search" for search engines
+    """
+    limits = {
+        "azure": (settings.AZURE_RATE_LIMIT_RPM, settings.AZURE_RATE_LIMIT_TPM, settings.AZURE_MAX_CONCURRENCY),
+        "openai": (settings.OPENAI_RATE_LIMIT_RPM, settings.OPENAI_RATE_LIMIT_TPM, settings.OPENAI_MAX_CONCURRENCY),
+        "google": (settings.GOOGLE_RATE_LIMIT_RPM, settings.GOOGLE_RATE_LIMIT_TPM, settings.GOOGLE_MAX_CONCURRENCY),
+        "google_search": (settings.GOOGLE_CSE_RATE_LIMIT_RPM, 0, settings.GOOGLE_CSE_MAX_CONCURRENCY),
+    }
+    requests_per_minute, tokens_per_minute, max_concurrency = limits.get(name, (0, 0, 0))
+    return ProviderGovernor(name, requests_per_minute, tokens_per_minute, max_concurrency)
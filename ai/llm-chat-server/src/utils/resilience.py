@@ -0,0 +1,221 @@
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+from src.config.settings import settings
+from src.exceptions.rate_limit import RateLimitExceededError
+from src.exceptions.resilience import CircuitOpenError
+from src.utils.metrics import MetricsRegistry
+
+T = TypeVar("T")
+
+def _error_chain(exc: BaseException):
+    """The exception and its causes: provider wrappers keep the SDK error as __cause__"""
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        yield exc
+        exc = exc.__cause__ or exc.__context__
+
+def status_code(exc: BaseException) -> Optional[int]:
+    """HTTP status behind an error, read from openai, google-genai, httpx and requests errors alike"""
+    for error in _error_chain(exc):
+        for candidate in (getattr(error, "status_code", None), getattr(error, "code", None),
+                          getattr(getattr(error, "response", None), "status_code", None)):
+            if isinstance(candidate, int) and 100 <= candidate < 600:
+                return candidate
+    return None
+
+def retry_after(exc: BaseException) -> Optional[float]:
+    """Seconds from the Retry-After header behind an error, if any"""
+    for error in _error_chain(exc):
+        headers = getattr(getattr(error, "response", None), "headers", None)
+        value = headers.get("retry-after") if headers is not None else None
+        if value is None:
+            continue
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            try:
+                return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+            except (TypeError, ValueError):
+                return None
+    return None
+
+def is_transient(exc: BaseException) -> bool:
+    """Whether retrying may succeed: timeouts, connection errors, 408, 429 and 5xx"""
+    if isinstance(exc, (RateLimitExceededError, CircuitOpenError)):
+        return False
+    status = status_code(exc)
+    if status is not None:
+        return status in (408, 429) or status >= 500
+    for error in _error_chain(exc):
+        # SDK-agnostic: openai APITimeoutError/APIConnectionError, httpx and requests errors
+        name = type(error).__name__
+        if isinstance(error, (TimeoutError, ConnectionError)) or "Timeout" in name or "Connect" in name:
+            return True
+    return False
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker of one provider.
+
+    Closed: calls pass, CIRCUIT_BREAKER_FAILURE_THRESHOLD transient failures in a row open it.
+    Open: calls fail fast with CircuitOpenError for CIRCUIT_BREAKER_RESET_TIMEOUT seconds.
+    Half-open: a single trial call is let through; its outcome closes or reopens the breaker.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str):
+        self.name = name
+        self._metrics = MetricsRegistry()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and self._reset_due():
+                return self.HALF_OPEN
+            return self._state
+
+    @property
+    def is_open(self) -> bool:
+        """Whether calls would currently be rejected"""
+        return self.state == self.OPEN
+
+    def _reset_due(self) -> bool:
+        # While half-open, _opened_at is when the trial call started
+        return time.monotonic() - self._opened_at >= settings.CIRCUIT_BREAKER_RESET_TIMEOUT
+
+    def before_call(self) -> None:
+        """Let a call through or raise CircuitOpenError"""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+            # The caller becomes the half-open trial, others keep failing fast until it reports.
+            # A trial that never reports (cancelled) is replaced after another reset timeout.
+            if self._reset_due():
+                self._state = self.HALF_OPEN
+                self._opened_at = time.monotonic()
+                return
+            retry_in = max(settings.CIRCUIT_BREAKER_RESET_TIMEOUT - (time.monotonic() - self._opened_at), 0.0)
+        self._metrics.incr(f"circuit_breaker.{self.name}.rejected")
+        raise CircuitOpenError(f"{self.name} is unavailable, circuit breaker open", retry_after=retry_in)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            if self._state != self.CLOSED:
+                self._state = self.CLOSED
+                self._metrics.set_gauge(f"circuit_breaker.{self.name}.open", 0)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD:
+                if self._state != self.OPEN:
+                    self._metrics.incr(f"circuit_breaker.{self.name}.opened")
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._metrics.set_gauge(f"circuit_breaker.{self.name}.open", 1)
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """Get the (shared) circuit breaker of a provider"""
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name)
+        return _breakers[name]
+
+def breaker_states() -> Dict[str, str]:
+    """State of every provider's circuit breaker, for the health endpoint"""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.state for breaker in sorted(breakers, key=lambda breaker: breaker.name)}
+
+class RetryPolicy:
+    """
+    Retries transient failures of idempotent calls through a provider's circuit breaker.
+
+    Delays grow exponentially from RETRY_BASE_DELAY with full jitter, capped at RETRY_MAX_DELAY.
+    A 429's Retry-After is honored; if it asks for more than RETRY_MAX_DELAY, the error is
+    raised instead of holding the request.
+    """
+
+    def __init__(self, name: str, max_retries: int):
+        self.name = name
+        self.max_retries = max_retries
+        self.breaker = get_breaker(name)
+        self._metrics = MetricsRegistry()
+
+    def record(self, exc: Optional[BaseException]) -> None:
+        """
+        Report a call's outcome to the breaker; only an unreachable or failing provider counts.
+
+        Other errors (bad requests, 429s, local rejections) say nothing about the provider's
+        health and are neutral: they neither open the breaker nor reset its failure count.
+        """
+        if exc is None:
+            self.breaker.record_success()
+        elif is_transient(exc) and status_code(exc) != 429:
+            self.breaker.record_failure()
+
+    def delay(self, attempt: int, exc: BaseException) -> Optional[float]:
+        """Seconds to wait before retrying after `attempt` failed, None to give up"""
+        if attempt >= self.max_retries or not is_transient(exc):
+            return None
+        requested = retry_after(exc)
+        if requested is not None:
+            return requested if requested <= settings.RETRY_MAX_DELAY else None
+        return random.uniform(0, min(settings.RETRY_MAX_DELAY, settings.RETRY_BASE_DELAY * 2 ** attempt))
+
+    def _retrying(self, attempt: int, exc: BaseException) -> Optional[float]:
+        self.record(exc)
+        delay = self.delay(attempt, exc)
+        if delay is not None:
+            self._metrics.incr(f"retry.{self.name}.retries")
+        return delay
+
+    async def run(self, call: Callable[[], Awaitable[T]]) -> T:
+        """Run an async call with retries"""
+        attempt = 0
+        while True:
+            self.breaker.before_call()
+            try:
+                result = await call()
+            except Exception as e:
+                delay = self._retrying(attempt, e)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            self.record(None)
+            return result
+
+    def run_sync(self, call: Callable[[], T]) -> T:
+        """Run a blocking call with retries, sleeping in the calling thread"""
+        attempt = 0
+        while True:
+            self.breaker.before_call()
+            try:
+                result = call()
+            except Exception as e:
+                delay = self._retrying(attempt, e)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+            self.record(None)
+            return result
@@ -0,0 +1,63 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, TypeVar
+from src.utils.metrics import MetricsRegistry
+
+T = TypeVar("T")
+
+class SingleFlight(Generic[T]):
+    """
+    Coalesces concurrent calls with the same key into one in-flight task.
+
+    The first caller starts the task, callers arriving while it runs await the same task
+    and get its result or exception. A caller that is cancelled (e.g. by its own deadline)
+    leaves without cancelling the shared task; the task is cancelled only once no caller
+    waits for it anymore. Nothing is kept after the task finishes, this is not a cache.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._metrics = MetricsRegistry()
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._waiters: Dict[str, int] = {}
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+            del self._waiters[key]
+        # Mark the exception as retrieved when every caller left before it was raised
+        if not task.cancelled():
+            task.exception()
+
+    async def do(self, key: str, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run `call` for `key`, or join the call already in flight for it.
+
+        Args:
+            key: Identity of the call, e.g. a normalized query or a canonical URL
+            call: Starts the work, only invoked when no call for `key` is in flight
+
+        Returns:
+            T: The result of the shared call
+        """
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._tasks[key] = task
+            self._waiters[key] = 0
+            task.add_done_callback(lambda done: self._forget(key, done))
+            self._metrics.incr(f"single_flight.{self.name}.calls")
+        else:
+            self._metrics.incr(f"single_flight.{self.name}.coalesced")
+
+        self._waiters[key] += 1
+        try:
+            # Shielded so one caller's cancellation does not cancel the others' result
+            return await asyncio.shield(task)
+        finally:
+            if self._tasks.get(key) is task:
+                self._waiters[key] -= 1
+                if self._waiters[key] == 0 and not task.done():
+                    # Forget it right away so a new caller starts fresh instead of joining a cancelled task
+                    task.cancel()
+                    del self._tasks[key]
+                    del self._waiters[key]
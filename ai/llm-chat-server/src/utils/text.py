@@ -0,0 +1,18 @@
+import re
+
+_WHITESPACE = re.compile(r"\s+")
+_QUOTES = "\"'`\u201c\u201d\u2018\u2019"
+_TERMINAL_PUNCTUATION = "?!."
+_CODE_FENCE = re.compile(r"^```[a-zA-Z]*\s*|\s*```$")
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a query for cache keys: lowercase, collapse whitespace, drop surrounding quotes
+    and trailing sentence punctuation. Other symbols are meaningful ("c++", "c#", ".net").
+    """
+    query = _WHITESPACE.sub(" ", query.lower()).strip().strip(_QUOTES).strip()
+    return query.rstrip(_TERMINAL_PUNCTUATION).strip().strip(_QUOTES).strip()
+
+def strip_code_fences(text: str) -> str:
+    """Remove a surrounding markdown code fence that models sometimes wrap JSON output in"""
+    return _CODE_FENCE.sub("", text.strip())